@@ -0,0 +1,153 @@
+"""
+Сценарии бенчмарка для маршрутов front/urls.py.
+
+CASES: имя маршрута -> {метка сценария: (объект для pk, GET-параметры)}.
+Объект для pk - ключ словаря, который возвращает фикстура benchmark_library,
+или None для маршрутов без параметров.
+"""
+
+# Последняя страница - самый большой OFFSET
+LIST_PAGE_DEEP = {'page': 'last'}
+LIST_PAGE_LARGE = {'page_size': 100}
+# Частичный ответ: только результаты с пагинацией (PartialResultsMixin)
+LIST_PARTIAL = {'partial': 'results'}
+
+CASES = {
+    'index': {
+        'default': (None, {}),
+    },
+
+    'author': {
+        'default': (None, {}),
+        'deep_page': (None, LIST_PAGE_DEEP),
+        'filter_name': (None, {'full_name': 'Иванов'}),
+        'partial': (None, LIST_PARTIAL),
+    },
+    'author_new': {'default': (None, {})},
+    'author_detail': {'default': ('author', {})},
+    'author_delete': {'default': ('author', {})},
+    'author_update': {'default': ('author', {})},
+    'author_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Ива'}),
+        'fuzzy': (None, {'q': 'Иваноф'}),
+    },
+
+    'book': {
+        'default': (None, {}),
+        'deep_page': (None, LIST_PAGE_DEEP),
+        'filter_title': (None, {'title': 'Тёмная башня'}),
+        'filter_author': (None, {'author_name': 'Петров'}),
+    },
+    'book_new': {'default': (None, {})},
+    'book_detail': {'default': ('book', {})},
+    'book_delete': {'default': ('book', {})},
+    'book_update': {'default': ('book', {})},
+    'book_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Тём'}),
+        'fuzzy': (None, {'q': 'Тёмная башмя'}),
+    },
+
+    'book_edition': {
+        'default': (None, {}),
+        'large_page': (None, LIST_PAGE_LARGE),
+        'deep_page': (None, LIST_PAGE_DEEP),
+        'filter_author': (None, {'author_name': 'Петров'}),
+        'filter_publication_year': (None, {'publication_year': 2000}),
+        'filter_edition_type': (None, {'edition_type': 'EBOOK'}),
+        'partial': (None, LIST_PARTIAL),
+    },
+    'book_edition_new': {'default': (None, {})},
+    'book_edition_detail': {'default': ('book_edition', {})},
+    'book_edition_delete': {'default': ('book_edition', {})},
+    'book_edition_update': {'default': ('book_edition', {})},
+    'book_edition_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Тём'}),
+    },
+
+    'book_series': {
+        'default': (None, {}),
+        'filter_name': (None, {'name': 'Классика 1'}),
+    },
+    'book_series_new': {'default': (None, {})},
+    'book_series_detail': {'default': ('book_series', {})},
+    'book_series_delete': {'default': ('book_series', {})},
+    'book_series_update': {'default': ('book_series', {})},
+    'book_series_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Клас'}),
+        'fuzzy': (None, {'q': 'Класика'}),
+    },
+
+    'publisher': {
+        'default': (None, {}),
+        'filter_name': (None, {'name': 'Азбука'}),
+    },
+    'publisher_new': {'default': (None, {})},
+    'publisher_detail': {'default': ('publisher', {})},
+    'publisher_delete': {'default': ('publisher', {})},
+    'publisher_update': {'default': ('publisher', {})},
+    'publisher_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Азб'}),
+        'fuzzy': (None, {'q': 'Азбукка'}),
+    },
+
+    'year': {'default': (None, {})},
+    'year_detail': {'default': ('year', {})},
+
+    'reading_log_new': {'default': (None, {})},
+    'reading_log_bulk_new': {'default': (None, {})},
+    # Только POST, GET-бенчмарк не применим
+    'reading_log_bulk_finish': {},
+    'reading_log_list': {
+        'default': (None, {}),
+        'large_page': (None, LIST_PAGE_LARGE),
+        'deep_page': (None, LIST_PAGE_DEEP),
+        'filter_years': (None, {'year_from': 2000, 'year_to': 2005}),
+        'filter_author': (None, {'author_name': 'Петров'}),
+        'filter_publisher': (None, {'publisher_name': 'Азбука'}),
+        'filter_edition_type': (None, {'edition_type': 'AUDIOBOOK'}),
+        'partial': (None, LIST_PARTIAL),
+    },
+    'readinglog_detail': {'default': ('reading_log', {})},
+    'readinglog_update': {'default': ('reading_log', {})},
+
+    'reading_statistics': {
+        'default': (None, {}),
+        'year': (None, {'year': 2000}),
+    },
+    'reading_timeline': {
+        'default': (None, {}),
+        'in_progress': (None, {'metric': 'in_progress'}),
+    },
+    'reading_timeline_json': {'default': (None, {})},
+    'reading_analytics': {'default': (None, {})},
+    'reading_analytics_json': {'default': (None, {})},
+
+    'note': {
+        'default': (None, {}),
+        'filter_topic': (None, {'topic': 'Заметка 1.'}),
+    },
+    'note_new': {'default': (None, {})},
+    'note_detail': {'default': ('note', {})},
+    'note_update': {'default': ('note', {})},
+    'note_delete': {'default': ('note', {})},
+    'note_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'Заметка 1'}),
+    },
+    'keyword_autocomplete': {
+        'empty': (None, {}),
+        'prefix': (None, {'q': 'пам'}),
+    },
+}
+
+
+def resolve_case(name, label, library):
+    """Возвращает kwargs для reverse() и GET-параметры сценария."""
+    object_key, params = CASES[name][label]
+    kwargs = {'pk': library[object_key]} if object_key else {}
+    return kwargs, params
@@ -0,0 +1,40 @@
+"""
+Fixtures для бенчмарков: синтетическая библиотека создаётся один раз на сессию.
+"""
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from core.models import Author, Book, BookEdition, BookSeries, Note, Publisher, ReadingLog
+
+
+def _busiest(queryset, relation):
+    """Возвращает pk объекта с наибольшим числом связанных записей."""
+    return queryset.annotate(
+        related_count=Count(relation),
+    ).order_by('-related_count', 'pk').values_list('pk', flat=True).first()
+
+
+@pytest.fixture(scope='session')
+def benchmark_library(django_db_setup, django_db_blocker):
+    """
+    Наполняет тестовую базу и возвращает pk представительных объектов.
+
+    Для детальных страниц выбираются объекты с наибольшим числом связей,
+    чтобы бенчмарк отражал худший случай.
+    """
+    scale = float(os.environ.get('BENCHMARK_SCALE', 1))
+    with django_db_blocker.unblock():
+        call_command('generate_library', scale=scale, seed=0, verbosity=0)
+        yield {
+            'author': _busiest(Author.objects, 'books'),
+            'book': _busiest(Book.objects, 'editions'),
+            'book_edition': _busiest(BookEdition.objects, 'reading_logs'),
+            'book_series': _busiest(BookSeries.objects, 'book_editions'),
+            'publisher': _busiest(Publisher.objects, 'book_editions'),
+            'year': 2000,
+            'reading_log': ReadingLog.objects.order_by('pk').values_list('pk', flat=True).first(),
+            'note': Note.objects.filter(parent__isnull=True).order_by('index').values_list('pk', flat=True).first(),
+        }
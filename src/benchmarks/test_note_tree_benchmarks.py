@@ -0,0 +1,186 @@
+"""
+Бенчмарк рендеринга дерева заметок: рекурсивный {% include %} и плоский список.
+
+Запуск:
+
+    RUN_BENCHMARKS=1 python -m pytest src/benchmarks/test_note_tree_benchmarks.py
+
+Для деревьев из NOTE_TREE_SIZE заметок разной формы (широкое - по 10 детей,
+глубокое - по 2) измеряется рендеринг прежним рекурсивным шаблоном узла
+(RECURSIVE_TEMPLATE: children.exists и ordered_children на каждую заметку,
+include с level|add:1) и шаблоном notes/_note_tree.html по списку
+core.note_tree.flatten_note_tree(), включая загрузку потомков. Результаты
+сохраняются в baseline.json как 'note_tree|<форма>|recursive' и '|flat'.
+"""
+import json
+import time
+
+import pytest
+from django.db import connection
+from django.template import Context, Engine
+from django.template.loader import get_template
+
+from benchmarks.test_url_benchmarks import (
+    BASELINE_PATH, REPEATS, SCALE, TIME_SLACK, TIME_TOLERANCE, UPDATE_BASELINE,
+    _load_baseline, requires_benchmarks,
+)
+from core.models import Note
+from core.note_tree import flatten_note_tree
+
+NOTE_TREE_SIZE = 10_000
+TREE_SHAPES = {
+    'wide': 10,
+    'deep': 2,
+}
+
+# Шаблон узла до перехода на плоский список (notes/_note_tree.html)
+RECURSIVE_TEMPLATE = """{% load basic_tags %}
+<li class="note-item {% if note.children.exists %}has-children{% endif %}" style="{% if level > 0 %}margin-left: {{ level|multiply:10 }}px;{% endif %}">
+  <div class="note-row py-0 {% if level > 0 %}border-start{% endif %}">
+    <div class="row">
+      <div class="col-10">
+        <a href="{% url 'note_detail' pk=note.pk %}" class="text-decoration-none">{{ note.index }}</a>
+        <span class="note-topic">{{ note.topic }}</span>
+        {% if note.text %}
+          <span class="text-muted small">{{ note.text|truncatewords:10 }}...</span>
+        {% endif %}
+      </div>
+      <div class="col-2 text-end">
+        <small class="text-muted">{{ note.updated_at|date:"d.m.Y" }}</small>
+      </div>
+    </div>
+  </div>
+  {% if note.children.exists %}
+    <ul class="note-children list-unstyled">
+      {% for child in note.ordered_children %}
+        {% include 'notes/_note_tree_recursive.html' with note=child level=level|add:1 %}
+      {% endfor %}
+    </ul>
+  {% endif %}
+</li>
+"""
+RECURSIVE_ROOT = "{% include 'notes/_note_tree_recursive.html' with note=root level=0 %}"
+
+_results = {}
+
+
+def _create_tree(branching):
+    """Создаёт дерево из NOTE_TREE_SIZE заметок обходом в ширину и возвращает корень."""
+    root = Note.objects.create(index='1', topic='Заметка 1', text='Текст заметки. ' * 5)
+    level = [root]
+    created = 1
+    while created < NOTE_TREE_SIZE:
+        children = []
+        for parent in level:
+            for number in range(1, branching + 1):
+                if created + len(children) == NOTE_TREE_SIZE:
+                    break
+                children.append(Note(
+                    index=f'{parent.index}.{number}',
+                    parent=parent,
+                    root=root,
+                    topic=f'Заметка {parent.index}.{number}',
+                    text='Текст заметки. ' * 5,
+                ))
+        level = Note.objects.bulk_create(children)
+        created += len(level)
+    return root
+
+
+def _recursive_engine(tmp_path):
+    directory = tmp_path / 'notes'
+    directory.mkdir(exist_ok=True)
+    (directory / '_note_tree_recursive.html').write_text(RECURSIVE_TEMPLATE, encoding='utf-8')
+    return Engine(
+        dirs=[str(tmp_path)],
+        debug=True,
+        libraries={'basic_tags': 'core.templatetags.basic_tags'},
+    )
+
+
+def _measure(render):
+    # Запросы считаются через execute_wrapper: журнал connection.queries
+    # хранит не больше 9000 записей, а рекурсивный шаблон выполняет больше
+    query_times = []
+
+    def timed_execute(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            query_times.append(time.perf_counter() - started)
+
+    with connection.execute_wrapper(timed_execute):
+        started = time.perf_counter()
+        html = render()
+        total_time = time.perf_counter() - started
+    return {
+        'queries': len(query_times),
+        'sql_time': sum(query_times),
+        'total_time': total_time,
+        'nodes': html.count('<li class="note-item'),
+    }
+
+
+def _median(runs):
+    runs = sorted(runs, key=lambda run: run['total_time'])
+    middle = runs[len(runs) // 2]
+    return {
+        'queries': max(run['queries'] for run in runs),
+        'sql_time': round(middle['sql_time'], 4),
+        'render_time': round(middle['total_time'] - middle['sql_time'], 4),
+        'total_time': round(middle['total_time'], 4),
+    }
+
+
+@requires_benchmarks
+@pytest.mark.django_db
+@pytest.mark.parametrize('shape', TREE_SHAPES)
+def test_note_tree_benchmark(tmp_path, shape):
+    root = _create_tree(TREE_SHAPES[shape])
+    recursive_template = _recursive_engine(tmp_path).from_string(RECURSIVE_ROOT)
+    flat_template = get_template('notes/_note_tree.html')
+
+    def render_recursive():
+        return recursive_template.render(Context({'root': Note.objects.get(pk=root.pk)}))
+
+    def render_flat():
+        return flat_template.render({'note_tree': flatten_note_tree(Note.objects.filter(pk=root.pk))})
+
+    recursive_runs = [_measure(render_recursive) for _ in range(REPEATS)]
+    flat_runs = [_measure(render_flat) for _ in range(REPEATS)]
+    assert {run['nodes'] for run in recursive_runs + flat_runs} == {NOTE_TREE_SIZE}
+
+    recursive = _median(recursive_runs)
+    flat = _median(flat_runs)
+    _results[f'note_tree|{shape}|recursive'] = recursive
+    _results[f'note_tree|{shape}|flat'] = flat
+
+    assert flat['queries'] < recursive['queries']
+    assert flat['total_time'] <= recursive['total_time'], (
+        f'{shape}: плоский список {flat["total_time"]:.4f}s, рекурсия {recursive["total_time"]:.4f}s'
+    )
+    baseline = _load_baseline().get(f'note_tree|{shape}|flat')
+    if UPDATE_BASELINE:
+        return
+    if baseline is None:
+        pytest.skip(f'note_tree|{shape}|flat: нет значения в baseline.json')
+
+    assert flat['queries'] <= baseline['queries']
+    limit = baseline['total_time'] * TIME_TOLERANCE + TIME_SLACK
+    assert flat['total_time'] <= limit, (
+        f'note_tree|{shape}|flat: total_time {flat["total_time"]:.4f}s, допустимо {limit:.4f}s'
+    )
+
+
+def teardown_module(module):
+    if not UPDATE_BASELINE or not _results:
+        return
+    cases = _load_baseline()
+    cases.update(_results)
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'scale': SCALE, 'cases': dict(sorted(cases.items()))},
+            f, ensure_ascii=False, indent=2,
+        )
+        f.write('\n')
@@ -0,0 +1,86 @@
+"""
+Бенчмарк рендеринга страниц в режимах шаблонов debug и production.
+
+Запуск:
+
+    RUN_BENCHMARKS=1 python -m pytest src/benchmarks/test_template_benchmarks.py
+
+Для страниц с большим числом шаблонов и {% include %} (дерево заметок,
+списки) время рендеринга измеряется с настройкой TEMPLATES по умолчанию
+и с production_templates() после warmup_templates(). Результаты production
+сохраняются в baseline.json как '<маршрут>|<сценарий>|production' вместе
+со временем рендеринга в debug (debug_render_time).
+"""
+import json
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from benchmarks.cases import resolve_case
+from benchmarks.test_url_benchmarks import (
+    BASELINE_PATH, REPEATS, SCALE, TIME_SLACK, TIME_TOLERANCE, UPDATE_BASELINE,
+    _load_baseline, _measure, _median, requires_benchmarks,
+)
+from private_library.template_warmup import production_templates, warmup_templates
+
+TEMPLATE_CASES = (
+    'index|default',
+    'note|default',
+    'note_detail|default',
+    'book_edition|large_page',
+    'book_edition_detail|default',
+    'reading_log_list|large_page',
+)
+
+_results = {}
+
+
+def _measure_mode(client, url, params):
+    client.get(url, params)  # прогрев импортов и загрузки шаблонов
+    return _median([_measure(client, url, params) for _ in range(REPEATS)])
+
+
+@requires_benchmarks
+@pytest.mark.django_db
+@pytest.mark.parametrize('case_id', TEMPLATE_CASES)
+def test_template_mode_benchmark(client, benchmark_library, case_id):
+    name, label = case_id.split('|')
+    kwargs, params = resolve_case(name, label, benchmark_library)
+    url = reverse(name, kwargs=kwargs)
+
+    debug = _measure_mode(client, url, params)
+    with override_settings(TEMPLATES=production_templates(settings.TEMPLATES), TEMPLATE_MODE='production'):
+        warmup_templates()
+        result = _measure_mode(client, url, params)
+    result['debug_render_time'] = debug['render_time']
+    _results[f'{case_id}|production'] = result
+
+    # Страницы, где рендеринг выполняет SQL, выигрывают мало: допускается шум измерения
+    assert result['render_time'] <= debug['render_time'] * TIME_TOLERANCE + TIME_SLACK, (
+        f'{case_id}: render_time {result["render_time"]:.4f}s, в debug {debug["render_time"]:.4f}s'
+    )
+    baseline = _load_baseline().get(f'{case_id}|production')
+    if UPDATE_BASELINE:
+        return
+    if baseline is None:
+        pytest.skip(f'{case_id}|production: нет значения в baseline.json')
+
+    limit = baseline['render_time'] * TIME_TOLERANCE + TIME_SLACK
+    assert result['render_time'] <= limit, (
+        f'{case_id}|production: render_time {result["render_time"]:.4f}s, допустимо {limit:.4f}s'
+    )
+
+
+def teardown_module(module):
+    if not UPDATE_BASELINE or not _results:
+        return
+    cases = _load_baseline()
+    cases.update(_results)
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'scale': SCALE, 'cases': dict(sorted(cases.items()))},
+            f, ensure_ascii=False, indent=2,
+        )
+        f.write('\n')
@@ -0,0 +1,146 @@
+"""
+Бенчмарк числа SQL-запросов и времени ответа для всех маршрутов front/urls.py.
+
+Запуск (SQLite, без внешних сервисов):
+
+    RUN_BENCHMARKS=1 python -m pytest src/benchmarks
+
+Переменные окружения:
+- BENCHMARK_SCALE: множитель объёма данных (1 = 100 000 изданий)
+- BENCHMARK_UPDATE_BASELINE=1: перезаписать baseline.json текущими значениями
+
+Тест падает, если число запросов превышает значение из baseline.json или
+время SQL/рендеринга превышает его больше, чем на допустимый запас.
+"""
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.template.response import SimpleTemplateResponse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from benchmarks.cases import CASES
+from benchmarks.cases import resolve_case
+from front.urls import urlpatterns
+
+requires_benchmarks = pytest.mark.skipif(
+    not os.environ.get('RUN_BENCHMARKS'),
+    reason='Бенчмарки запускаются только с RUN_BENCHMARKS=1',
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+SCALE = float(os.environ.get('BENCHMARK_SCALE', 1))
+UPDATE_BASELINE = bool(os.environ.get('BENCHMARK_UPDATE_BASELINE'))
+REPEATS = 3
+
+# Допустимое превышение времени: baseline * TIME_TOLERANCE + TIME_SLACK секунд
+TIME_TOLERANCE = 1.5
+TIME_SLACK = 0.05
+
+_results = {}
+
+
+def _load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('scale') != SCALE:
+        return {}
+    return baseline['cases']
+
+
+def _measure(client, url, params):
+    """Выполняет запрос с холодным кэшем и возвращает метрики."""
+    cache.clear()
+    render_times = []
+    original_render = SimpleTemplateResponse.render
+
+    def timed_render(response):
+        started = time.perf_counter()
+        result = original_render(response)
+        render_times.append(time.perf_counter() - started)
+        return result
+
+    with mock.patch.object(SimpleTemplateResponse, 'render', timed_render):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url, params)
+            total_time = time.perf_counter() - started
+
+    assert response.status_code == 200, f'{url}: HTTP {response.status_code}'
+    queries = captured.captured_queries
+    return {
+        'queries': len(queries),
+        'sql_time': sum(float(query['time']) for query in queries),
+        'render_time': sum(render_times),
+        'total_time': total_time,
+    }
+
+
+def _median(runs):
+    return {
+        'queries': max(run['queries'] for run in runs),
+        **{
+            name: round(statistics.median(run[name] for run in runs), 4)
+            for name in ('sql_time', 'render_time', 'total_time')
+        },
+    }
+
+
+def test_every_route_has_a_case():
+    names = {pattern.name for pattern in urlpatterns if pattern.name}
+    missing = sorted(names - set(CASES))
+    assert not missing, f'Нет сценариев бенчмарка для маршрутов: {missing}'
+
+
+@requires_benchmarks
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'case_id',
+    [f'{name}|{label}' for name, variants in CASES.items() for label in variants],
+)
+def test_url_benchmark(client, benchmark_library, case_id):
+    name, label = case_id.split('|')
+    kwargs, params = resolve_case(name, label, benchmark_library)
+    url = reverse(name, kwargs=kwargs)
+
+    client.get(url, params)  # прогрев импортов и загрузки шаблонов
+    result = _median([_measure(client, url, params) for _ in range(REPEATS)])
+    _results[case_id] = result
+
+    baseline = _load_baseline().get(case_id)
+    if UPDATE_BASELINE:
+        return
+    if baseline is None:
+        pytest.skip(f'{case_id}: нет значения в baseline.json')
+
+    assert result['queries'] <= baseline['queries'], (
+        f'{case_id}: {result["queries"]} запросов, в baseline {baseline["queries"]}'
+    )
+    for metric in ('sql_time', 'render_time'):
+        limit = baseline[metric] * TIME_TOLERANCE + TIME_SLACK
+        assert result[metric] <= limit, (
+            f'{case_id}: {metric} {result[metric]:.4f}s, допустимо {limit:.4f}s'
+        )
+
+
+def teardown_module(module):
+    if not UPDATE_BASELINE or not _results:
+        return
+    cases = _load_baseline()
+    cases.update(_results)
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'scale': SCALE, 'cases': dict(sorted(cases.items()))},
+            f, ensure_ascii=False, indent=2,
+        )
+        f.write('\n')
@@ -0,0 +1,136 @@
+"""
+Аналитика длительности чтения.
+
+Длительность считается в месяцах в базе данных выражением над полями периода,
+поэтому все показатели - агрегаты и сгруппированные запросы без перебора
+записей журнала в Python. Учитываются только чтения с известными годом и месяцем
+начала и окончания. Незаконченное чтение - с годом начала и без года окончания.
+
+Результат кэшируется с версиями моделей в ключе (см. core.cache).
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, ExpressionWrapper, F, IntegerField, Max, Min
+
+from core.cache import make_cache_key, model_versions
+from core.models import Author, Book, BookEdition, ReadingLog
+
+ANALYTICS_CACHE_TIMEOUT = 24 * 60 * 60
+ANALYTICS_MODELS = (ReadingLog, BookEdition, Book, Author)
+
+TOP_SIZE = 10
+OPEN_READS_SIZE = 20
+
+# Чтение, начатое и законченное в одном месяце, длится один месяц
+DURATION_MONTHS = ExpressionWrapper(
+    (F('year_finish') - F('year_start')) * 12 + F('month_finish') - F('month_start') + 1,
+    output_field=IntegerField(),
+)
+
+
+def completed_reading_logs():
+    """Законченные чтения с точным периодом, с аннотацией duration_months."""
+    return ReadingLog.objects.filter(
+        year_start__isnull=False, month_start__isnull=False,
+        year_finish__isnull=False, month_finish__isnull=False,
+    ).annotate(duration_months=DURATION_MONTHS)
+
+
+def open_reading_logs():
+    return ReadingLog.objects.filter(year_start__isnull=False, year_finish__isnull=True)
+
+
+def _average(value):
+    return None if value is None else round(float(value), 1)
+
+
+def _grouped_durations(field, **filters):
+    """
+    Число и средняя длительность чтений по значениям field.
+
+    Условия filters применяются до группировки: фильтр по многозначной связи
+    после values()/annotate() добавил бы второе соединение с её таблицей.
+    """
+    return completed_reading_logs().filter(**filters).values(field).annotate(
+        reads=Count('pk'),
+        average_months=Avg('duration_months'),
+    ).order_by('-reads', field)
+
+
+def build_reading_analytics():
+    """Возвращает показатели длительности чтения, пригодные для JSON."""
+    completed = completed_reading_logs()
+    summary = completed.aggregate(
+        reads=Count('pk'),
+        average_months=Avg('duration_months'),
+        shortest_months=Min('duration_months'),
+        longest_months=Max('duration_months'),
+    )
+    summary['average_months'] = _average(summary['average_months'])
+
+    distribution = list(
+        completed.values('duration_months').annotate(reads=Count('pk')).order_by('duration_months')
+    )
+
+    edition_types = dict(BookEdition.EDITION_TYPE_CHOICES)
+    by_edition_type = [
+        {
+            'edition_type': row['book_edition__edition_type'],
+            'label': edition_types.get(row['book_edition__edition_type']),
+            'reads': row['reads'],
+            'average_months': _average(row['average_months']),
+        }
+        for row in _grouped_durations('book_edition__edition_type')
+    ]
+
+    by_author = [
+        {
+            'author': row['book_edition__book__authors'],
+            'reads': row['reads'],
+            'average_months': _average(row['average_months']),
+        }
+        for row in _grouped_durations(
+            'book_edition__book__authors',
+            book_edition__book__authors__isnull=False,
+        )[:TOP_SIZE]
+    ]
+    authors = Author.objects.in_bulk([row['author'] for row in by_author])
+    for row in by_author:
+        author = authors.get(row['author'])
+        row['name'] = author.full_name_short if author else None
+
+    open_reads = open_reading_logs()
+    open_backlog = {
+        'reads': open_reads.count(),
+        'by_start_year': list(
+            open_reads.values('year_start').annotate(reads=Count('pk')).order_by('-year_start')
+        ),
+        'oldest': [
+            {
+                'pk': row['pk'],
+                'title': row['book_edition__book__title'],
+                'year_start': row['year_start'],
+                'month_start': row['month_start'],
+            }
+            for row in open_reads.order_by('start_key', 'pk').values(
+                'pk', 'book_edition__book__title', 'year_start', 'month_start',
+            )[:OPEN_READS_SIZE]
+        ],
+    }
+
+    return {
+        'summary': summary,
+        'distribution': distribution,
+        'by_edition_type': by_edition_type,
+        'by_author': by_author,
+        'open_backlog': open_backlog,
+    }
+
+
+def get_reading_analytics():
+    """Возвращает аналитику из кэша, считает её при отсутствии."""
+    cache_key = make_cache_key('reading_analytics', model_versions(*ANALYTICS_MODELS))
+    analytics = cache.get(cache_key)
+    if analytics is None:
+        analytics = build_reading_analytics()
+        cache.set(cache_key, analytics, ANALYTICS_CACHE_TIMEOUT)
+    return analytics
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreAppConfig(AppConfig):
     name = 'core'
     verbose_name = 'Core app config'
+
+    def ready(self):
+        super().ready()
+        from core import signals  # noqa: F401
@@ -0,0 +1,54 @@
+"""
+Массовые операции с журналом чтения.
+
+bulk_create() и update() не отправляют сигналы, поэтому функции этого модуля
+сами вычисляют ключи периода, обновляют сводку статистики (core.statistics)
+и версию ReadingLog в кэше (core.cache), а bulk_set_finish() - и версии
+изменённых записей для кэша строк списков (core.fragments).
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from core.cache import bump_model_version
+from core.cache import bump_object_versions
+from core.models import ReadingLog, period_finish_key
+from core.statistics import apply_reading_logs_change, reading_logs_cells
+
+BULK_BATCH_SIZE = 1_000
+
+
+def bulk_create_reading_logs(reading_logs):
+    """Создаёт записи журнала одним INSERT на пакет. Возвращает созданные записи."""
+    for reading_log in reading_logs:
+        reading_log.update_period_keys()
+
+    with transaction.atomic():
+        created = ReadingLog.objects.bulk_create(reading_logs, batch_size=BULK_BATCH_SIZE)
+        apply_reading_logs_change(
+            Counter(), ReadingLog.objects.filter(pk__in=[reading_log.pk for reading_log in created]),
+        )
+    bump_model_version(ReadingLog)
+    return created
+
+
+def bulk_set_finish(queryset, year_finish, month_finish):
+    """
+    Устанавливает год и месяц окончания записям журнала queryset одним UPDATE.
+
+    queryset должен отбирать записи условием, которое не зависит от периода
+    (например, по pk): после UPDATE по нему считается новый вклад в статистику.
+    Возвращает число обновлённых записей.
+    """
+    with transaction.atomic():
+        old_cells = reading_logs_cells(queryset)
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = queryset.update(
+            year_finish=year_finish,
+            month_finish=month_finish,
+            finish_key=period_finish_key(year_finish, month_finish),
+        )
+        apply_reading_logs_change(old_cells, queryset)
+    bump_model_version(ReadingLog)
+    bump_object_versions(ReadingLog, pks)
+    return updated
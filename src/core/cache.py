@@ -0,0 +1,78 @@
+"""
+Версионирование кэша по моделям.
+
+Каждой модели приложения core соответствует счётчик версии в общем кэше.
+Счётчик увеличивается при любой записи в модель (см. core.signals), поэтому
+значения, закэшированные с версией в ключе, не требуют явного удаления:
+после записи они просто перестают запрашиваться и истекают по таймауту.
+
+Версии отдельных объектов (object_versions) устроены так же, но хранятся
+по ключу на объект и сбрасываются удалением ключа: следующее чтение
+создаёт новое значение от времени, не совпадающее с прежними.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+
+MODEL_VERSION_KEY = 'model_version:{label}'
+OBJECT_VERSION_KEY = 'object_version:{label}:{pk}'
+
+
+def _version_key(model) -> str:
+    return MODEL_VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def _initial_version() -> int:
+    # Начальное значение берётся от времени, чтобы после вытеснения ключа
+    # из кэша версия не совпала с одной из уже использованных ранее.
+    return time.time_ns()
+
+
+def model_versions(*models) -> tuple:
+    """Возвращает текущие версии моделей одним обращением к кэшу."""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return tuple(versions[key] for key in keys)
+
+
+def model_version(model) -> int:
+    return model_versions(model)[0]
+
+
+def bump_model_version(model) -> None:
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def _object_version_key(model, pk) -> str:
+    return OBJECT_VERSION_KEY.format(label=model._meta.label_lower, pk=pk)
+
+
+def object_versions(model, pks) -> dict:
+    """Возвращает версии объектов модели {pk: версия} одним обращением к кэшу."""
+    keys = {pk: _object_version_key(model, pk) for pk in pks}
+    versions = cache.get_many(keys.values())
+    missing = {key: _initial_version() for key in keys.values() if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {pk: versions[key] for pk, key in keys.items()}
+
+
+def bump_object_versions(model, pks) -> None:
+    cache.delete_many([_object_version_key(model, pk) for pk in pks])
+
+
+def make_cache_key(prefix: str, *parts) -> str:
+    """Собирает ключ кэша фиксированной длины из произвольных частей."""
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return f'{prefix}:{digest}'
@@ -8,9 +8,12 @@ entities in the library system according to the specification.
 import django_filters
 from django import forms
 from django.db import models
+from django.db.models import Count
 
 from .enums import MonthEnum
 from .models import Book, Author, Publisher, BookSeries, ReadingLog, BookEdition, Note
+from .models import period_finish_key, period_start_key
+from .transliteration import fold
 
 
 class BaseFilterSet(django_filters.FilterSet):
@@ -20,8 +23,17 @@ class BaseFilterSet(django_filters.FilterSet):
     Implements common features required across all filter sets including:
     - Special character sanitization
     - Character limit validation (255 chars)
+    - Facet counts for categorical filters (see get_facet_counts)
     """
-    
+
+    # Categorical filters with facet counts: filter name -> grouped model field.
+    # Facet links select the grouped value, so the filter must match it exactly
+    facet_fields = {}
+    # Model fields shown instead of the grouped value: filter name -> label field
+    facet_labels = {}
+    # Number of values shown for facets without a fixed set of choices
+    facet_limit = 10
+
     def __init__(self, data=None, *args, **kwargs):
         # Apply character limit validation to all CharFilter fields
         super().__init__(data, *args, **kwargs)
@@ -51,7 +63,60 @@ class BaseFilterSet(django_filters.FilterSet):
         sanitized = value_str.replace('<', '&lt;').replace('>', '&gt;')
         
         return sanitized
-    
+
+    def get_facet_choices(self, name):
+        """Return the fixed choices of a filter widget, or None for free-form filters."""
+        choices = getattr(self.form.fields[name].widget, 'choices', None)
+        if not choices:
+            return None
+        return [(value, label) for value, label in choices if value not in ('', None)]
+
+    def facet_queryset(self, name):
+        """
+        Queryset for counting the values of facet name: filtered by every
+        filter except the facet's own, so each option counts what selecting
+        it would return rather than 0 for all but the current value.
+        """
+        if not self.is_bound or not self.is_valid():
+            return self.qs
+        queryset = self.queryset.all()
+        for filter_name, value in self.form.cleaned_data.items():
+            if filter_name != name:
+                queryset = self.filters[filter_name].filter(queryset, value)
+        return queryset
+
+    def get_facet_counts(self):
+        """
+        Count filtered results per value of each facet field.
+
+        Runs one grouped aggregate query per facet over the queryset filtered
+        by all other filters (see facet_queryset).
+        Returns a dict mapping the filter name to a list of dicts with
+        'value', 'label' and 'count' keys: all choices in their order for
+        filters with fixed choices, the facet_limit most frequent values otherwise.
+        """
+        facets = {}
+        for name, field in self.facet_fields.items():
+            label_field = self.facet_labels.get(name, field)
+            queryset = self.facet_queryset(name).order_by().select_related(None).prefetch_related(None)
+            rows = queryset.filter(**{f'{field}__isnull': False}).values(field, label_field).annotate(
+                count=Count('pk', distinct=True),
+            )
+            choices = self.get_facet_choices(name)
+            if choices is None:
+                rows = rows.order_by('-count', label_field)[:self.facet_limit]
+                facets[name] = [
+                    {'value': row[field], 'label': str(row[label_field]), 'count': row['count']}
+                    for row in rows
+                ]
+            else:
+                counts = {str(row[field]): row['count'] for row in rows}
+                facets[name] = [
+                    {'value': value, 'label': label, 'count': counts.get(str(value), 0)}
+                    for value, label in choices
+                ]
+        return facets
+
     class Meta:
         # Common meta options can be defined here
         pass
@@ -70,12 +135,24 @@ class ReadingLogFilter(BaseFilterSet):
     - FR-006: Publisher name search by substring
     - FR-007: Publication year exact match filter
     - FR-008: Book series name search by substring
+    - Edition type selector with facet counts
     """
 
-    # Year range filters - these should filter the year_start and year_finish fields
+    # Month selectors are range bounds on the period keys, so per-month
+    # counts would not match their results and they have no facets
+    facet_fields = {
+        'edition_type': 'book_edition__edition_type',
+        'publication_year': 'book_edition__publication_year',
+        'publisher': 'book_edition__publisher',
+    }
+    facet_labels = {
+        'publisher': 'book_edition__publisher__name',
+    }
+
+    # Year/month range filters compare the maintained period keys
+    # (start_key, finish_key), see filter_period_from and filter_period_to
     year_from = django_filters.NumberFilter(
-        field_name='year_start__year',
-        lookup_expr='gte',
+        method='filter_period_from',
         label='Год начала',
         widget=forms.NumberInput(attrs={
             'class': 'form-control',
@@ -84,8 +161,7 @@ class ReadingLogFilter(BaseFilterSet):
     )
 
     year_to = django_filters.NumberFilter(
-        field_name='year_finish__year',
-        lookup_expr='lte',
+        method='filter_period_to',
         label='Год окончания',
         widget=forms.NumberInput(attrs={
             'class': 'form-control',
@@ -95,8 +171,7 @@ class ReadingLogFilter(BaseFilterSet):
 
     # Month range filters
     month_from = django_filters.NumberFilter(
-        field_name='month_start',
-        lookup_expr='gte',
+        method='filter_period_from',
         label='Месяц начала',
         widget=forms.Select(
             choices=[('', '---------')] + MonthEnum.choices,
@@ -105,8 +180,7 @@ class ReadingLogFilter(BaseFilterSet):
     )
 
     month_to = django_filters.NumberFilter(
-        field_name='month_finish',
-        lookup_expr='lte',
+        method='filter_period_to',
         label='Месяц окончания',
         widget=forms.Select(
             choices=[('', '---------')] + MonthEnum.choices,
@@ -114,6 +188,34 @@ class ReadingLogFilter(BaseFilterSet):
         )
     )
 
+    def filter_period_from(self, queryset, name, value):
+        """
+        Start of the period: year_from alone, or year_from with month_from, is
+        a single range on start_key. month_from alone filters by month only.
+        """
+        year = self.form.cleaned_data.get('year_from')
+        month = self.form.cleaned_data.get('month_from')
+        if year is None:
+            return queryset.filter(month_start__gte=month)
+        if name == 'month_from':
+            # Already applied together with year_from
+            return queryset
+        return queryset.filter(start_key__gte=period_start_key(year, month))
+
+    def filter_period_to(self, queryset, name, value):
+        """
+        Finish of the period: year_to alone, or year_to with month_to, is
+        a single range on finish_key. month_to alone filters by month only.
+        """
+        year = self.form.cleaned_data.get('year_to')
+        month = self.form.cleaned_data.get('month_to')
+        if year is None:
+            return queryset.filter(month_finish__lte=month)
+        if name == 'month_to':
+            # Already applied together with year_to
+            return queryset
+        return queryset.filter(finish_key__lte=period_finish_key(year, month))
+
     # Text search filters - these need to go through the book_edition relationship
     book_title = django_filters.CharFilter(
         field_name='book_edition__book__title',
@@ -156,6 +258,15 @@ class ReadingLogFilter(BaseFilterSet):
         })
     )
 
+    # Exact publisher selected by a publisher facet link (publisher_name
+    # is a substring search and would also match other publishers)
+    publisher = django_filters.NumberFilter(
+        field_name='book_edition__publisher',
+        lookup_expr='exact',
+        label='Издательство',
+        widget=forms.HiddenInput()
+    )
+
     publication_year = django_filters.NumberFilter(
         field_name='book_edition__publication_year',
         lookup_expr='exact',
@@ -177,6 +288,13 @@ class ReadingLogFilter(BaseFilterSet):
         })
     )
 
+    edition_type = django_filters.ChoiceFilter(
+        field_name='book_edition__edition_type',
+        choices=BookEdition.EDITION_TYPE_CHOICES,
+        label='Тип издания',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
     class Meta:
         model = ReadingLog
         fields = []
@@ -186,6 +304,9 @@ class AuthorFilter(BaseFilterSet):
     """
     FilterSet for Author model with name search by substring.
 
+    Names are matched against the transliterated Author.search_key,
+    so a query in either Cyrillic or Latin script finds the author.
+
     Implements requirement:
     - FR-009: Author name search by substring
     """
@@ -202,11 +323,7 @@ class AuthorFilter(BaseFilterSet):
     def filter_author_full_name(self, queryset, name, value):
         """Custom filter method to search across all name fields."""
         if value:
-            return queryset.filter(
-                models.Q(first_name__icontains=value) |
-                models.Q(last_name__icontains=value) |
-                models.Q(middle_name__icontains=value)
-            )
+            return queryset.filter(search_key__contains=fold(value))
         return queryset
 
     class Meta:
@@ -218,14 +335,17 @@ class BookFilter(BaseFilterSet):
     """
     FilterSet for Book model with title and author search.
 
+    Titles (including original and extended ones) and author names are matched
+    against the transliterated Book.search_key and Author.search_key,
+    so a query in either Cyrillic or Latin script finds the book.
+
     Implements requirements:
     - FR-010: Book title search by substring
     - FR-011: Author name search by substring using django-autocomplete-light
     """
 
     title = django_filters.CharFilter(
-        field_name='title',
-        lookup_expr='icontains',
+        method='filter_book_title',
         label='Название книги',
         max_length=255,
         widget=forms.TextInput(attrs={
@@ -244,14 +364,16 @@ class BookFilter(BaseFilterSet):
         })
     )
 
+    def filter_book_title(self, queryset, name, value):
+        """Custom filter method to search across all title fields."""
+        if value:
+            return queryset.filter(search_key__contains=fold(value))
+        return queryset
+
     def filter_book_author_name(self, queryset, name, value):
         """Custom filter method to search across all author name fields."""
         if value:
-            return queryset.filter(
-                models.Q(authors__first_name__icontains=value) |
-                models.Q(authors__last_name__icontains=value) |
-                models.Q(authors__middle_name__icontains=value)
-            )
+            return queryset.filter(authors__search_key__contains=fold(value))
         return queryset
 
     class Meta:
@@ -269,8 +391,18 @@ class BookEditionFilter(BaseFilterSet):
     - FR-014: Publisher name search by substring
     - FR-015: Publication year exact match filter
     - FR-016: Book series name search by substring
+    - Edition type selector with facet counts
     """
 
+    facet_fields = {
+        'edition_type': 'edition_type',
+        'publication_year': 'publication_year',
+        'publisher': 'publisher',
+    }
+    facet_labels = {
+        'publisher': 'publisher__name',
+    }
+
     # Book title search through the book relationship
     book_title = django_filters.CharFilter(
         field_name='book__title',
@@ -315,6 +447,15 @@ class BookEditionFilter(BaseFilterSet):
         })
     )
 
+    # Exact publisher selected by a publisher facet link (publisher_name
+    # is a substring search and would also match other publishers)
+    publisher = django_filters.NumberFilter(
+        field_name='publisher',
+        lookup_expr='exact',
+        label='Издательство',
+        widget=forms.HiddenInput()
+    )
+
     # Publication year exact match
     publication_year = django_filters.NumberFilter(
         field_name='publication_year',
@@ -338,25 +479,33 @@ class BookEditionFilter(BaseFilterSet):
         })
     )
 
+    edition_type = django_filters.ChoiceFilter(
+        field_name='edition_type',
+        choices=BookEdition.EDITION_TYPE_CHOICES,
+        label='Тип издания',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
     class Meta:
         model = BookEdition
         fields = [
-            'book_title', 'author_name', 'publisher_name',
-            'publication_year', 'book_series_name'
+            'book_title', 'author_name', 'publisher_name', 'publisher',
+            'publication_year', 'book_series_name', 'edition_type'
         ]
 
 
 class PublisherFilter(BaseFilterSet):
     """
     FilterSet for Publisher model with name search by substring.
+
+    Names are matched against the transliterated Publisher.search_key.
     
     Implements requirement:
     - FR-017: Publisher name search by substring
     """
     
     name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains',
+        method='filter_publisher_name',
         label='Название издательства',
         max_length=255,
         widget=forms.TextInput(attrs={
@@ -365,6 +514,12 @@ class PublisherFilter(BaseFilterSet):
         })
     )
     
+    def filter_publisher_name(self, queryset, name, value):
+        """Custom filter method to search by the transliterated name."""
+        if value:
+            return queryset.filter(search_key__contains=fold(value))
+        return queryset
+
     class Meta:
         model = Publisher
         fields = ['name']
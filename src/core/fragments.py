@@ -0,0 +1,103 @@
+"""
+Кэш фрагментов строк списков.
+
+Строка списка (например, <li> записи журнала чтения) рендерится отдельным
+шаблоном для одного объекта и кэшируется под ключом из модели, pk, версии
+объекта (core.cache.object_versions) и текста шаблона строки. Версия объекта
+сбрасывается (см. core.signals) при записи самого объекта и любого связанного
+объекта, который показывает его строка (ROW_DEPENDENCIES): например,
+переименование автора сбрасывает версии записей журнала его книг.
+
+render_rows() получает версии и фрагменты страницы двумя обращениями к кэшу
+(get_many) и загружает и рендерит только строки, которых в кэше нет.
+"""
+from django.apps import apps
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from core.cache import bump_object_versions, make_cache_key, object_versions
+
+ROW_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+# Модель строки -> пути к связанным объектам, которые показывает её строка.
+# Изменение связи многие-ко-многим считается записью объекта, объявившего
+# поле, поэтому вместе с путём к такому полю указывается путь к этому объекту.
+ROW_DEPENDENCIES = {
+    'core.BookEdition': (
+        'book',
+        'publisher',
+        'series',
+    ),
+    'core.ReadingLog': (
+        'book_edition',
+        'book_edition__book',
+        'book_edition__book__authors',
+        'book_edition__publisher',
+        'book_edition__series',
+    ),
+}
+
+
+def _related_model(model, path):
+    for name in path.split('__'):
+        model = model._meta.get_field(name).related_model
+    return model
+
+
+def dependent_rows(model, pks) -> list:
+    """
+    Строки, которые показывают объекты модели с первичными ключами pks:
+    список пар (модель строки, pk), включая сами объекты.
+    """
+    pks = list(pks)
+    rows = [(model, pk) for pk in pks]
+    for label, paths in ROW_DEPENDENCIES.items():
+        row_model = apps.get_model(label)
+        for path in paths:
+            if _related_model(row_model, path) is model:
+                row_pks = row_model.objects.filter(**{f'{path}__in': pks}).order_by().values_list('pk', flat=True)
+                rows.extend((row_model, pk) for pk in row_pks)
+    return rows
+
+
+def bump_row_versions(rows) -> None:
+    """Сбрасывает версии строк - пар (модель, pk) - по одному обращению к кэшу на модель."""
+    by_model = {}
+    for model, pk in rows:
+        by_model.setdefault(model, set()).add(pk)
+    for model, pks in by_model.items():
+        bump_object_versions(model, pks)
+
+
+def render_rows(template_name, context_name, queryset, pks) -> list:
+    """
+    Возвращает HTML строк объектов queryset с первичными ключами pks в порядке pks.
+
+    Шаблон строки получает объект в переменной context_name. queryset должен
+    загружать связи, которые использует шаблон: по нему загружаются только
+    строки, которых нет в кэше. Версии читаются до загрузки, поэтому строка,
+    отрендеренная по данным до записи, не попадёт в кэш под новой версией.
+    """
+    pks = list(pks)
+    if not pks:
+        return []
+    model = queryset.model
+    template = get_template(template_name)
+    source = template.template.source
+    versions = object_versions(model, pks)
+    keys = {
+        pk: make_cache_key('row', template_name, source, model._meta.label_lower, pk, versions[pk])
+        for pk in pks
+    }
+    fragments = cache.get_many(keys.values())
+
+    missing = [pk for pk in pks if keys[pk] not in fragments]
+    if missing:
+        rendered = {
+            keys[obj.pk]: str(template.render({context_name: obj}))
+            for obj in queryset.filter(pk__in=missing)
+        }
+        cache.set_many(rendered, ROW_FRAGMENT_TIMEOUT)
+        fragments.update(rendered)
+    return [mark_safe(fragments[keys[pk]]) for pk in pks if keys[pk] in fragments]
@@ -0,0 +1,411 @@
+"""
+Генерация синтетической библиотеки для нагрузочного тестирования и профилирования.
+
+    python manage.py generate_library --scale 0.1 --seed 42
+
+При --scale 1 создаётся 100 000 изданий, 500 000 записей журнала чтения и
+100 000 заметок в деревьях глубиной до 8 уровней. Число объектов каждой
+модели можно переопределить отдельно (--authors, --reading-logs, ...).
+
+Распределения неравномерные, как в настоящей библиотеке: у популярных
+авторов много книг, у крупных издательств много изданий, часть изданий
+перечитывается многократно, а недавние годы встречаются чаще старых.
+Результат полностью определяется значением --seed.
+"""
+import random
+from collections import deque
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.cache import bump_model_version
+from core.enums import MonthEnum
+from core.helpers import list_to_dot_separated_string
+from core.models import (
+    Author, Book, BookEdition, BookSeries, KeyWord, Note, NoteToBookEdition,
+    Publisher, ReadingLog, ReadingStatistic,
+)
+from core.statistics import rebuild_reading_statistics
+from core.transliteration import rebuild_search_keys
+
+BASE_SIZES = {
+    'authors': 20_000,
+    'publishers': 1_000,
+    'series': 5_000,
+    'books': 80_000,
+    'editions': 100_000,
+    'reading_logs': 500_000,
+    'notes': 100_000,
+    'keywords': 2_000,
+}
+
+FIRST_YEAR = 1970
+LAST_YEAR = 2025
+NOTE_TREE_DEPTH = 8
+NOTES_PER_ROOT = 2_000
+
+FIRST_NAMES = (
+    'Александр', 'Алексей', 'Анна', 'Борис', 'Валентина', 'Виктор', 'Галина',
+    'Дмитрий', 'Евгений', 'Екатерина', 'Иван', 'Ирина', 'Константин', 'Лев',
+    'Мария', 'Михаил', 'Наталья', 'Николай', 'Ольга', 'Павел', 'Сергей',
+    'Татьяна', 'Фёдор', 'Юлия', 'John', 'Mary', 'William', 'Ursula', 'Isaac',
+    'Arthur', 'Terry', 'Neil',
+)
+LAST_NAMES = (
+    'Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов',
+    'Лебедев', 'Козлов', 'Новиков', 'Морозов', 'Волков', 'Соловьёв', 'Васильев',
+    'Зайцев', 'Павлов', 'Семёнов', 'Голубев', 'Виноградов', 'Богданов',
+    'Воробьёв', 'Фёдоров', 'Михайлов', 'Беляев', 'Тарасов', 'Белов', 'Комаров',
+    'Орлов', 'Киселёв', 'Макаров', 'Smith', 'Johnson', 'Brown', 'Clarke',
+    'Asimov', 'Pratchett', 'Gaiman', 'Le Guin', 'Tolkien', 'Herbert',
+)
+MIDDLE_NAMES = (
+    'Александрович', 'Алексеевич', 'Борисович', 'Викторович', 'Иванович',
+    'Михайлович', 'Николаевич', 'Павлович', 'Сергеевич', 'Фёдорович',
+)
+TITLE_ADJECTIVES = (
+    'Тёмная', 'Последняя', 'Белая', 'Тихая', 'Забытая', 'Далёкая', 'Старая',
+    'Новая', 'Северная', 'Золотая', 'Пустая', 'Долгая', 'Странная', 'Чужая',
+)
+TITLE_NOUNS = (
+    'башня', 'дорога', 'река', 'звезда', 'война', 'память', 'гавань', 'тайна',
+    'земля', 'ночь', 'зима', 'библиотека', 'планета', 'крепость', 'пустыня',
+)
+TITLE_ORIGINAL_WORDS = (
+    'Dark', 'Last', 'White', 'Silent', 'Forgotten', 'Distant', 'Old', 'Tower',
+    'Road', 'River', 'Star', 'War', 'Memory', 'Harbor', 'Secret', 'Land',
+)
+PUBLISHER_NAMES = (
+    'Азбука', 'АСТ', 'Эксмо', 'Наука', 'Мир', 'Прогресс', 'Художественная литература',
+    'Детская литература', 'Penguin', 'Tor', 'Gollancz', 'Vintage',
+)
+SERIES_NAMES = (
+    'Мастера фантастики', 'Библиотека приключений', 'Классика', 'Новая проза',
+    'Зарубежный детектив', 'Философия', 'История', 'Science Fiction Masterworks',
+)
+KEYWORD_STEMS = (
+    'время', 'память', 'язык', 'город', 'власть', 'свобода', 'технология',
+    'миф', 'смерть', 'любовь', 'война', 'наука', 'религия', 'экология',
+)
+
+# Веса для числа авторов книги (1, 2, 3, 4)
+AUTHORS_PER_BOOK_WEIGHTS = (80, 15, 4, 1)
+# Веса для числа дочерних заметок (0..6)
+NOTE_CHILDREN_WEIGHTS = (10, 10, 15, 20, 20, 15, 10)
+EDITION_TYPE_WEIGHTS = {
+    'PAPER_BOOK': 70,
+    'EBOOK': 20,
+    'AUDIOBOOK': 8,
+    'WEBPAGE': 2,
+}
+
+
+class SkewedChooser:
+    """
+    Выбор элементов с распределением Ципфа: вес элемента ранга r равен 1 / r ** exponent.
+
+    Порядок рангов перемешивается, чтобы популярность не совпадала с порядком pk.
+    """
+
+    def __init__(self, rnd, population, exponent=1.0):
+        self.rnd = rnd
+        self.population = list(population)
+        rnd.shuffle(self.population)
+        self.cum_weights = list(accumulate(
+            1 / (rank ** exponent) for rank in range(1, len(self.population) + 1)
+        ))
+
+    def choice(self):
+        return self.rnd.choices(self.population, cum_weights=self.cum_weights)[0]
+
+    def sample(self, k):
+        """Возвращает до k различных элементов."""
+        k = min(k, len(self.population))
+        result = []
+        while len(result) < k:
+            item = self.choice()
+            if item not in result:
+                result.append(item)
+        return result
+
+
+class LibraryGenerator:
+    """Создаёт объекты всех моделей библиотеки пачками через bulk_create."""
+
+    def __init__(self, sizes, seed=0, chunk_size=5_000, log=None):
+        self.sizes = sizes
+        self.rnd = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.log = log or (lambda message: None)
+
+    def bulk_create(self, model, objects):
+        """Сохраняет объекты пачками по chunk_size и возвращает их pk."""
+        pks = []
+        chunk = []
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) >= self.chunk_size:
+                pks.extend(self._flush(model, chunk))
+                chunk = []
+        if chunk:
+            pks.extend(self._flush(model, chunk))
+        self.log(f'{model._meta.label}: {len(pks)}')
+        return pks
+
+    def _flush(self, model, chunk):
+        return [obj.pk for obj in model.objects.bulk_create(chunk)]
+
+    def generate(self):
+        author_ids = self.generate_authors()
+        publisher_ids = self.generate_publishers()
+        series = self.generate_series(publisher_ids)
+        book_ids = self.generate_books(author_ids)
+        edition_ids = self.generate_editions(book_ids, publisher_ids, series)
+        self.generate_reading_logs(edition_ids)
+        keyword_ids = self.generate_keywords()
+        self.generate_notes(keyword_ids, edition_ids)
+        self.fill_sort_columns()
+        rebuild_search_keys()
+        rebuild_reading_statistics()
+
+        for model in (
+            Author, Publisher, BookSeries, Book, BookEdition, ReadingLog,
+            KeyWord, Note, NoteToBookEdition, ReadingStatistic,
+        ):
+            bump_model_version(model)
+
+    def fill_sort_columns(self):
+        """bulk_create не вызывает save(), поэтому копии полей связанных моделей заполняются отдельно."""
+        BookEdition.objects.update(
+            book_title=Subquery(Book.objects.filter(pk=OuterRef('book_id')).values('title')[:1]),
+            publisher_name=Coalesce(
+                Subquery(Publisher.objects.filter(pk=OuterRef('publisher_id')).values('name')[:1]),
+                Value(''),
+            ),
+        )
+        BookSeries.objects.update(publisher_name=Subquery(
+            Publisher.objects.filter(pk=OuterRef('publisher_id')).values('name')[:1],
+        ))
+
+    def generate_authors(self):
+        rnd = self.rnd
+        return self.bulk_create(Author, (
+            Author(
+                first_name=rnd.choice(FIRST_NAMES),
+                last_name=rnd.choice(LAST_NAMES),
+                middle_name=rnd.choice(MIDDLE_NAMES) if rnd.random() < 0.4 else None,
+            )
+            for _ in range(self.sizes['authors'])
+        ))
+
+    def generate_publishers(self):
+        return self.bulk_create(Publisher, (
+            Publisher(name=f'{self.rnd.choice(PUBLISHER_NAMES)} {i}')
+            for i in range(1, self.sizes['publishers'] + 1)
+        ))
+
+    def generate_series(self, publisher_ids):
+        """Возвращает список пар (pk серии, pk издательства)."""
+        publishers = SkewedChooser(self.rnd, publisher_ids, exponent=1.2)
+        series_publishers = [publishers.choice() for _ in range(self.sizes['series'])]
+        series_ids = self.bulk_create(BookSeries, (
+            BookSeries(name=f'{self.rnd.choice(SERIES_NAMES)} {i}', publisher_id=publisher_id)
+            for i, publisher_id in enumerate(series_publishers, start=1)
+        ))
+        return list(zip(series_ids, series_publishers))
+
+    def generate_books(self, author_ids):
+        rnd = self.rnd
+        book_ids = self.bulk_create(Book, (
+            Book(
+                title=self._title(),
+                title_original=(
+                    ' '.join(rnd.sample(TITLE_ORIGINAL_WORDS, k=2)) if rnd.random() < 0.3 else None
+                ),
+            )
+            for _ in range(self.sizes['books'])
+        ))
+
+        authors = SkewedChooser(rnd, author_ids, exponent=1.1)
+        counts = range(1, len(AUTHORS_PER_BOOK_WEIGHTS) + 1)
+        self.bulk_create(Book.authors.through, (
+            Book.authors.through(book_id=book_id, author_id=author_id)
+            for book_id in book_ids
+            for author_id in authors.sample(rnd.choices(counts, weights=AUTHORS_PER_BOOK_WEIGHTS)[0])
+        ))
+        return book_ids
+
+    def _title(self):
+        rnd = self.rnd
+        title = f'{rnd.choice(TITLE_ADJECTIVES)} {rnd.choice(TITLE_NOUNS)}'
+        if rnd.random() < 0.3:
+            title = f'{title} и {rnd.choice(TITLE_NOUNS)}'
+        return title
+
+    def generate_editions(self, book_ids, publisher_ids, series):
+        """У каждой книги есть хотя бы одно издание, остальные достаются популярным книгам."""
+        rnd = self.rnd
+        books = SkewedChooser(rnd, book_ids, exponent=1.0)
+        publishers = SkewedChooser(rnd, publisher_ids, exponent=1.2)
+        series_chooser = SkewedChooser(rnd, series, exponent=1.0)
+        edition_types = list(EDITION_TYPE_WEIGHTS)
+        edition_type_weights = list(EDITION_TYPE_WEIGHTS.values())
+
+        def editions():
+            for i in range(self.sizes['editions']):
+                book_id = book_ids[i] if i < len(book_ids) else books.choice()
+                series_id = None
+                if rnd.random() < 0.25:
+                    series_id, publisher_id = series_chooser.choice()
+                else:
+                    publisher_id = publishers.choice()
+                yield BookEdition(
+                    book_id=book_id,
+                    publisher_id=publisher_id,
+                    series_id=series_id,
+                    publication_year=max(1800, LAST_YEAR - int(rnd.expovariate(1 / 15))),
+                    isbn=f'978-5-{rnd.randint(0, 99999):05d}-{rnd.randint(0, 999):03d}-{rnd.randint(0, 9)}'
+                    if rnd.random() < 0.6 else None,
+                    edition_type=rnd.choices(edition_types, weights=edition_type_weights)[0],
+                )
+
+        return self.bulk_create(BookEdition, editions())
+
+    def generate_reading_logs(self, edition_ids):
+        """Недавние годы встречаются чаще, часть записей без месяцев или без окончания."""
+        rnd = self.rnd
+        editions = SkewedChooser(rnd, edition_ids, exponent=1.05)
+
+        def reading_logs():
+            for _ in range(self.sizes['reading_logs']):
+                year_start = max(FIRST_YEAR, LAST_YEAR - int(rnd.expovariate(1 / 12)))
+                month_start = rnd.choice(MonthEnum.values)
+                finish = year_start * 12 + month_start - 1 + int(rnd.expovariate(1 / 2))
+                year_finish, month_finish = divmod(finish, 12)
+                if year_finish > LAST_YEAR or rnd.random() < 0.05:
+                    year_finish = month_finish = None
+                else:
+                    month_finish += 1
+                if rnd.random() < 0.1:
+                    month_start = month_finish = None
+                reading_log = ReadingLog(
+                    book_edition_id=editions.choice(),
+                    year_start=year_start,
+                    month_start=month_start,
+                    year_finish=year_finish,
+                    month_finish=month_finish,
+                )
+                reading_log.update_period_keys()
+                yield reading_log
+
+        return self.bulk_create(ReadingLog, reading_logs())
+
+    def generate_keywords(self):
+        return self.bulk_create(KeyWord, (
+            KeyWord(word=f'{self.rnd.choice(KEYWORD_STEMS)} {i}')
+            for i in range(1, self.sizes['keywords'] + 1)
+        ))
+
+    def generate_notes(self, keyword_ids, edition_ids):
+        """
+        Создаёт деревья заметок обходом в ширину.
+
+        Заметки сохраняются по уровням, чтобы родитель получил pk раньше детей.
+        """
+        rnd = self.rnd
+        note_ids = {}
+        for level in self._note_tree_levels():
+            pks = self.bulk_create(Note, (
+                Note(
+                    index=list_to_dot_separated_string(index),
+                    parent_id=note_ids[index[:-1]] if len(index) > 1 else None,
+                    root_id=note_ids[index[:1]] if len(index) > 1 else None,
+                    topic=f'Заметка {list_to_dot_separated_string(index)}',
+                    text='Текст заметки. ' * rnd.randint(1, 30),
+                )
+                for index in level
+            ))
+            note_ids.update(zip(level, pks))
+
+        notes = sorted(note_ids.values())
+        keywords = SkewedChooser(rnd, keyword_ids, exponent=1.1)
+        editions = SkewedChooser(rnd, edition_ids, exponent=1.0)
+        self.bulk_create(Note.keywords.through, (
+            Note.keywords.through(note_id=note_id, keyword_id=keyword_id)
+            for note_id in notes
+            for keyword_id in keywords.sample(rnd.randint(0, 4))
+        ))
+        self.bulk_create(NoteToBookEdition, (
+            NoteToBookEdition(note_id=note_id, book_edition_id=editions.choice())
+            for note_id in notes
+            if rnd.random() < 0.3
+        ))
+
+    def _note_tree_levels(self):
+        """
+        Возвращает индексы заметок (кортежи чисел), сгруппированные по глубине.
+
+        Каждое дерево строится обходом в ширину до NOTES_PER_ROOT заметок.
+        """
+        total = self.sizes['notes']
+        counts = range(len(NOTE_CHILDREN_WEIGHTS))
+        levels = {}
+        created = 0
+        root = 0
+        while created < total:
+            root += 1
+            queue = deque([(root,)])
+            tree_size = 0
+            while queue and tree_size < NOTES_PER_ROOT and created < total:
+                index = queue.popleft()
+                levels.setdefault(len(index), []).append(index)
+                created += 1
+                tree_size += 1
+                if len(index) < NOTE_TREE_DEPTH:
+                    children = self.rnd.choices(counts, weights=NOTE_CHILDREN_WEIGHTS)[0]
+                    if len(index) == 1:
+                        children = max(children, 4)
+                    queue.extend(index + (minor,) for minor in range(1, children + 1))
+        return [levels[depth] for depth in sorted(levels)]
+
+
+class Command(BaseCommand):
+    help = 'Наполняет базу синтетической библиотекой заданного объёма'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='Множитель объёма данных (1 = 100 000 изданий)',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5_000,
+            help='Размер пачки для bulk_create',
+        )
+        for name, size in BASE_SIZES.items():
+            parser.add_argument(
+                f'--{name.replace("_", "-")}', type=int, dest=name,
+                help=f'Число объектов (по умолчанию {size} * scale)',
+            )
+
+    def handle(self, *args, **options):
+        sizes = {
+            name: options[name] if options[name] is not None else max(1, int(size * options['scale']))
+            for name, size in BASE_SIZES.items()
+        }
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        generator = LibraryGenerator(
+            sizes, seed=options['seed'], chunk_size=options['chunk_size'], log=log,
+        )
+        with transaction.atomic():
+            generator.generate()
+
+        if options['verbosity']:
+            summary = ', '.join(f'{name}: {size}' for name, size in sizes.items())
+            self.stdout.write(self.style.SUCCESS(f'Библиотека создана ({summary})'))
@@ -0,0 +1,20 @@
+"""
+Пересчёт сводки статистики чтения (ReadingStatistic) по всем записям журнала.
+
+    python manage.py rebuild_reading_statistics
+
+Нужен после миграции, массовой загрузки данных и изменений, которые сводка не
+отслеживает инкрементально: смены типа или издательства издания и авторов книги.
+"""
+from django.core.management.base import BaseCommand
+
+from core.statistics import rebuild_reading_statistics
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сводку статистики чтения'
+
+    def handle(self, *args, **options):
+        rows = rebuild_reading_statistics()
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(f'Статистика пересчитана ({rows} строк)'))
@@ -0,0 +1,20 @@
+"""
+Пересчёт транслитерированных ключей поиска (search_key) авторов, книг и издательств.
+
+    python manage.py rebuild_search_keys
+
+Нужен после миграции, массовой загрузки данных через bulk_create или update()
+и после изменения правил транслитерации в core.transliteration.
+"""
+from django.core.management.base import BaseCommand
+
+from core.transliteration import rebuild_search_keys
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает ключи поиска авторов, книг и издательств'
+
+    def handle(self, *args, **options):
+        updated = rebuild_search_keys()
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(f'Ключи поиска пересчитаны ({updated} объектов)'))
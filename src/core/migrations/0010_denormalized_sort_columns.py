@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:50
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_sort_columns(apps, schema_editor):
+    Book = apps.get_model('core', 'Book')
+    BookEdition = apps.get_model('core', 'BookEdition')
+    BookSeries = apps.get_model('core', 'BookSeries')
+    Publisher = apps.get_model('core', 'Publisher')
+
+    BookEdition.objects.update(book_title=Subquery(
+        Book.objects.filter(pk=OuterRef('book_id')).values('title')[:1],
+    ))
+    BookSeries.objects.update(publisher_name=Subquery(
+        Publisher.objects.filter(pk=OuterRef('publisher_id')).values('name')[:1],
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_note_root_alter_note_parent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookedition',
+            name='book_title',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='bookseries',
+            name='publisher_name',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_sort_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='bookedition',
+            index=models.Index(fields=['book_title', 'id'], name='bookedition_title_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookseries',
+            index=models.Index(fields=['publisher_name', 'name'], name='bookseries_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['parent', 'created_at'], name='note_parent_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readinglog',
+            index=models.Index(fields=['-year_finish', '-month_finish', '-year_start', '-month_start'], name='readinglog_period_order_idx'),
+        ),
+    ]
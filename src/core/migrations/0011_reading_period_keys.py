@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:53
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_period_keys(apps, schema_editor):
+    """Same keys as core.models.period_start_key() and period_finish_key()."""
+    ReadingLog = apps.get_model('core', 'ReadingLog')
+
+    ReadingLog.objects.filter(year_start__isnull=False).update(
+        start_key=F('year_start_id') * 100 + Coalesce('month_start', Value(0)),
+    )
+    ReadingLog.objects.filter(year_finish__isnull=False).update(
+        finish_key=F('year_finish_id') * 100 + Coalesce('month_finish', Value(13)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_denormalized_sort_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='readinglog',
+            name='readinglog_period_order_idx',
+        ),
+        migrations.AddField(
+            model_name='readinglog',
+            name='finish_key',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='readinglog',
+            name='start_key',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_period_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='readinglog',
+            index=models.Index(fields=['-finish_key', '-start_key'], name='readinglog_period_order_idx'),
+        ),
+    ]
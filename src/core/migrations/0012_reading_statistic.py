@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_reading_period_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('edition_type', 'Edition type'), ('publisher', 'Publisher'), ('author', 'Author')], max_length=20)),
+                ('key', models.CharField(blank=True, default='', max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField(default=0)),
+                ('started', models.PositiveIntegerField(default=0)),
+                ('finished', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'year', 'month'), name='readingstatistic_unique_cell')],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_years_to_integers(apps, schema_editor):
+    ReadingLog = apps.get_model('core', 'ReadingLog')
+    ReadingLog.objects.update(
+        year_start_value=F('year_start_id'),
+        year_finish_value=F('year_finish_id'),
+    )
+
+
+def copy_integers_to_years(apps, schema_editor):
+    Year = apps.get_model('core', 'Year')
+    ReadingLog = apps.get_model('core', 'ReadingLog')
+
+    years = set(ReadingLog.objects.values_list('year_start_value', flat=True))
+    years |= set(ReadingLog.objects.values_list('year_finish_value', flat=True))
+    years.discard(None)
+    Year.objects.bulk_create([Year(year=year) for year in years], ignore_conflicts=True)
+    ReadingLog.objects.update(
+        year_start_id=F('year_start_value'),
+        year_finish_id=F('year_finish_value'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_reading_statistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readinglog',
+            name='year_start_value',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='readinglog',
+            name='year_finish_value',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_years_to_integers, copy_integers_to_years),
+        migrations.RemoveField(
+            model_name='readinglog',
+            name='year_start',
+        ),
+        migrations.RemoveField(
+            model_name='readinglog',
+            name='year_finish',
+        ),
+        migrations.RenameField(
+            model_name='readinglog',
+            old_name='year_start_value',
+            new_name='year_start',
+        ),
+        migrations.RenameField(
+            model_name='readinglog',
+            old_name='year_finish_value',
+            new_name='year_finish',
+        ),
+        migrations.AlterField(
+            model_name='readinglog',
+            name='year_start',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='readinglog',
+            name='year_finish',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.DeleteModel(
+            name='Year',
+        ),
+    ]
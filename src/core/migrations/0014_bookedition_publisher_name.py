@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_publisher_names(apps, schema_editor):
+    BookEdition = apps.get_model('core', 'BookEdition')
+    Publisher = apps.get_model('core', 'Publisher')
+
+    BookEdition.objects.update(publisher_name=Coalesce(
+        Subquery(Publisher.objects.filter(pk=OuterRef('publisher_id')).values('name')[:1]),
+        Value(''),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_readinglog_integer_years'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookedition',
+            name='publisher_name',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_publisher_names, migrations.RunPython.noop),
+    ]
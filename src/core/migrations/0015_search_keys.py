@@ -0,0 +1,99 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:05
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of core.transliteration as of this migration, so that replaying
+# it gives the same keys after the rules change (rebuild_search_keys updates
+# existing keys to the current rules)
+CYRILLIC_TABLE = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'і': 'i', 'ї': 'i', 'є': 'e', 'ў': 'u',
+})
+CYRILLIC_ENDINGS_RE = re.compile(r'[иы]й\b')
+KEY_SEPARATOR = '\n'
+
+# Substring filters (search_key__contains) compile to LIKE '%...%', which a
+# B-tree index cannot serve. On PostgreSQL they use pg_trgm GIN indexes;
+# on other databases these filters scan the table.
+TRIGRAM_INDEXES = {
+    'author_search_key_trgm_idx': 'core_author',
+    'book_search_key_trgm_idx': 'core_book',
+    'publisher_search_key_trgm_idx': 'core_publisher',
+}
+
+
+def fold(text):
+    return CYRILLIC_ENDINGS_RE.sub('y', ' '.join(text.casefold().split())).translate(CYRILLIC_TABLE)
+
+
+def search_key(*values):
+    return KEY_SEPARATOR.join(fold(str(value)) for value in values if value)
+
+
+def fill_search_keys(apps, schema_editor):
+    # Historical models have no get_search_key(), so the keys are built here
+    keys = {
+        'Author': lambda obj: search_key(' '.join(
+            item for item in (obj.last_name, obj.first_name, obj.middle_name) if item
+        )),
+        'Book': lambda obj: search_key(
+            obj.title, obj.extended_title, obj.title_original, obj.extended_title_original,
+        ),
+        'Publisher': lambda obj: search_key(obj.name),
+    }
+    for name, key in keys.items():
+        model = apps.get_model('core', name)
+        objects = list(model.objects.all())
+        for obj in objects:
+            obj.search_key = key(obj)
+        model.objects.bulk_update(objects, ['search_key'], batch_size=5_000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (search_key gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_bookedition_publisher_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='search_key',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='search_key',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='search_key',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
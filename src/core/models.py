@@ -1,7 +1,12 @@
+from functools import lru_cache
+
 from django.db import models
 from django.urls import reverse
 
 from core.enums import MonthEnum
+from core import transliteration
+
+MONTH_LABELS = dict(MonthEnum.choices)
 
 
 class Book(models.Model):
@@ -23,6 +28,19 @@ class Book(models.Model):
         max_length=200,
         null=True, blank=True,
     )
+    # Transliterated key of all titles for searching in either script
+    # (see core.transliteration), kept in sync by save(). Substring filters on it
+    # use a pg_trgm GIN index on PostgreSQL (migration 0015)
+    search_key = models.TextField(editable=False, default='')
+
+    SEARCH_KEY_FIELDS = ('title', 'extended_title', 'title_original', 'extended_title_original')
+
+    def save(self, *args, **kwargs):
+        self.search_key = self.get_search_key()
+        super().save(*args, **kwargs)
+
+    def get_search_key(self):
+        return transliteration.search_key(*(getattr(self, field) for field in self.SEARCH_KEY_FIELDS))
 
     def __str__(self):
         return self.title
@@ -45,6 +63,20 @@ class Author(models.Model):
         max_length=50,
         null=True, blank=True,
     )
+    # Transliterated key of the full name for searching in either script
+    # (see core.transliteration), kept in sync by save(). Substring filters on it
+    # use a pg_trgm GIN index on PostgreSQL (migration 0015)
+    search_key = models.TextField(editable=False, default='')
+
+    SEARCH_KEY_FIELDS = ('last_name', 'first_name', 'middle_name')
+
+    def save(self, *args, **kwargs):
+        self.search_key = self.get_search_key()
+        super().save(*args, **kwargs)
+
+    def get_search_key(self):
+        # One space-separated value, so that a query may span name parts
+        return transliteration.search_key(self.full_name)
 
     def __str__(self):
         return self.full_name
@@ -54,43 +86,41 @@ class Author(models.Model):
 
     @property
     def full_name(self):
-        return ' '.join(
-            (
-                item for item
-                in (
-                self.last_name,
-                self.first_name,
-                self.middle_name,
-            )
-                if item
-            ),
-        )
+        return format_author_name(self.last_name, self.first_name, self.middle_name)
 
     @property
     def full_name_short(self):
-        return ' '.join(
-            (
-                item for item
-                in (
-                    self.last_name,
-                    self.first_name_short,
-                    self.middle_name_short,
-                )
-                if item
-            ),
-        )
+        return format_author_name_short(self.last_name, self.first_name, self.middle_name)
 
     @property
     def first_name_short(self):
-        if self.first_name:
-            return f'{self.first_name[0]}.'
-        return None
+        return _initial(self.first_name)
 
     @property
     def middle_name_short(self):
-        if self.middle_name:
-            return f'{self.middle_name[0]}.'
-        return None
+        return _initial(self.middle_name)
+
+
+def _initial(name):
+    if name:
+        return f'{name[0]}.'
+    return None
+
+
+@lru_cache(maxsize=4096)
+def format_author_name(last_name, first_name, middle_name):
+    """Full author name, e.g. "Petrov Ivan Sergeevich"; memoized by the name parts."""
+    return ' '.join(item for item in (last_name, first_name, middle_name) if item)
+
+
+@lru_cache(maxsize=4096)
+def format_author_name_short(last_name, first_name, middle_name):
+    """Author name with initials, e.g. "Petrov I. S."; memoized by the name parts."""
+    return ' '.join(
+        item for item
+        in (last_name, _initial(first_name), _initial(middle_name))
+        if item
+    )
 
 
 class BookEdition(models.Model):
@@ -134,12 +164,28 @@ class BookEdition(models.Model):
         help_text="Type of book edition",
         null=False, blank=False,  # Required field
     )
+    # Copy of book.title for ordering the edition list without a join,
+    # kept in sync by save() and core.signals
+    book_title = models.CharField(max_length=100, editable=False, default='')
+    # Copy of publisher.name for rendering the edition label without a join,
+    # kept in sync by save() and core.signals
+    publisher_name = models.CharField(max_length=100, editable=False, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['book_title', 'id'], name='bookedition_title_order_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.book_title = self.book.title
+        self.publisher_name = self.publisher.name if self.publisher_id else ''
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return ' - '.join(
             (
                 str(item) for item
-                in (self.title, self.publisher, self.publication_year)
+                in (self.book_title, self.publisher_name or None, self.publication_year)
                 if item is not None
             ),
         )
@@ -149,7 +195,7 @@ class BookEdition(models.Model):
         return ' - '.join(
             (
                 str(item) for item
-                in (self.publisher, self.publication_year)
+                in (self.publisher_name or None, self.publication_year)
                 if item is not None
             ),
         )
@@ -180,6 +226,19 @@ class BookEdition(models.Model):
 
 class Publisher(models.Model):
     name = models.CharField(max_length=100, db_index=True)  # For filtering
+    # Transliterated key of the name for searching in either script
+    # (see core.transliteration), kept in sync by save(). Substring filters on it
+    # use a pg_trgm GIN index on PostgreSQL (migration 0015)
+    search_key = models.TextField(editable=False, default='')
+
+    SEARCH_KEY_FIELDS = ('name',)
+
+    def save(self, *args, **kwargs):
+        self.search_key = self.get_search_key()
+        super().save(*args, **kwargs)
+
+    def get_search_key(self):
+        return transliteration.search_key(self.name)
 
     def __str__(self):
         return self.name
@@ -195,28 +254,174 @@ class BookSeries(models.Model):
         on_delete=models.PROTECT,
         related_name='book_series',
     )
+    # Copy of publisher.name for ordering the series list without a join,
+    # kept in sync by save() and core.signals
+    publisher_name = models.CharField(max_length=100, editable=False, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['publisher_name', 'name'], name='bookseries_order_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.publisher_name = self.publisher.name
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f'"{self.name}", {self.publisher}'
+        return f'"{self.name}", {self.publisher_name}'
 
     def get_absolute_url(self):
         return reverse('book_series_detail', kwargs={'pk': self.pk})
 
 
-class Year(models.Model):
-    year = models.BigIntegerField(primary_key=True)
+# Reading period keys are year * 100 + month. A missing month sorts before
+# every month of the year for the start and after every month for the finish,
+# so a key range covers whole years: [year * 100, year * 100 + 13].
+START_KEY_MISSING_MONTH = 0
+FINISH_KEY_MISSING_MONTH = 13
 
-    def __str__(self):
-        return str(self.year)
 
-    def get_absolute_url(self):
-        return reverse('year_detail', kwargs={'pk': self.pk})
+def period_start_key(year, month):
+    """Comparable key of a reading start, None if the year is unknown."""
+    if year is None:
+        return None
+    return int(year) * 100 + int(month or START_KEY_MISSING_MONTH)
 
-    def reading_logs(self):
-        return ReadingLog.objects.filter(
-            models.Q(year_start=self) | models.Q(year_finish=self),
+
+def period_finish_key(year, month):
+    """Comparable key of a reading finish, None if the year is unknown."""
+    if year is None:
+        return None
+    return int(year) * 100 + int(month or FINISH_KEY_MISSING_MONTH)
+
+
+def year_key_range(year):
+    """Inclusive range of period keys falling into the year."""
+    return int(year) * 100 + START_KEY_MISSING_MONTH, int(year) * 100 + FINISH_KEY_MISSING_MONTH
+
+
+# Order of reading logs in lists: the latest finished first
+READING_LOG_ORDERING = ('-finish_key', '-start_key')
+
+
+def year_url(year):
+    return reverse('year_detail', kwargs={'pk': year})
+
+
+def reading_log_years():
+    """Years with a reading started or finished in them, the latest first."""
+    started = ReadingLog.objects.filter(year_start__isnull=False).values_list('year_start', flat=True)
+    finished = ReadingLog.objects.filter(year_finish__isnull=False).values_list('year_finish', flat=True)
+    # UNION removes duplicates, each side reads only its year index
+    return started.order_by().union(finished.order_by()).order_by('-year_start')
+
+
+def year_reading_logs(year):
+    """Reading logs started or finished in the year."""
+    key_range = year_key_range(year)
+    return ReadingLog.objects.filter(
+        models.Q(start_key__range=key_range) | models.Q(finish_key__range=key_range),
+    )
+
+
+def month_display(month):
+    return MONTH_LABELS.get(month, month)
+
+
+# Period strings depend only on the four period fields, so they are memoized
+# by value: rendering a list formats each distinct period once per process.
+@lru_cache(maxsize=4096)
+def format_period(year_start, month_start, year_finish, month_finish):
+    """Plain text period of a reading log, see ReadingLog.period."""
+    if year_start == year_finish:
+        if not month_start or not month_finish:
+            result = str(year_start)
+        else:
+            result = (
+                f'{year_start} '
+                f'{month_display(month_start)} - '
+                f'{month_display(month_finish)}'
+            )
+    else:
+        if month_start:
+            start_result = (
+                f'{year_start} {month_display(month_start)}'
+            )
+        else:
+            start_result = str(year_start)
+        if month_finish:
+            finish_result = (
+                f'{year_finish} {month_display(month_finish)}'
+            )
+        else:
+            finish_result = str(year_finish)
+
+        result = f'{start_result} - {finish_result}'
+
+    return result
+
+
+@lru_cache(maxsize=4096)
+def format_period_html(year_start, month_start, year_finish, month_finish):
+    """Period of a reading log with links to the year pages."""
+    if year_start == year_finish:
+        year_start_link = (
+            f'<a href="{year_url(year_start)}">'
+            f'{year_start}'
+            f'</a>'
         )
 
+        if not month_start or not month_finish:
+            result = year_start_link
+        else:
+            result = (
+                f'{year_start_link} '
+                f'{month_display(month_start)} - '
+                f'{month_display(month_finish)}'
+            )
+    else:
+        if year_start:
+            year_start_link = (
+                f'<a href="{year_url(year_start)}">'
+                f'{year_start}'
+                f'</a>'
+            )
+        else:
+            year_start_link = None
+
+        if year_finish:
+            year_finish_link = (
+                f'<a href="{year_url(year_finish)}">'
+                f'{year_finish}'
+                f'</a>'
+            )
+        else:
+            year_finish_link = None
+
+        if year_start_link and month_start:
+            start_result = (
+                f'{year_start_link} {month_display(month_start)}'
+            )
+        else:
+            start_result = year_start_link
+        if year_finish_link and month_finish:
+            finish_result = (
+                f'{year_finish_link} {month_display(month_finish)}'
+            )
+        else:
+            finish_result = year_finish_link
+
+        if year_start_link and year_finish_link:
+            result = f'{start_result} - {finish_result}'
+        elif year_start_link:
+            result = f'{start_result} - ...'
+        elif year_finish_link:
+            result = f'... - {finish_result}'
+        else:
+            result = '-'
+
+    return result
+
 
 class ReadingLog(models.Model):
     book_edition = models.ForeignKey(
@@ -224,28 +429,41 @@ class ReadingLog(models.Model):
         on_delete=models.PROTECT,
         related_name='reading_logs',
     )
-    year_start = models.ForeignKey(
-        'Year',
-        on_delete=models.PROTECT,
-        related_name='year_start',
+    year_start = models.PositiveSmallIntegerField(
         null=True, blank=True,
+        db_index=True  # For the year list
     )
     month_start = models.IntegerField(
         choices=MonthEnum.choices,
         null=True, blank=True,
         db_index=True  # For filtering
     )
-    year_finish = models.ForeignKey(
-        'Year',
-        on_delete=models.PROTECT,
-        related_name='year_finish',
+    year_finish = models.PositiveSmallIntegerField(
         null=True, blank=True,
+        db_index=True  # For the year list
     )
     month_finish = models.IntegerField(
         choices=MonthEnum.choices,
         null=True, blank=True,
         db_index=True  # For filtering
     )
+    # Maintained by save(), see period_start_key() and period_finish_key()
+    start_key = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
+    finish_key = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Also serves finish_key range filters as the leading column
+            models.Index(fields=list(READING_LOG_ORDERING), name='readinglog_period_order_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.update_period_keys()
+        super().save(*args, **kwargs)
+
+    def update_period_keys(self):
+        self.start_key = period_start_key(self.year_start, self.month_start)
+        self.finish_key = period_finish_key(self.year_finish, self.month_finish)
 
     def __str__(self):
         return self.period
@@ -255,92 +473,11 @@ class ReadingLog(models.Model):
 
     @property
     def period(self):
-        if self.year_start == self.year_finish:
-            if not self.month_start or not self.month_finish:
-                result = str(self.year_start)
-            else:
-                result = (
-                    f'{self.year_start} '
-                    f'{self.get_month_start_display()} - '
-                    f'{self.get_month_finish_display()}'
-                )
-        else:
-            if self.month_start:
-                start_result = (
-                    f'{self.year_start} {self.get_month_start_display()}'
-                )
-            else:
-                start_result = str(self.year_start)
-            if self.month_finish:
-                finish_result = (
-                    f'{self.year_finish} {self.get_month_finish_display()}'
-                )
-            else:
-                finish_result = str(self.year_finish)
-
-            result = f'{start_result} - {finish_result}'
-
-        return result
+        return format_period(self.year_start, self.month_start, self.year_finish, self.month_finish)
 
     @property
     def period_for_template(self):
-        if self.year_start == self.year_finish:
-            year_start_link = (
-                f'<a href="{self.year_start.get_absolute_url()}">'
-                f'{self.year_start}'
-                f'</a>'
-            )
-
-            if not self.month_start or not self.month_finish:
-                result = year_start_link
-            else:
-                result = (
-                    f'{year_start_link} '
-                    f'{self.get_month_start_display()} - '
-                    f'{self.get_month_finish_display()}'
-                )
-        else:
-            if self.year_start:
-                year_start_link = (
-                    f'<a href="{self.year_start.get_absolute_url()}">'
-                    f'{self.year_start}'
-                    f'</a>'
-                )
-            else:
-                year_start_link = None
-
-            if self.year_finish:
-                year_finish_link = (
-                    f'<a href="{self.year_finish.get_absolute_url()}">'
-                    f'{self.year_finish}'
-                    f'</a>'
-                )
-            else:
-                year_finish_link = None
-
-            if year_start_link and self.month_start:
-                start_result = (
-                    f'{year_start_link} {self.get_month_start_display()}'
-                )
-            else:
-                start_result = year_start_link
-            if year_finish_link and self.month_finish:
-                finish_result = (
-                    f'{year_finish_link} {self.get_month_finish_display()}'
-                )
-            else:
-                finish_result = year_finish_link
-
-            if year_start_link and year_finish_link:
-                result = f'{start_result} - {finish_result}'
-            elif year_start_link:
-                result = f'{start_result} - ...'
-            elif year_finish_link:
-                result = f'... - {finish_result}'
-            else:
-                result = '-'
-
-        return result
+        return format_period_html(self.year_start, self.month_start, self.year_finish, self.month_finish)
 
 
 class KeyWord(models.Model):
@@ -373,6 +510,12 @@ class Note(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Top-level notes list: parent IS NULL ordered by created_at
+            models.Index(fields=['parent', 'created_at'], name='note_parent_created_idx'),
+        ]
+
     def __str__(self):
         return f'{self.index} {self.topic}'
 
@@ -393,3 +536,44 @@ class NoteToBookEdition(models.Model):
         related_name='notes',
     )
     additional_info = models.TextField(null=True, blank=True)
+
+
+class ReadingStatistic(models.Model):
+    """
+    Summary of reading logs: started and finished reads per month and dimension.
+
+    Maintained incrementally by core.signals (see core.statistics) and rebuilt
+    from scratch by the rebuild_reading_statistics command.
+    """
+    DIMENSION_TOTAL = 'total'
+    DIMENSION_EDITION_TYPE = 'edition_type'
+    DIMENSION_PUBLISHER = 'publisher'
+    DIMENSION_AUTHOR = 'author'
+    DIMENSION_CHOICES = [
+        (DIMENSION_TOTAL, 'Total'),
+        (DIMENSION_EDITION_TYPE, 'Edition type'),
+        (DIMENSION_PUBLISHER, 'Publisher'),
+        (DIMENSION_AUTHOR, 'Author'),
+    ]
+    # Month of a reading log without a month
+    UNKNOWN_MONTH = 0
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    # Edition type code, publisher or author pk; empty for the total
+    key = models.CharField(max_length=20, blank=True, default='')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField(default=UNKNOWN_MONTH)
+    started = models.PositiveIntegerField(default=0)
+    finished = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index for every dashboard read: dimension, key and period prefixes
+            models.UniqueConstraint(
+                fields=['dimension', 'key', 'year', 'month'],
+                name='readingstatistic_unique_cell',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.dimension} {self.key} {self.year}-{self.month}: {self.started}/{self.finished}'
@@ -0,0 +1,74 @@
+"""
+Плоское представление деревьев заметок для шаблонов.
+
+Вместо рекурсивного {% include %} шаблона узла (новый контекст и поиск
+шаблона на каждую заметку, запросы children.exists и ordered_children
+на каждый узел) дерево заметок разворачивается в Python в список узлов
+в порядке обхода в глубину. Каждый узел хранит уровень, отступ, признак
+наличия детей и число уровней, которые закрываются после него, поэтому
+шаблон notes/_note_tree.html рендерит дерево одним циклом с той же
+вложенной разметкой <li>/<ul>.
+
+Потомки загружаются по одному запросу на уровень дерева (parent_id__in),
+дети каждой заметки упорядочены по index, как в Note.ordered_children.
+"""
+from dataclasses import dataclass
+
+from django.db import connections
+
+from core.models import Note
+
+NOTE_INDENT = 10
+
+
+@dataclass(slots=True)
+class NoteTreeNode:
+    note: Note
+    level: int
+    has_children: bool
+    # после узла без детей закрываются уровни до уровня следующего узла
+    closes: range = range(0)
+
+    @property
+    def indent(self) -> int:
+        return self.level * NOTE_INDENT
+
+
+def load_children(roots) -> dict:
+    """
+    Дети roots и всех их потомков: словарь parent_id -> список заметок по index.
+
+    Все дети одной заметки приходят одним запросом, поэтому разбиение
+    длинного уровня на пачки (ограничение числа параметров SQLite) не
+    нарушает их порядок.
+    """
+    children = {}
+    frontier = [note.pk for note in roots]
+    max_params = connections[Note.objects.db].features.max_query_params
+    while frontier:
+        batch_size = max_params or len(frontier)
+        level = []
+        for start in range(0, len(frontier), batch_size):
+            level.extend(Note.objects.filter(parent_id__in=frontier[start:start + batch_size]).order_by('index'))
+        for note in level:
+            children.setdefault(note.parent_id, []).append(note)
+        frontier = [note.pk for note in level]
+    return children
+
+
+def flatten_note_tree(roots) -> list:
+    """Узлы деревьев заметок roots (в их порядке) в порядке обхода в глубину."""
+    roots = list(roots)
+    children = load_children(roots)
+    nodes = []
+    stack = [(note, 0) for note in reversed(roots)]
+    while stack:
+        note, level = stack.pop()
+        note_children = children.get(note.pk, ())
+        nodes.append(NoteTreeNode(note, level, bool(note_children)))
+        stack.extend((child, level + 1) for child in reversed(note_children))
+
+    for node, next_node in zip(nodes, nodes[1:] + [None]):
+        if not node.has_children:
+            node.closes = range(node.level - (next_node.level if next_node else 0))
+    return nodes
@@ -0,0 +1,175 @@
+"""
+Префиксные индексы для автокомплитов.
+
+PrefixIndex хранит в памяти процесса отсортированный список нормализованных
+значений полей поиска модели и отвечает на запрос по префиксу бисекцией,
+не обращаясь к базе данных.
+
+С fuzzy=True индекс дополнительно хранит списки объектов для каждой триграммы
+значений полей (как pg_trgm) и после совпадений по префиксу добавляет объекты,
+похожие на запрос с опечатками, по убыванию доли совпавших триграмм запроса.
+
+С key_field индекс хранит и хранимый транслитерированный ключ поиска
+(см. core.transliteration) с каждого слова, а запрос сравнивается и в этом
+виде, поэтому находит объекты, записанные кириллицей или латиницей.
+
+Индекс строится при первом запросе. При каждом запросе сверяется версия
+модели в общем кэше (см. core.cache): запись в модель в любом процессе
+увеличивает версию, и индекс перестраивается при следующем запросе.
+"""
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from core.cache import model_versions
+from core.transliteration import KEY_SEPARATOR, fold
+
+
+# Нечёткий поиск: минимальная длина запроса, минимальная доля совпавших
+# триграмм запроса и наибольшее число похожих объектов в ответе
+FUZZY_MIN_LENGTH = 3
+FUZZY_THRESHOLD = 0.5
+FUZZY_LIMIT = 20
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(value) -> str:
+    """Приводит значение к виду для сравнения: без регистра и лишних пробелов."""
+    return ' '.join(str(value).casefold().split())
+
+
+def trigrams(value) -> set:
+    """Триграммы нормализованной строки: каждое слово дополняется пробелами, как в pg_trgm."""
+    result = set()
+    for word in WORD_RE.findall(value):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+@dataclass(slots=True)
+class PrefixIndexEntry:
+    """Объект индекса: первичный ключ, подпись и значения полей поиска."""
+    pk: int
+    label: str
+    values: dict
+
+    def __str__(self):
+        return self.label
+
+
+@dataclass(frozen=True)
+class _IndexData:
+    version: tuple
+    entries: list  # в порядке ordering
+    keys: list  # отсортированные нормализованные значения полей
+    positions: list  # позиция объекта в entries для каждого ключа
+    trigrams: dict  # триграмма -> позиции объектов в entries (пустой без fuzzy)
+
+
+def _word_suffixes(value):
+    """Части значения, начинающиеся с каждого его слова."""
+    words = value.split(' ')
+    return [' '.join(words[start:]) for start in range(len(words)) if words[start]]
+
+
+class PrefixIndex:
+    """
+    Префиксный индекс объектов модели по полям fields.
+
+    Порядок результатов задаёт ordering. Подпись объекта - str(obj),
+    поэтому она не должна обращаться к связанным моделям; label_fields -
+    поля, кроме fields, которые нужны для подписи (остальные не загружаются).
+    fuzzy включает нечёткий поиск по триграммам, key_field - поиск по
+    транслитерированному ключу (нечёткий поиск тогда идёт по ключу).
+    """
+
+    def __init__(self, model, fields, ordering=('pk',), label_fields=(), fuzzy=False, key_field=None):
+        self.model = model
+        self.fields = tuple(fields)
+        self.ordering = tuple(ordering)
+        self.label_fields = tuple(label_fields)
+        self.fuzzy = fuzzy
+        self.key_field = key_field
+        self._data = None
+        self._lock = threading.Lock()
+
+    def build(self, version) -> _IndexData:
+        entries = []
+        pairs = []
+        postings = defaultdict(list)
+        loaded = self.fields + self.label_fields + ((self.key_field,) if self.key_field else ())
+        queryset = self.model.objects.order_by(*self.ordering).only(*loaded)
+        for position, obj in enumerate(queryset.iterator()):
+            values = {field: getattr(obj, field) for field in self.fields}
+            entries.append(PrefixIndexEntry(pk=obj.pk, label=str(obj), values=values))
+            keys = [normalize(value) for value in values.values() if value]
+            pairs.extend((key, position) for key in keys)
+            if self.key_field:
+                keys = getattr(obj, self.key_field).split(KEY_SEPARATOR)
+                pairs.extend((suffix, position) for key in keys for suffix in _word_suffixes(key))
+            if self.fuzzy:
+                for trigram in set().union(*map(trigrams, keys)):
+                    postings[trigram].append(position)
+        pairs.sort()
+        return _IndexData(
+            version=version,
+            entries=entries,
+            keys=[key for key, _ in pairs],
+            positions=[position for _, position in pairs],
+            trigrams={trigram: array('I', positions) for trigram, positions in postings.items()},
+        )
+
+    def get_data(self) -> _IndexData:
+        version = model_versions(self.model)
+        data = self._data
+        if data is None or data.version != version:
+            with self._lock:
+                data = self._data
+                if data is None or data.version != version:
+                    data = self._data = self.build(version)
+        return data
+
+    def search(self, query) -> list:
+        """
+        Возвращает объекты, у которых значение какого-либо поля начинается с query.
+
+        С fuzzy после них следуют до FUZZY_LIMIT похожих объектов.
+        """
+        data = self.get_data()
+        prefix = normalize(query or '')
+        if not prefix:
+            return list(data.entries)
+
+        key = fold(prefix) if self.key_field else prefix
+        found = set()
+        for value in {prefix, key}:
+            index = bisect_left(data.keys, value)
+            while index < len(data.keys) and data.keys[index].startswith(value):
+                found.add(data.positions[index])
+                index += 1
+        positions = sorted(found)
+        if self.fuzzy and len(key) >= FUZZY_MIN_LENGTH:
+            positions += self._similar(data, key, found)
+        return [data.entries[position] for position in positions]
+
+    @staticmethod
+    def _similar(data, query, exclude) -> list:
+        """Позиции объектов, содержащих не меньше FUZZY_THRESHOLD триграмм запроса."""
+        query_trigrams = trigrams(query)
+        hits = Counter()
+        for trigram in query_trigrams:
+            hits.update(data.trigrams.get(trigram, ()))
+
+        required = FUZZY_THRESHOLD * len(query_trigrams)
+        candidates = (
+            (count, position) for position, count in hits.items()
+            if count >= required and position not in exclude
+        )
+        best = heapq.nsmallest(FUZZY_LIMIT, candidates, key=lambda item: (-item[0], item[1]))
+        return [position for _, position in best]
@@ -0,0 +1,185 @@
+"""
+Обработчики сигналов моделей приложения core.
+
+Любая запись в модель увеличивает её версию в кэше (см. core.cache).
+Версия увеличивается сразу и повторно после фиксации транзакции: значение,
+закэшированное другим запросом до фиксации, не переживёт её. Так же
+сбрасываются версии объектов, чьи строки списков показывают записанный
+объект (см. core.fragments).
+
+Запись в ReadingLog, изменение издательства, типа или книги издания и
+изменение авторов книги обновляют сводку статистики чтения (см. core.statistics).
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_model_version
+from core.fragments import bump_row_versions, dependent_rows
+
+
+def _is_core_model(model) -> bool:
+    return model._meta.app_label == 'core'
+
+
+def _bump(*models) -> None:
+    for model in models:
+        bump_model_version(model)
+
+    def _bump_on_commit():
+        for model in models:
+            bump_model_version(model)
+
+    transaction.on_commit(_bump_on_commit)
+
+
+def _bump_rows(rows) -> None:
+    bump_row_versions(rows)
+    transaction.on_commit(lambda: bump_row_versions(rows))
+
+
+@receiver(post_save, dispatch_uid='core_bump_version_on_save')
+@receiver(post_delete, dispatch_uid='core_bump_version_on_delete')
+def bump_version_on_write(sender, **kwargs):
+    if _is_core_model(sender):
+        _bump(sender)
+
+
+@receiver(m2m_changed, dispatch_uid='core_bump_version_on_m2m_change')
+def bump_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    if not action.startswith('post_') or not _is_core_model(sender):
+        return
+    _bump(instance.__class__, model)
+
+
+@receiver(post_save, dispatch_uid='core_bump_rows_on_save')
+@receiver(pre_delete, dispatch_uid='core_bump_rows_on_delete')
+def bump_rows_on_write(sender, instance, **kwargs):
+    """Сбрасывает версии строк списков, которые показывают объект."""
+    if _is_core_model(sender):
+        _bump_rows(dependent_rows(sender, [instance.pk]))
+
+
+@receiver(m2m_changed, dispatch_uid='core_bump_rows_on_m2m_change')
+def bump_rows_on_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Изменение связи многие-ко-многим сбрасывает строки объектов, объявивших поле.
+
+    Перед очисткой связи объекта instance его строки ищутся по ещё существующим связям.
+    """
+    if not _is_core_model(sender):
+        return
+    if action in ('post_add', 'post_remove'):
+        owner, pks = (model, pk_set) if reverse else (instance.__class__, [instance.pk])
+    elif action == 'pre_clear':
+        owner, pks = instance.__class__, [instance.pk]
+    else:
+        return
+    _bump_rows(dependent_rows(owner, pks))
+
+
+@receiver(post_save, sender='core.Book', dispatch_uid='core_sync_book_edition_titles')
+def sync_book_edition_titles(sender, instance, **kwargs):
+    """Обновляет копию названия книги в её изданиях (BookEdition.book_title)."""
+    from core.models import BookEdition
+
+    if instance.editions.exclude(book_title=instance.title).update(book_title=instance.title):
+        _bump(BookEdition)
+
+
+@receiver(post_save, sender='core.Publisher', dispatch_uid='core_sync_series_publisher_names')
+def sync_publisher_names(sender, instance, **kwargs):
+    """
+    Обновляет копии названия издательства в его сериях и изданиях
+    (BookSeries.publisher_name, BookEdition.publisher_name).
+    """
+    from core.models import BookEdition, BookSeries
+
+    for model, related in ((BookSeries, instance.book_series), (BookEdition, instance.book_editions)):
+        if related.exclude(publisher_name=instance.name).update(publisher_name=instance.name):
+            _bump(model)
+
+
+@receiver(pre_save, sender='core.ReadingLog', dispatch_uid='core_statistics_before_save')
+@receiver(pre_delete, sender='core.ReadingLog', dispatch_uid='core_statistics_before_delete')
+def remember_reading_log_statistics(sender, instance, **kwargs):
+    """Запоминает вклад сохранённой версии записи журнала в статистику."""
+    from collections import Counter
+
+    from core.statistics import reading_log_cells
+
+    stored = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._statistics_cells = reading_log_cells(stored) if stored else Counter()
+
+
+@receiver(post_save, sender='core.ReadingLog', dispatch_uid='core_statistics_on_save')
+def update_statistics_on_save(sender, instance, **kwargs):
+    from core.statistics import apply_reading_log
+
+    apply_reading_log(instance._statistics_cells, instance)
+
+
+@receiver(post_delete, sender='core.ReadingLog', dispatch_uid='core_statistics_on_delete')
+def update_statistics_on_delete(sender, instance, **kwargs):
+    from core.statistics import apply_reading_log
+
+    apply_reading_log(instance._statistics_cells, None)
+
+
+@receiver(pre_save, sender='core.BookEdition', dispatch_uid='core_edition_statistics_before_save')
+def remember_edition_statistics(sender, instance, **kwargs):
+    """
+    Запоминает вклад записей журнала издания в статистику, если изменяется
+    поле, по которому они группируются (тип, издательство или книга).
+    """
+    from core.statistics import EDITION_STATISTICS_FIELDS, reading_logs_cells
+
+    instance._statistics_cells = None
+    if not instance.pk:
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*EDITION_STATISTICS_FIELDS).first()
+    if stored and any(stored[field] != getattr(instance, field) for field in EDITION_STATISTICS_FIELDS):
+        instance._statistics_cells = reading_logs_cells(instance.reading_logs.all())
+
+
+@receiver(post_save, sender='core.BookEdition', dispatch_uid='core_edition_statistics_on_save')
+def update_edition_statistics_on_save(sender, instance, **kwargs):
+    from core.statistics import apply_reading_logs_change
+
+    if getattr(instance, '_statistics_cells', None) is not None:
+        apply_reading_logs_change(instance._statistics_cells, instance.reading_logs.all())
+        instance._statistics_cells = None
+
+
+@receiver(m2m_changed, sender='core.Book_authors', dispatch_uid='core_author_statistics_on_m2m_change')
+def update_author_statistics_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Изменение авторов книги заменяет вклад записей журнала её изданий в статистику.
+
+    Перед изменением запоминаются затронутые книги и вклад их записей журнала,
+    после - вклад заменяется текущим.
+    """
+    from core.models import ReadingLog
+    from core.statistics import apply_reading_logs_change, reading_logs_cells
+
+    if action in ('pre_add', 'pre_remove', 'pre_clear'):
+        if not reverse:
+            books = [instance.pk]
+        elif action == 'pre_clear':
+            books = list(instance.books.values_list('pk', flat=True))
+        else:
+            books = list(pk_set)
+        instance._statistics_books = books
+        instance._statistics_cells = reading_logs_cells(ReadingLog.objects.filter(book_edition__book__in=books))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        books = instance.__dict__.pop('_statistics_books', None)
+        if books is not None:
+            apply_reading_logs_change(
+                instance.__dict__.pop('_statistics_cells'),
+                ReadingLog.objects.filter(book_edition__book__in=books),
+            )
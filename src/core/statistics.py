@@ -0,0 +1,224 @@
+"""
+Статистика чтения на основе сводной таблицы ReadingStatistic.
+
+Каждая запись журнала чтения добавляет единицу в started для месяца начала
+и в finished для месяца окончания, по каждому измерению: итог, тип издания,
+издательство и каждый автор книги.
+
+- apply_reading_log() обновляет сводку инкрементально (вызывается из core.signals)
+- apply_reading_logs_change() обновляет сводку после массовых операций без сигналов,
+  а также после изменения издания или авторов книги (вызывается из core.signals)
+- rebuild_reading_statistics() пересчитывает сводку сгруппированными запросами
+- get_reading_statistics() читает данные для страницы статистики
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from core.enums import MonthEnum
+from core.models import Author, BookEdition, Publisher, ReadingLog, ReadingStatistic
+
+# Поля ReadingLog, по которым группируется каждое измерение
+DIMENSION_FIELDS = {
+    ReadingStatistic.DIMENSION_TOTAL: None,
+    ReadingStatistic.DIMENSION_EDITION_TYPE: 'book_edition__edition_type',
+    ReadingStatistic.DIMENSION_PUBLISHER: 'book_edition__publisher_id',
+    ReadingStatistic.DIMENSION_AUTHOR: 'book_edition__book__authors',
+}
+
+# Счётчик сводки -> поля года и месяца ReadingLog
+PERIOD_FIELDS = {
+    'started': ('year_start', 'month_start'),
+    'finished': ('year_finish', 'month_finish'),
+}
+
+# Поля BookEdition, изменение которых меняет вклад его записей журнала
+EDITION_STATISTICS_FIELDS = ('edition_type', 'publisher_id', 'book_id')
+
+TOP_SIZE = 10
+
+
+def _key(value):
+    return '' if value is None else str(value)
+
+
+def reading_log_cells(reading_log):
+    """
+    Возвращает Counter вклада записи журнала: (измерение, ключ, год, месяц, счётчик) -> 1.
+
+    Для измерения автора читает авторов книги одним запросом.
+    """
+    edition = reading_log.book_edition
+    keys = {
+        ReadingStatistic.DIMENSION_TOTAL: [''],
+        ReadingStatistic.DIMENSION_EDITION_TYPE: [edition.edition_type],
+        ReadingStatistic.DIMENSION_PUBLISHER: [_key(edition.publisher_id)] if edition.publisher_id else [],
+        ReadingStatistic.DIMENSION_AUTHOR: [
+            _key(author_id) for author_id
+            in edition.book.authors.values_list('pk', flat=True)
+        ],
+    }
+
+    cells = Counter()
+    for counter, (year_field, month_field) in PERIOD_FIELDS.items():
+        year = getattr(reading_log, year_field)
+        if year is None:
+            continue
+        month = getattr(reading_log, month_field) or ReadingStatistic.UNKNOWN_MONTH
+        for dimension, dimension_keys in keys.items():
+            for key in dimension_keys:
+                cells[(dimension, key, year, month, counter)] += 1
+    return cells
+
+
+def apply_reading_log_cells(cells, sign):
+    """
+    Прибавляет (sign=1) или вычитает (sign=-1) вклад записей журнала из сводки.
+
+    Недостающие строки сводки создаются одним INSERT, затем каждая строка
+    обновляется одним UPDATE относительно текущего значения.
+    """
+    rows = defaultdict(dict)
+    for (dimension, key, year, month, counter), value in cells.items():
+        rows[(dimension, key, year, month)][counter] = sign * value
+
+    with transaction.atomic():
+        ReadingStatistic.objects.bulk_create(
+            [
+                ReadingStatistic(dimension=dimension, key=key, year=year, month=month)
+                for dimension, key, year, month in rows
+            ],
+            ignore_conflicts=True,
+        )
+        for (dimension, key, year, month), changes in rows.items():
+            ReadingStatistic.objects.filter(
+                dimension=dimension, key=key, year=year, month=month,
+            ).update(
+                **{counter: F(counter) + value for counter, value in changes.items()},
+            )
+
+
+def _apply_difference(old_cells, new_cells):
+    removed = old_cells - new_cells
+    added = new_cells - old_cells
+    if removed:
+        apply_reading_log_cells(removed, -1)
+    if added:
+        apply_reading_log_cells(added, 1)
+
+
+def apply_reading_log(old_cells, reading_log):
+    """Заменяет в сводке прежний вклад записи журнала новым."""
+    _apply_difference(old_cells, reading_log_cells(reading_log) if reading_log is not None else Counter())
+
+
+def reading_logs_cells(queryset):
+    """
+    Возвращает суммарный вклад записей журнала queryset в сводку (как reading_log_cells).
+
+    Выполняет по одному сгруппированному запросу на пару (измерение, счётчик).
+    """
+    cells = Counter()
+    for dimension, field in DIMENSION_FIELDS.items():
+        for counter, (year_field, month_field) in PERIOD_FIELDS.items():
+            group_by = [year_field, month_field] + ([field] if field else [])
+            rows = queryset.filter(
+                **{f'{year_field}__isnull': False},
+            ).exclude(
+                **({f'{field}__isnull': True} if field else {}),
+            ).values(*group_by).annotate(total=Count('pk')).order_by()
+            for row in rows:
+                key = _key(row[field]) if field else ''
+                month = row[month_field] or ReadingStatistic.UNKNOWN_MONTH
+                cells[(dimension, key, row[year_field], month, counter)] += row['total']
+    return cells
+
+
+def apply_reading_logs_change(old_cells, queryset):
+    """Заменяет в сводке прежний вклад записей журнала queryset текущим."""
+    _apply_difference(old_cells, reading_logs_cells(queryset))
+
+
+def rebuild_reading_statistics():
+    """
+    Пересчитывает сводку целиком по reading_logs_cells() всех записей журнала.
+
+    Возвращает число созданных строк сводки.
+    """
+    cells = reading_logs_cells(ReadingLog.objects.all())
+    statistics = {}
+    for (dimension, key, year, month, counter), value in cells.items():
+        statistic = statistics.setdefault(
+            (dimension, key, year, month),
+            ReadingStatistic(dimension=dimension, key=key, year=year, month=month),
+        )
+        setattr(statistic, counter, value)
+
+    with transaction.atomic():
+        ReadingStatistic.objects.all().delete()
+        ReadingStatistic.objects.bulk_create(statistics.values(), batch_size=5_000)
+    return len(statistics)
+
+
+def _totals(dimension, **filters):
+    return ReadingStatistic.objects.filter(dimension=dimension, **filters).order_by()
+
+
+def get_reading_statistics(year=None):
+    """
+    Возвращает данные страницы статистики.
+
+    Каждый раздел - один запрос к сводке по индексу (dimension, key, year, month),
+    плюс по запросу на имена издательств и авторов из топа.
+    Если year указан, разделы кроме списка годов считаются только за этот год.
+    """
+    period = {'year': year} if year else {}
+
+    by_year = list(
+        _totals(ReadingStatistic.DIMENSION_TOTAL, key='').values('year').annotate(
+            started=Sum('started'), finished=Sum('finished'),
+        ).order_by('year')
+    )
+    by_month = list(
+        _totals(ReadingStatistic.DIMENSION_TOTAL, key='', **period).values('month').annotate(
+            started=Sum('started'), finished=Sum('finished'),
+        ).order_by('month')
+    )
+    by_edition_type = list(
+        _totals(ReadingStatistic.DIMENSION_EDITION_TYPE, **period).values('key').annotate(
+            finished=Sum('finished'),
+        ).filter(finished__gt=0).order_by('-finished', 'key')
+    )
+    top_publishers = list(
+        _totals(ReadingStatistic.DIMENSION_PUBLISHER, **period).values('key').annotate(
+            finished=Sum('finished'),
+        ).filter(finished__gt=0).order_by('-finished', 'key')[:TOP_SIZE]
+    )
+    top_authors = list(
+        _totals(ReadingStatistic.DIMENSION_AUTHOR, **period).values('key').annotate(
+            finished=Sum('finished'),
+        ).filter(finished__gt=0).order_by('-finished', 'key')[:TOP_SIZE]
+    )
+
+    months = dict(MonthEnum.choices)
+    for row in by_month:
+        row['label'] = months.get(row['month'], '?')
+    edition_types = dict(BookEdition.EDITION_TYPE_CHOICES)
+    for row in by_edition_type:
+        row['label'] = edition_types.get(row['key'], row['key'])
+
+    publishers = Publisher.objects.in_bulk([int(row['key']) for row in top_publishers])
+    authors = Author.objects.in_bulk([int(row['key']) for row in top_authors])
+    for row in top_publishers:
+        row['object'] = publishers.get(int(row['key']))
+    for row in top_authors:
+        row['object'] = authors.get(int(row['key']))
+
+    return {
+        'by_year': by_year,
+        'by_month': by_month,
+        'by_edition_type': by_edition_type,
+        'top_publishers': top_publishers,
+        'top_authors': top_authors,
+    }
@@ -0,0 +1,106 @@
+"""
+Помесячная шкала чтения: сколько чтений начато, закончено и продолжается
+в каждом месяце каждого года.
+
+Строится одним сгруппированным запросом по ключам периода ReadingLog
+(start_key, finish_key) и кэшируется с версией ReadingLog в ключе, поэтому
+любая запись в журнал чтения делает закэшированную шкалу неактуальной.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import make_cache_key, model_versions
+from core.models import FINISH_KEY_MISSING_MONTH, START_KEY_MISSING_MONTH
+from core.models import ReadingLog
+
+TIMELINE_CACHE_TIMEOUT = 24 * 60 * 60
+
+MONTHS = range(1, 13)
+
+
+def _empty_year(year):
+    return {
+        'year': year,
+        'months': [
+            {'month': month, 'started': 0, 'finished': 0, 'in_progress': 0}
+            for month in MONTHS
+        ],
+        # Чтения с годом, но без месяца
+        'unknown_month': {'started': 0, 'finished': 0},
+    }
+
+
+def _split_key(key):
+    return divmod(key, 100)
+
+
+def build_reading_timeline():
+    """
+    Возвращает шкалу чтения: список годов по возрастанию, в каждом 12 месяцев.
+
+    Чтение без месяца начала считается продолжающимся с января, без месяца
+    окончания - до декабря, незаконченное - до последнего года шкалы.
+    Чтение без года начала считается только законченным и не учитывается
+    в продолжающихся.
+    """
+    pairs = list(
+        ReadingLog.objects.filter(Q(start_key__isnull=False) | Q(finish_key__isnull=False)).values(
+            'start_key', 'finish_key',
+        ).annotate(total=Count('pk')).order_by()
+    )
+    if not pairs:
+        return []
+
+    years = [_split_key(row['start_key'])[0] for row in pairs if row['start_key']]
+    years += [_split_key(row['finish_key'])[0] for row in pairs if row['finish_key']]
+    first_year, last_year = min(years), max(years)
+    timeline = [_empty_year(year) for year in range(first_year, last_year + 1)]
+
+    def month_cell(year, month):
+        return timeline[year - first_year]['months'][month - 1]
+
+    def cell_index(year, month):
+        return (year - first_year) * 12 + month - 1
+
+    # Разностный массив по месяцам: +n с месяца начала, -n после месяца окончания
+    in_progress_delta = [0] * (len(timeline) * 12 + 1)
+    for row in pairs:
+        total = row['total']
+        started = row['start_key'] is not None
+
+        if started:
+            year, month = _split_key(row['start_key'])
+            if month == START_KEY_MISSING_MONTH:
+                timeline[year - first_year]['unknown_month']['started'] += total
+                month = 1
+            else:
+                month_cell(year, month)['started'] += total
+            in_progress_delta[cell_index(year, month)] += total
+
+        if row['finish_key'] is None:
+            continue
+        year, month = _split_key(row['finish_key'])
+        if month == FINISH_KEY_MISSING_MONTH:
+            timeline[year - first_year]['unknown_month']['finished'] += total
+            month = 12
+        else:
+            month_cell(year, month)['finished'] += total
+        if started:
+            in_progress_delta[cell_index(year, month) + 1] -= total
+
+    in_progress = 0
+    for year in timeline:
+        for cell in year['months']:
+            in_progress += in_progress_delta[cell_index(year['year'], cell['month'])]
+            cell['in_progress'] = in_progress
+    return timeline
+
+
+def get_reading_timeline():
+    """Возвращает шкалу чтения из кэша, строит её при отсутствии."""
+    cache_key = make_cache_key('reading_timeline', model_versions(ReadingLog))
+    timeline = cache.get(cache_key)
+    if timeline is None:
+        timeline = build_reading_timeline()
+        cache.set(cache_key, timeline, TIMELINE_CACHE_TIMEOUT)
+    return timeline
@@ -0,0 +1,78 @@
+"""
+Транслитерированные ключи поиска для данных на кириллице и латинице.
+
+search_key() приводит значения к одному виду: нижний регистр, кириллица
+транслитерируется латиницей по правилам, близким к принятым в англоязычных
+изданиях (й, ы -> y, х -> kh, -ий в конце слова -> y, ...), латиница не
+меняется. Поэтому "Толстой" и "Tolstoy" дают один ключ "tolstoy",
+"Достоевский" и "Dostoevsky" - ключ "dostoevsky", и поиск по ключу находит
+объект, записанный в любом алфавите.
+
+Ключи хранятся в поле search_key моделей Author, Book и Publisher
+(SEARCH_KEY_MODELS) и обновляются в save(); после bulk_create и update()
+их пересчитывает rebuild_search_keys() (команда rebuild_search_keys).
+"""
+import re
+
+from django.db import transaction
+
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'і': 'i', 'ї': 'i', 'є': 'e', 'ў': 'u',
+}
+CYRILLIC_TABLE = str.maketrans(CYRILLIC_TO_LATIN)
+# Окончания -ий, -ый передаются одной y: Достоевский -> Dostoevsky
+CYRILLIC_ENDINGS_RE = re.compile(r'[иы]й\b')
+
+# Разделитель значений разных полей в ключе
+KEY_SEPARATOR = '\n'
+
+SEARCH_KEY_MODELS = ('core.Author', 'core.Book', 'core.Publisher')
+REBUILD_BATCH_SIZE = 5_000
+
+
+def to_latin(text: str) -> str:
+    """Транслитерирует кириллицу строки в нижнем регистре латиницей."""
+    return CYRILLIC_ENDINGS_RE.sub('y', text).translate(CYRILLIC_TABLE)
+
+
+def fold(text: str) -> str:
+    """Приводит значение к ключу: нижний регистр без лишних пробелов, латиница."""
+    return to_latin(' '.join(text.casefold().split()))
+
+
+def search_key(*values) -> str:
+    """Ключ поиска по значениям полей; пустые значения пропускаются."""
+    return KEY_SEPARATOR.join(fold(str(value)) for value in values if value)
+
+
+@transaction.atomic
+def rebuild_search_keys() -> int:
+    """
+    Пересчитывает search_key всех объектов моделей SEARCH_KEY_MODELS.
+
+    Сохраняет только изменившиеся ключи через bulk_update и возвращает их число.
+    """
+    from django.apps import apps
+
+    from core.cache import bump_model_version
+
+    updated = 0
+    for label in SEARCH_KEY_MODELS:
+        model = apps.get_model(label)
+        changed = []
+        queryset = model.objects.only('search_key', *model.SEARCH_KEY_FIELDS)
+        for obj in queryset.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            key = obj.get_search_key()
+            if obj.search_key != key:
+                obj.search_key = key
+                changed.append(obj)
+        model.objects.bulk_update(changed, ['search_key'], batch_size=REBUILD_BATCH_SIZE)
+        if changed:
+            bump_model_version(model)
+        updated += len(changed)
+    return updated
@@ -1,7 +1,6 @@
 from dal import autocomplete
 from django import forms
 
-from core.models import Book
 from core.models import BookEdition
 
 
@@ -40,10 +39,23 @@ class BookEditionNewForm(forms.ModelForm):
         }
 
 
+class InstanceLabelInput(forms.TextInput):
+    """Поле только для чтения с подписью объекта вместо списка вариантов."""
+
+    def __init__(self, attrs=None):
+        super().__init__({'readonly': 'readonly', **(attrs or {})})
+
+    def format_value(self, value):
+        return None if value is None else str(value)
+
+
 class BookEditionUpdateForm(forms.ModelForm):
-    book = forms.ModelChoiceField(
-        queryset=Book.objects,
+    # Книга не меняется: поле выводит только подпись книги редактируемого издания
+    # и не входит в Meta.fields, поэтому не проверяется и не сохраняется
+    book = forms.Field(
+        widget=InstanceLabelInput,
         disabled=True,
+        required=False,
     )
     edition_type = forms.ChoiceField(
         choices=BookEdition.EDITION_TYPE_CHOICES,
@@ -53,22 +65,27 @@ class BookEditionUpdateForm(forms.ModelForm):
     class Meta:
         model = BookEdition
         fields = (
-            'book',
             'publisher',
             'series',
             'publication_year',
             'isbn',
             'edition_type',
         )
-        read_only = ('book',)
         widgets = {
-            'publisher': autocomplete.Select2(
+            'publisher': autocomplete.ModelSelect2(
                 url='publisher_autocomplete',
                 attrs={"data-theme": "bootstrap-5"}
             ),
-            'series': autocomplete.Select2(
+            'series': autocomplete.ModelSelect2(
                 url='book_series_autocomplete',
                 attrs={"data-theme": "bootstrap-5"}
             ),
             'edition_type': forms.Select(attrs={"class": "form-select", "readonly": "readonly"}),
         }
+
+    field_order = ('book',) + Meta.fields
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.book_id:
+            self.initial['book'] = self.instance.book
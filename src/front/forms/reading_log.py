@@ -1,5 +1,31 @@
+import csv
+import io
+
+from dal import autocomplete
 from django import forms
-from core.models import ReadingLog
+
+from core.enums import MonthEnum
+from core.models import BookEdition, ReadingLog
+from core.models import period_finish_key, period_start_key
+
+
+def validate_reading_period(year_start, month_start, year_finish, month_finish):
+    """
+    Валидация: дата окончания не может быть раньше даты начала.
+    """
+    if year_start and year_finish:
+        # Ключи периода учитывают отсутствующие месяцы (см. period_start_key)
+        start_key = period_start_key(year_start, month_start)
+        finish_key = period_finish_key(year_finish, month_finish)
+        if year_finish < year_start:
+            raise forms.ValidationError(
+                "Год окончания не может быть раньше года начала"
+            )
+        elif finish_key < start_key:
+            raise forms.ValidationError(
+                "Месяц окончания не может быть раньше месяца начала "
+                "в пределах одного года"
+            )
 
 
 class ReadingLogForm(forms.ModelForm):
@@ -15,26 +41,153 @@ class ReadingLogForm(forms.ModelForm):
         ]
 
     def clean(self):
-        """
-        Валидация: дата окончания не может быть раньше даты начала.
-        """
         cleaned_data = super().clean()
-        year_start = cleaned_data.get('year_start')
+        validate_reading_period(
+            cleaned_data.get('year_start'),
+            cleaned_data.get('month_start'),
+            cleaned_data.get('year_finish'),
+            cleaned_data.get('month_finish'),
+        )
+        return cleaned_data
+
+
+class ReadingLogNewForm(ReadingLogForm):
+    """
+    Форма добавления ReadingLog.
+
+    Издание выбирается через book_edition_autocomplete: виджет выводит только
+    выбранный вариант, а проверка загружает только отправленное издание,
+    поэтому стоимость страницы не зависит от размера каталога.
+    """
+
+    class Meta(ReadingLogForm.Meta):
+        fields = ['book_edition'] + ReadingLogForm.Meta.fields
+        widgets = {
+            'book_edition': autocomplete.ModelSelect2(
+                url='book_edition_autocomplete',
+                attrs={"data-theme": "bootstrap-5"}
+            ),
+        }
+
+
+ReadingLogBulkFormSet = forms.modelformset_factory(
+    ReadingLog,
+    form=ReadingLogNewForm,
+    extra=10,
+)
+
+
+class ReadingLogCsvRowForm(forms.Form):
+    """Строка CSV-файла журнала чтения, проверяется по тем же правилам, что ReadingLogForm."""
+
+    book_edition = forms.IntegerField(min_value=1)
+    year_start = forms.IntegerField(min_value=0, max_value=32767, required=False)
+    month_start = forms.TypedChoiceField(
+        choices=MonthEnum.choices, coerce=int, empty_value=None, required=False,
+    )
+    year_finish = forms.IntegerField(min_value=0, max_value=32767, required=False)
+    month_finish = forms.TypedChoiceField(
+        choices=MonthEnum.choices, coerce=int, empty_value=None, required=False,
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        validate_reading_period(
+            cleaned_data.get('year_start'),
+            cleaned_data.get('month_start'),
+            cleaned_data.get('year_finish'),
+            cleaned_data.get('month_finish'),
+        )
+        return cleaned_data
+
+
+class ReadingLogCsvUploadForm(forms.Form):
+    """
+    Загрузка журнала чтения из CSV.
+
+    Первая строка - заголовок с колонками CSV_COLUMNS, book_edition - pk издания.
+    После is_valid() в reading_logs лежат несохранённые объекты ReadingLog.
+    """
+    CSV_COLUMNS = ('book_edition', 'year_start', 'month_start', 'year_finish', 'month_finish')
+    MAX_ROWS = 10_000
+
+    file = forms.FileField(label='CSV-файл')
+
+    def clean_file(self):
+        uploaded = self.cleaned_data['file']
+        try:
+            text = io.TextIOWrapper(uploaded.file, encoding='utf-8-sig')
+            rows = list(csv.DictReader(text))
+        except (UnicodeDecodeError, csv.Error) as error:
+            raise forms.ValidationError(f'Не удалось прочитать CSV: {error}')
+
+        if not rows:
+            raise forms.ValidationError('Файл не содержит записей')
+        if len(rows) > self.MAX_ROWS:
+            raise forms.ValidationError(f'Не больше {self.MAX_ROWS} записей за одну загрузку')
+        missing = set(self.CSV_COLUMNS) - set(rows[0])
+        if missing:
+            raise forms.ValidationError(f'Нет колонок: {", ".join(sorted(missing))}')
+
+        errors = []
+        values = []
+        # Строка 1 - заголовок
+        for line, row in enumerate(rows, start=2):
+            row_form = ReadingLogCsvRowForm(data={column: (row[column] or '').strip() for column in self.CSV_COLUMNS})
+            if row_form.is_valid():
+                values.append((line, row_form.cleaned_data))
+            else:
+                for messages in row_form.errors.values():
+                    errors.extend(f'Строка {line}: {message}' for message in messages)
+
+        # Издания проверяются одним запросом на весь файл
+        edition_ids = {data['book_edition'] for _, data in values}
+        existing = set(BookEdition.objects.filter(pk__in=edition_ids).values_list('pk', flat=True))
+        errors.extend(
+            f'Строка {line}: издание {data["book_edition"]} не найдено'
+            for line, data in values if data['book_edition'] not in existing
+        )
+        if errors:
+            raise forms.ValidationError(errors)
+
+        self.reading_logs = [
+            ReadingLog(
+                book_edition_id=data['book_edition'],
+                year_start=data['year_start'],
+                month_start=data['month_start'],
+                year_finish=data['year_finish'],
+                month_finish=data['month_finish'],
+            )
+            for _, data in values
+        ]
+        return uploaded
+
+
+class ReadingLogBulkFinishForm(forms.Form):
+    """Установка года и месяца окончания выбранным записям журнала чтения."""
+
+    reading_logs = forms.ModelMultipleChoiceField(
+        queryset=ReadingLog.objects.all(),
+        widget=forms.MultipleHiddenInput,
+    )
+    year_finish = forms.IntegerField(label='Год окончания', min_value=0, max_value=32767)
+    month_finish = forms.TypedChoiceField(
+        label='Месяц окончания',
+        choices=[('', '---------')] + MonthEnum.choices,
+        coerce=int, empty_value=None, required=False,
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        reading_logs = cleaned_data.get('reading_logs')
         year_finish = cleaned_data.get('year_finish')
-        month_start = cleaned_data.get('month_start')
-        month_finish = cleaned_data.get('month_finish')
-
-        if year_start and year_finish:
-            # Сравниваем значения year у объектов Year
-            if year_finish.year < year_start.year:
-                raise forms.ValidationError(
-                    "Год окончания не может быть раньше года начала"
-                )
-            elif year_finish.year == year_start.year and month_finish and month_start:
-                if month_finish < month_start:
-                    raise forms.ValidationError(
-                        "Месяц окончания не может быть раньше месяца начала "
-                        "в пределах одного года"
-                    )
+        if reading_logs is None or year_finish is None:
+            return cleaned_data
 
+        # То же правило, что validate_reading_period(), одним запросом для всех записей
+        finish_key = period_finish_key(year_finish, cleaned_data.get('month_finish'))
+        if reading_logs.filter(start_key__gt=finish_key).exists():
+            raise forms.ValidationError(
+                "Дата окончания не может быть раньше даты начала"
+            )
         return cleaned_data
@@ -0,0 +1,66 @@
+/**
+ * Partial results - обновление результатов списка без перезагрузки страницы.
+ *
+ * Переходы по ссылкам пагинации, смена размера страницы и отправка формы
+ * фильтра с атрибутом data-partial-filter запрашивают только результаты
+ * (заголовок X-Partial: results, см. PartialResultsMixin) и подменяют
+ * содержимое контейнера data-partial-results. Адрес страницы обновляется
+ * через history, при ошибке выполняется обычный переход.
+ */
+
+(function() {
+    'use strict';
+
+    var container = document.querySelector('[data-partial-results]');
+    if (!container) {
+        return;
+    }
+
+    function load(url, push) {
+        fetch(url, {headers: {'X-Partial': 'results'}})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.text();
+            })
+            .then(function(html) {
+                container.innerHTML = html;
+                if (push) {
+                    history.pushState({partialResults: true}, '', url);
+                }
+            })
+            .catch(function() {
+                window.location.href = url;
+            });
+    }
+
+    function formUrl(form) {
+        var url = new URL(form.getAttribute('action') || window.location.pathname, window.location.href);
+        url.search = new URLSearchParams(new FormData(form)).toString();
+        return url.href;
+    }
+
+    container.addEventListener('click', function(event) {
+        var link = event.target.closest('a.page-link');
+        if (!link || event.ctrlKey || event.metaKey || event.shiftKey) {
+            return;
+        }
+        event.preventDefault();
+        load(link.href, true);
+    });
+
+    document.addEventListener('submit', function(event) {
+        var form = event.target;
+        var partial = container.contains(form) || form.hasAttribute('data-partial-filter');
+        if (!partial || form.method.toLowerCase() !== 'get') {
+            return;
+        }
+        event.preventDefault();
+        load(formUrl(form), true);
+    });
+
+    window.addEventListener('popstate', function() {
+        load(window.location.href, false);
+    });
+})();
@@ -17,7 +17,7 @@ django.setup()
 
 from django.urls import reverse
 
-from core.models import Note, KeyWord
+from core.models import Note, KeyWord, ReadingLog
 
 
 @pytest.fixture
@@ -122,3 +122,18 @@ def keywords(db):
     kw1 = KeyWord.objects.create(word='ключ1')
     kw2 = KeyWord.objects.create(word='ключ2')
     return {'kw1': kw1, 'kw2': kw2}
+
+
+@pytest.fixture
+def make_reading_log(db):
+    """
+    Фабрика записей журнала чтения: make_reading_log(edition, (год, месяц) начала,
+    (год, месяц) окончания); без окончания - незаконченное чтение.
+    """
+    def make(edition, start, finish=(None, None)):
+        return ReadingLog.objects.create(
+            book_edition=edition,
+            year_start=start[0], month_start=start[1],
+            year_finish=finish[0], month_finish=finish[1],
+        )
+    return make
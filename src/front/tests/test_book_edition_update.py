@@ -0,0 +1,67 @@
+"""
+Тесты страницы редактирования издания (BookEditionUpdateView).
+
+Проверяют, что:
+- книга выводится подписью только для чтения, без списка всех книг
+- число запросов и размер страницы не зависят от числа книг и серий
+- сохранение не меняет книгу издания
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Book, BookEdition, BookSeries, Publisher
+
+
+def _add_books(count):
+    start = Book.objects.count()
+    Book.objects.bulk_create([Book(title=f'Книга {start + i:04}') for i in range(count)])
+    publisher = Publisher.objects.create(name=f'Издательство {start}')
+    BookSeries.objects.bulk_create([
+        BookSeries(name=f'Серия {start + i:04}', publisher=publisher) for i in range(count)
+    ])
+
+
+def _get(client, edition):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(reverse('book_edition_update', kwargs={'pk': edition.pk}))
+    assert response.status_code == 200
+    return len(captured.captured_queries), len(response.content)
+
+
+@pytest.mark.django_db
+class TestBookEditionUpdateView:
+
+    def test_page_cost_does_not_depend_on_books(self, client):
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Река'))
+        _add_books(2)
+        small = _get(client, edition)
+
+        _add_books(50)
+        large = _get(client, edition)
+
+        assert small == large
+
+    def test_book_is_rendered_as_read_only_label(self, client):
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Река'))
+        _add_books(3)
+
+        content = client.get(reverse('book_edition_update', kwargs={'pk': edition.pk})).content.decode()
+
+        assert 'value="Река"' in content
+        assert 'Книга 0000' not in content
+
+    def test_book_is_not_changed_on_save(self, client):
+        book = Book.objects.create(title='Река')
+        other = Book.objects.create(title='Море')
+        edition = BookEdition.objects.create(book=book)
+
+        response = client.post(reverse('book_edition_update', kwargs={'pk': edition.pk}), {
+            'book': other.pk, 'publication_year': 2001, 'edition_type': 'PAPER_BOOK',
+        })
+
+        assert response.status_code == 302
+        edition.refresh_from_db()
+        assert edition.book == book
+        assert edition.publication_year == 2001
@@ -0,0 +1,133 @@
+"""
+Тесты подписей изданий, серий и авторов.
+
+Проверяют, что:
+- подписи BookEdition и BookSeries строятся по копиям полей без запросов к связанным моделям
+- копии обновляются при сохранении издания, книги и издательства
+- автокомплиты и страница заметки не выполняют запросов на каждую подпись
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import (
+    Author, Book, BookEdition, BookSeries, Note, NoteToBookEdition, Publisher,
+    format_author_name,
+)
+
+
+@pytest.fixture
+def publisher(db):
+    return Publisher.objects.create(name='Мир')
+
+
+def _editions(count, publisher):
+    return [
+        BookEdition.objects.create(
+            book=Book.objects.create(title=f'Река {number}'),
+            publisher=publisher,
+            publication_year=2000 + number,
+        )
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestLabels:
+
+    def test_labels_need_no_queries(self, publisher):
+        _editions(3, publisher)
+        BookSeries.objects.create(name='Классика', publisher=publisher)
+        editions = list(BookEdition.objects.order_by('pk'))
+        series = BookSeries.objects.get()
+
+        with CaptureQueriesContext(connection) as captured:
+            labels = [str(edition) for edition in editions]
+            info = editions[0].publication_info
+            series_label = str(series)
+
+        assert captured.captured_queries == []
+        assert labels[0] == 'Река 0 - Мир - 2000'
+        assert info == 'Мир - 2000'
+        assert series_label == '"Классика", Мир'
+
+    def test_edition_without_publisher(self, db):
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Река'))
+
+        assert str(edition) == 'Река'
+        assert edition.publication_info == ''
+
+    def test_copies_follow_related_objects(self, publisher):
+        edition = _editions(1, publisher)[0]
+        series = BookSeries.objects.create(name='Классика', publisher=publisher)
+
+        publisher.name = 'Наука'
+        publisher.save()
+        edition.book.title = 'Море'
+        edition.book.save()
+
+        assert str(BookEdition.objects.get()) == 'Море - Наука - 2000'
+        assert str(BookSeries.objects.get(pk=series.pk)) == '"Классика", Наука'
+
+        edition = BookEdition.objects.get()
+        edition.publisher = None
+        edition.save()
+        assert BookEdition.objects.get().publisher_name == ''
+
+    def test_author_names(self):
+        author = Author(last_name='Петров', first_name='Иван', middle_name='Сергеевич')
+
+        assert author.full_name == 'Петров Иван Сергеевич'
+        assert author.full_name_short == 'Петров И. С.'
+        assert Author(last_name='Петров', first_name='Иван').full_name_short == 'Петров И.'
+        assert format_author_name('Петров', 'Иван', None) == 'Петров Иван'
+
+
+@pytest.mark.django_db
+class TestLabelQueries:
+
+    def _count(self, client, url, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, params)
+        assert response.status_code == 200
+        return len(captured.captured_queries)
+
+    def test_autocompletes_do_not_query_per_result(self, client, admin_user, publisher):
+        client.force_login(admin_user)
+        _editions(2, publisher)
+        BookSeries.objects.create(name='Классика 1', publisher=publisher)
+        small = (
+            self._count(client, reverse('book_edition_autocomplete'), q='Река'),
+            self._count(client, reverse('book_series_autocomplete'), q='Класс'),
+        )
+
+        _editions(8, publisher)
+        for number in range(2, 10):
+            BookSeries.objects.create(name=f'Классика {number}', publisher=publisher)
+        large = (
+            self._count(client, reverse('book_edition_autocomplete'), q='Река'),
+            self._count(client, reverse('book_series_autocomplete'), q='Класс'),
+        )
+
+        assert large == small
+
+    def test_edition_autocomplete_searches_publisher_name(self, client, admin_user, publisher):
+        client.force_login(admin_user)
+        edition = _editions(1, publisher)[0]
+
+        response = client.get(reverse('book_edition_autocomplete'), {'q': 'Ми'})
+
+        assert [item['id'] for item in response.json()['results']] == [str(edition.pk)]
+
+    def test_note_detail_does_not_join_editions(self, client, admin_user, publisher):
+        client.force_login(admin_user)
+        note = Note.objects.create(text='Заметка', index='1')
+        for edition in _editions(3, publisher):
+            NoteToBookEdition.objects.create(note=note, book_edition=edition)
+
+        with CaptureQueriesContext(connection) as captured:
+            content = client.get(reverse('note_detail', kwargs={'pk': note.pk})).content.decode()
+
+        assert 'Река 2' in content and '- Мир' in content
+        assert not [q for q in captured.captured_queries if '"core_book"' in q['sql']]
@@ -0,0 +1,183 @@
+"""
+Тесты фасетов фильтров списков изданий и журнала чтения (FacetCountsMixin).
+
+Проверяют, что:
+- число результатов считается по отфильтрованному queryset без фильтра самого фасета
+- для выпадающих списков число добавляется к подписи варианта
+- остальные фасеты выводятся ссылками с числом результатов
+- ссылка фасета издательства выбирает издательство точно: число у ссылки
+  равно числу результатов после перехода по ней
+- фасеты кэшируются и пересчитываются после записи в модель
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.filters import BookEditionFilter
+from core.models import Author, Book, BookEdition, Publisher, ReadingLog
+
+
+def _group_by_queries(captured):
+    return [q for q in captured.captured_queries if 'GROUP BY' in q['sql'].upper()]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def editions(db):
+    author = Author.objects.create(first_name='Ivan', last_name='Petrov')
+    other_author = Author.objects.create(first_name='John', last_name='Smith')
+    book = Book.objects.create(title='Тёмная башня')
+    book.authors.add(author, other_author)
+    other_book = Book.objects.create(title='Река')
+    other_book.authors.add(other_author)
+    azbuka = Publisher.objects.create(name='Азбука')
+    mir = Publisher.objects.create(name='Мир')
+    return [
+        BookEdition.objects.create(book=book, publisher=azbuka, publication_year=2001, edition_type='PAPER_BOOK'),
+        BookEdition.objects.create(book=book, publisher=azbuka, publication_year=2001, edition_type='EBOOK'),
+        BookEdition.objects.create(book=book, publisher=mir, publication_year=2010, edition_type='EBOOK'),
+        BookEdition.objects.create(book=other_book, publisher=mir, publication_year=2010, edition_type='AUDIOBOOK'),
+    ]
+
+
+def _facet(facets, name):
+    return {item['value']: item['count'] for item in facets[name]}
+
+
+def _labels(facets, name):
+    return {item['label']: item['count'] for item in facets[name]}
+
+
+@pytest.mark.django_db
+class TestFilterSetFacetCounts:
+
+    def test_counts_over_filtered_queryset(self, editions):
+        filterset = BookEditionFilter({'book_title': 'башня'}, queryset=BookEdition.objects.all())
+        facets = filterset.get_facet_counts()
+
+        assert _facet(facets, 'edition_type') == {
+            'PAPER_BOOK': 1, 'EBOOK': 2, 'AUDIOBOOK': 0, 'WEBPAGE': 0,
+        }
+        assert _facet(facets, 'publication_year') == {2001: 2, 2010: 1}
+        assert _labels(facets, 'publisher') == {'Азбука': 2, 'Мир': 1}
+
+    def test_own_filter_is_not_applied(self, editions):
+        filterset = BookEditionFilter(
+            {'book_title': 'башня', 'edition_type': 'EBOOK'}, queryset=BookEdition.objects.all(),
+        )
+        facets = filterset.get_facet_counts()
+
+        assert _facet(facets, 'edition_type') == {
+            'PAPER_BOOK': 1, 'EBOOK': 2, 'AUDIOBOOK': 0, 'WEBPAGE': 0,
+        }
+        assert _facet(facets, 'publication_year') == {2001: 1, 2010: 1}
+
+    def test_join_filter_does_not_inflate_counts(self, editions):
+        """Фильтр по авторам соединяет таблицы, но издание считается один раз."""
+        filterset = BookEditionFilter({'author_name': 'n'}, queryset=BookEdition.objects.all())
+        facets = filterset.get_facet_counts()
+
+        assert sum(_facet(facets, 'edition_type').values()) == 4
+
+    def test_one_grouped_query_per_facet(self, editions):
+        filterset = BookEditionFilter({}, queryset=BookEdition.objects.all())
+
+        with CaptureQueriesContext(connection) as captured:
+            filterset.get_facet_counts()
+
+        assert len(captured.captured_queries) == len(BookEditionFilter.facet_fields)
+        assert len(_group_by_queries(captured)) == len(BookEditionFilter.facet_fields)
+
+
+@pytest.mark.django_db
+class TestFacetCountsView:
+
+    def test_choice_labels_show_counts(self, client, editions):
+        response = client.get(reverse('book_edition'))
+
+        content = response.content.decode()
+        assert 'E-book (2)' in content
+        assert 'Paper Book (1)' in content
+        assert 'Web Page (0)' in content
+
+    def test_free_form_facets_rendered_as_links(self, client, editions):
+        response = client.get(reverse('book_edition'), {'edition_type': 'EBOOK', 'page': 1})
+
+        links = {facet['name']: facet for facet in response.context['facet_links']}
+        years = {item['value']: item for item in links['publication_year']['items']}
+        assert {value: item['count'] for value, item in years.items()} == {2001: 1, 2010: 1}
+        assert 'publication_year=2001' in years[2001]['url']
+        assert 'edition_type=EBOOK' in years[2001]['url']
+        assert 'page=' not in years[2001]['url']
+
+    def test_selected_facet_is_marked(self, client, editions):
+        mir = Publisher.objects.get(name='Мир')
+        response = client.get(reverse('book_edition'), {'publisher': mir.pk})
+
+        links = {facet['name']: facet for facet in response.context['facet_links']}
+        publishers = {item['label']: item for item in links['publisher']['items']}
+        assert publishers['Мир']['selected']
+        assert not publishers['Азбука']['selected']
+
+    def test_publisher_link_count_matches_results(self, client, editions):
+        """Название одного издательства - подстрока названия другого."""
+        book = editions[0].book
+        azbuka_1 = Publisher.objects.create(name='Азбука 1')
+        azbuka_10 = Publisher.objects.create(name='Азбука 10')
+        BookEdition.objects.create(book=book, publisher=azbuka_1, edition_type='EBOOK')
+        for _ in range(3):
+            BookEdition.objects.create(book=book, publisher=azbuka_10, edition_type='EBOOK')
+        url = reverse('book_edition')
+
+        response = client.get(url)
+        links = {facet['name']: facet for facet in response.context['facet_links']}
+        items = {item['label']: item for item in links['publisher']['items']}
+        assert items['Азбука 1']['count'] == 1
+
+        for item in items.values():
+            response = client.get(url + item['url'])
+            assert response.context['paginator'].count == item['count']
+            links = {facet['name']: facet for facet in response.context['facet_links']}
+            selected = [link['label'] for link in links['publisher']['items'] if link['selected']]
+            assert selected == [item['label']]
+
+    def test_facets_are_cached(self, client, editions):
+        url = reverse('book_edition')
+        client.get(url, {'book_title': 'башня'})
+
+        with CaptureQueriesContext(connection) as captured:
+            client.get(url, {'book_title': ' башня '})
+
+        assert _group_by_queries(captured) == []
+
+    def test_facets_are_invalidated_on_write(self, client, editions):
+        url = reverse('book_edition')
+        client.get(url)
+
+        BookEdition.objects.create(book=editions[0].book, edition_type='WEBPAGE')
+        response = client.get(url)
+
+        assert 'Web Page (1)' in response.content.decode()
+
+    def test_reading_log_month_ranges_have_no_counts(self, client, editions):
+        year = 2020
+        for month in (1, 1, 5):
+            ReadingLog.objects.create(
+                book_edition=editions[0], year_start=year, month_start=month,
+                year_finish=year, month_finish=12,
+            )
+
+        response = client.get(reverse('reading_log_list'))
+
+        content = response.content.decode()
+        assert 'January (' not in content
+        assert 'December (' not in content
+        assert 'Paper Book (3)' in content
@@ -0,0 +1,110 @@
+"""
+Тесты команды generate_library.
+
+Проверяют, что:
+- создаются объекты всех моделей в заданном количестве
+- деревья заметок согласованы (родитель и корень указаны, индекс продолжает индекс родителя)
+- результат детерминирован значением seed
+"""
+import pytest
+from django.core.management import call_command
+
+from core.cache import model_version
+from core.models import (
+    Author, Book, BookEdition, BookSeries, KeyWord, Note, NoteToBookEdition,
+    Publisher, ReadingLog,
+)
+
+SIZES = {
+    'authors': 30,
+    'publishers': 5,
+    'series': 8,
+    'books': 40,
+    'editions': 60,
+    'reading_logs': 200,
+    'notes': 150,
+    'keywords': 10,
+}
+
+
+def _generate(seed=0):
+    call_command('generate_library', seed=seed, chunk_size=25, verbosity=0, **SIZES)
+
+
+def _snapshot():
+    return (
+        list(Author.objects.order_by('pk').values_list('first_name', 'last_name', 'middle_name')),
+        list(BookEdition.objects.order_by('pk').values_list(
+            'book__title', 'publisher__name', 'publication_year', 'edition_type',
+        )),
+        list(ReadingLog.objects.order_by('pk').values_list(
+            'year_start', 'month_start', 'year_finish', 'month_finish',
+        )),
+        list(Note.objects.order_by('pk').values_list('index', 'parent__index', 'root__index')),
+    )
+
+
+def _delete_library():
+    NoteToBookEdition.objects.all().delete()
+    Note.objects.update(parent=None, root=None)
+    for model in (Note, KeyWord, ReadingLog, BookEdition, BookSeries, Book, Publisher, Author):
+        model.objects.all().delete()
+
+
+@pytest.mark.django_db
+class TestGenerateLibrary:
+    """Тесты наполнения базы синтетической библиотекой."""
+
+    def test_creates_requested_number_of_objects(self):
+        """Число объектов каждой модели совпадает с заданным."""
+        _generate()
+
+        assert Author.objects.count() == SIZES['authors']
+        assert Publisher.objects.count() == SIZES['publishers']
+        assert BookSeries.objects.count() == SIZES['series']
+        assert Book.objects.count() == SIZES['books']
+        assert BookEdition.objects.count() == SIZES['editions']
+        assert ReadingLog.objects.count() == SIZES['reading_logs']
+        assert Note.objects.count() == SIZES['notes']
+        assert KeyWord.objects.count() == SIZES['keywords']
+        assert ReadingLog.objects.filter(year_start__isnull=False).exists()
+        assert NoteToBookEdition.objects.exists()
+        assert not Book.objects.filter(authors__isnull=True).exists()
+        assert not Book.objects.filter(editions__isnull=True).exists()
+
+    def test_note_trees_are_consistent(self):
+        """У вложенных заметок указаны родитель и корень, индекс продолжает индекс родителя."""
+        _generate()
+
+        children = Note.objects.filter(parent__isnull=False).select_related('parent', 'root')
+        assert children.exists()
+        for note in children:
+            assert note.index.rsplit('.', 1)[0] == note.parent.index
+            assert note.root.parent_id is None
+            assert note.index.split('.')[0] == note.root.index
+
+    def test_reading_logs_finish_after_start(self):
+        """Окончание чтения не раньше его начала."""
+        _generate()
+
+        for log in ReadingLog.objects.filter(year_finish__isnull=False, month_start__isnull=False):
+            assert (log.year_finish, log.month_finish) >= (log.year_start, log.month_start)
+
+    def test_same_seed_gives_same_library(self):
+        """Одинаковый seed даёт одинаковые данные, разный - разные."""
+        _generate(seed=1)
+        first = _snapshot()
+        _delete_library()
+
+        _generate(seed=1)
+        assert _snapshot() == first
+        _delete_library()
+
+        _generate(seed=2)
+        assert _snapshot() != first
+
+    def test_bumps_model_versions(self):
+        """bulk_create не отправляет сигналы, поэтому команда сама обновляет версии моделей."""
+        before = model_version(ReadingLog)
+        _generate()
+        assert model_version(ReadingLog) != before
@@ -0,0 +1,94 @@
+"""
+Тесты кэширования периода журнала чтения и блока последних чтений на главной.
+
+Проверяют, что:
+- строки периода форматируются один раз для каждого набора полей периода
+- блок последних чтений на главной берётся из кэша без запросов
+  и перестраивается после записи в журнал чтения или связанные модели
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Author, Book, BookEdition, ReadingLog
+from core.models import format_period, format_period_html
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def edition(db):
+    book = Book.objects.create(title='Река')
+    book.authors.add(Author.objects.create(first_name='Иван', last_name='Петров'))
+    return BookEdition.objects.create(book=book)
+
+
+class TestPeriodFormatting:
+
+    def test_period_strings(self):
+        assert format_period(2020, 3, 2020, 5) == '2020 March - May'
+        assert format_period(2020, None, 2020, 5) == '2020'
+        assert format_period(2019, 11, 2020, None) == '2019 November - 2020'
+
+    def test_period_html_links_years(self):
+        html = format_period_html(2019, 11, None, None)
+
+        assert html == f'<a href="{reverse("year_detail", kwargs={"pk": 2019})}">2019</a> November - ...'
+        assert format_period_html(None, None, 2021, None).startswith('... - <a href=')
+
+    @pytest.mark.django_db
+    def test_same_period_is_formatted_once(self, edition):
+        for _ in range(3):
+            ReadingLog.objects.create(book_edition=edition, year_start=1999, month_start=7, year_finish=1999)
+        format_period.cache_clear()
+
+        periods = {log.period for log in ReadingLog.objects.all()}
+
+        assert periods == {'1999'}
+        assert format_period.cache_info().misses == 1
+
+
+@pytest.mark.django_db
+class TestIndexLastReadingLogsFragment:
+
+    def _get(self, client):
+        with CaptureQueriesContext(connection) as captured:
+            content = client.get(reverse('index')).content.decode()
+        return content, captured.captured_queries
+
+    def test_fragment_is_cached(self, client, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2020, year_finish=2020)
+        _, queries = self._get(client)
+        assert queries
+
+        content, queries = self._get(client)
+        assert queries == []
+        assert 'Река' in content
+
+    def test_rebuilt_after_reading_log_write(self, client, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2020, year_finish=2020)
+        self._get(client)
+
+        other = BookEdition.objects.create(book=Book.objects.create(title='Море'))
+        ReadingLog.objects.create(book_edition=other, year_start=2021, year_finish=2021)
+
+        content, _ = self._get(client)
+        assert 'Море' in content
+
+    def test_rebuilt_after_related_write(self, client, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2020, year_finish=2020)
+        self._get(client)
+
+        author = Author.objects.get()
+        author.last_name = 'Сидоров'
+        author.save()
+
+        content, _ = self._get(client)
+        assert 'Сидоров' in content
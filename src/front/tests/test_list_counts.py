@@ -0,0 +1,158 @@
+"""
+Тесты кэширования числа результатов в списках (CachedCountMixin).
+
+Проверяют, что:
+- COUNT(*) выполняется один раз для одинакового состояния фильтра
+- запись в модель делает закэшированное значение недействительным
+- разные значения фильтра кэшируются раздельно
+- объекты моделей в значениях фильтра дают ключ по первичному ключу, а не по подписи
+"""
+import django_filters
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Author, Book
+from front.views.mixins import CachedCountMixin
+from front.views.mixins import CachedCountPaginator
+
+
+def _count_queries(captured):
+    return [q for q in captured.captured_queries if 'COUNT(' in q['sql'].upper()]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def authors(db):
+    return [
+        Author.objects.create(first_name='John', last_name='Smith'),
+        Author.objects.create(first_name='Jane', last_name='Doe'),
+        Author.objects.create(first_name='Иван', last_name='Петров'),
+    ]
+
+
+@pytest.mark.django_db
+class TestCachedListCount:
+
+    def test_count_is_cached_between_requests(self, client, authors):
+        url = reverse('author')
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.context['paginator'].count == 3
+        assert _count_queries(captured) == []
+
+    def test_count_is_invalidated_on_write(self, client, authors):
+        url = reverse('author')
+        client.get(url)
+
+        Author.objects.create(first_name='Anna', last_name='Brown')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+
+        assert response.context['paginator'].count == 4
+        assert len(_count_queries(captured)) == 1
+
+    def test_related_model_write_invalidates_count(self, client, authors):
+        book = Book.objects.create(title='Test Book')
+        url = reverse('book')
+        response = client.get(url, {'author_name': 'Smith'})
+        assert response.context['paginator'].count == 0
+
+        book.authors.add(authors[0])
+
+        response = client.get(url, {'author_name': 'Smith'})
+        assert response.context['paginator'].count == 1
+
+    def test_filter_values_are_cached_separately(self, client, authors):
+        url = reverse('author')
+
+        assert client.get(url, {'full_name': 'Smith'}).context['paginator'].count == 1
+        assert client.get(url, {'full_name': ' Smith '}).context['paginator'].count == 1
+        assert client.get(url, {'full_name': 'J'}).context['paginator'].count == 2
+        assert client.get(url).context['paginator'].count == 3
+
+    def test_page_parameters_do_not_affect_count_key(self, client, authors):
+        url = reverse('author')
+        client.get(url, {'page_size': 10})
+
+        with CaptureQueriesContext(connection) as captured:
+            client.get(url, {'page_size': 50, 'page': 1})
+
+        assert _count_queries(captured) == []
+
+    def test_empty_result_message_without_full_queryset(self, client, authors):
+        response = client.get(reverse('author'), {'full_name': 'Nobody'})
+
+        assert response.status_code == 200
+        assert 'Авторы не найдены.' in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestCachedCountPaginator:
+
+    def test_estimate_falls_back_to_exact_count(self, authors):
+        """Без статистики PostgreSQL используется точный COUNT(*)."""
+        paginator = CachedCountPaginator(
+            Author.objects.order_by('pk'), 10, use_estimate=True,
+        )
+
+        assert paginator.count == 3
+
+    def test_without_cache_key_count_is_not_cached(self, authors):
+        paginator = CachedCountPaginator(Author.objects.order_by('pk'), 10)
+        assert paginator.count == 3
+
+        Author.objects.create(first_name='Anna', last_name='Brown')
+        paginator = CachedCountPaginator(Author.objects.order_by('pk'), 10)
+        assert paginator.count == 4
+
+
+class AuthorChoiceFilter(django_filters.FilterSet):
+    author = django_filters.ModelChoiceFilter(field_name='authors', queryset=Author.objects.all())
+    authors = django_filters.ModelMultipleChoiceFilter(field_name='authors', queryset=Author.objects.all())
+
+    class Meta:
+        model = Book
+        fields = []
+
+
+def _filter_params(data):
+    view = CachedCountMixin()
+    view.filterset = AuthorChoiceFilter(data, queryset=Book.objects.all())
+    return view.get_normalized_filter_params()
+
+
+@pytest.mark.django_db
+class TestNormalizedFilterParams:
+
+    def test_model_choice_uses_pk(self, authors):
+        namesake = Author.objects.create(first_name='John', last_name='Smith')
+
+        params = _filter_params({'author': authors[0].pk})
+
+        assert params == (('author', authors[0].pk),)
+        assert params != _filter_params({'author': namesake.pk})
+
+    def test_model_multiple_choice_uses_sorted_pks(self, authors):
+        pks = [authors[2].pk, authors[0].pk]
+
+        params = _filter_params({'authors': pks})
+
+        assert params == (('authors', tuple(sorted(pks))),)
+        assert params == _filter_params({'authors': list(reversed(pks))})
+
+    def test_empty_multiple_choice_is_skipped(self, authors):
+        assert _filter_params({'authors': []}) == ()
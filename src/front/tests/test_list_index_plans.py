@@ -0,0 +1,132 @@
+"""
+Тесты планов запросов страниц списков.
+
+Проверяют, что:
+- первая страница каждого списка читается обходом индекса, совпадающего с ordering view,
+  без сортировки всего набора (EXPLAIN на SQLite и PostgreSQL)
+- копии полей для сортировки (BookEdition.book_title, BookSeries.publisher_name)
+  обновляются при изменении исходных объектов
+"""
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+from core.models import Book, BookEdition, BookSeries, Publisher
+from front.views.book_edition import BookEditionListView
+from front.views.book_series import BookSeriesListView
+from front.views.index import IndexPageView
+from front.views.notes import NoteListView
+from front.views.reading_log import ReadingLogListView
+
+PAGE_SIZE = 25
+
+# view -> индекс, который должен обходить запрос первой страницы
+LIST_VIEW_INDEXES = {
+    ReadingLogListView: 'readinglog_period_order_idx',
+    BookEditionListView: 'bookedition_title_order_idx',
+    BookSeriesListView: 'bookseries_order_idx',
+    NoteListView: 'note_parent_created_idx',
+}
+
+requires_sqlite = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса SQLite',
+)
+requires_postgresql = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='План запроса PostgreSQL',
+)
+
+
+def _first_page(view_class):
+    view = view_class()
+    view.setup(RequestFactory().get('/'))
+    return view.get_queryset()[:PAGE_SIZE]
+
+
+def _index_page():
+    view = IndexPageView()
+    view.setup(RequestFactory().get('/'))
+    return view.get_context_data()['last_reading_logs']
+
+
+def _postgresql_plan(queryset):
+    with connection.cursor() as cursor:
+        # На пустых тестовых таблицах планировщик иначе выберет полный просмотр
+        cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestSQLiteListPlans:
+
+    @requires_sqlite
+    @pytest.mark.parametrize('view_class', list(LIST_VIEW_INDEXES), ids=lambda view: view.__name__)
+    def test_first_page_walks_ordering_index(self, view_class):
+        plan = _first_page(view_class).explain()
+
+        assert LIST_VIEW_INDEXES[view_class] in plan
+        assert 'TEMP B-TREE' not in plan
+
+    @requires_sqlite
+    def test_index_page_walks_reading_log_index(self):
+        plan = _index_page().explain()
+
+        assert 'readinglog_period_order_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+@pytest.mark.django_db
+class TestPostgreSQLListPlans:
+
+    @requires_postgresql
+    @pytest.mark.parametrize('view_class', list(LIST_VIEW_INDEXES), ids=lambda view: view.__name__)
+    def test_first_page_walks_ordering_index(self, view_class):
+        plan = _postgresql_plan(_first_page(view_class))
+
+        assert LIST_VIEW_INDEXES[view_class] in plan
+        assert 'Sort' not in plan
+
+    @requires_postgresql
+    def test_index_page_walks_reading_log_index(self):
+        plan = _postgresql_plan(_index_page())
+
+        assert 'readinglog_period_order_idx' in plan
+        assert 'Sort' not in plan
+
+
+@pytest.mark.django_db
+class TestSortColumnsSync:
+
+    def test_book_edition_copies_book_title(self):
+        book = Book.objects.create(title='Река')
+        edition = BookEdition.objects.create(book=book)
+
+        assert edition.book_title == 'Река'
+
+        book.title = 'Море'
+        book.save()
+
+        edition.refresh_from_db()
+        assert edition.book_title == 'Море'
+
+    def test_book_series_copies_publisher_name(self):
+        publisher = Publisher.objects.create(name='Мир')
+        series = BookSeries.objects.create(name='Классика', publisher=publisher)
+
+        assert series.publisher_name == 'Мир'
+
+        publisher.name = 'Наука'
+        publisher.save()
+
+        series.refresh_from_db()
+        assert series.publisher_name == 'Наука'
+
+    def test_edition_list_is_ordered_by_book_title(self):
+        for title in ('В', 'А', 'Б'):
+            BookEdition.objects.create(book=Book.objects.create(title=title))
+
+        book = Book.objects.get(title='А')
+        book.title = 'Я'
+        book.save()
+
+        titles = [edition.book_title for edition in _first_page(BookEditionListView)]
+        assert titles == ['Б', 'В', 'Я']
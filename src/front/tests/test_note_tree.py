@@ -0,0 +1,74 @@
+"""
+Тесты плоского дерева заметок (core.note_tree).
+
+Проверяют, что:
+- flatten_note_tree() обходит деревья в глубину с детьми по index и уровнями вложенности
+- после каждого листа закрывается столько уровней, сколько нужно до следующего узла
+- потомки загружаются одним запросом на уровень дерева, а не на заметку
+- список заметок и страница издания рендерят вложенную разметку дерева
+"""
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import BookEdition, Book, Note, NoteToBookEdition
+from core.note_tree import NOTE_INDENT, flatten_note_tree
+
+TOP_LEVEL = ('note1', 'note2', 'note3')
+
+
+def _roots(notes_hierarchy):
+    return [notes_hierarchy[key] for key in TOP_LEVEL]
+
+
+@pytest.mark.django_db
+class TestNoteTree:
+
+    def test_depth_first_order(self, notes_hierarchy):
+        nodes = flatten_note_tree(_roots(notes_hierarchy))
+
+        assert [(node.note.index, node.level) for node in nodes] == [
+            ('1', 0), ('1.1', 1), ('1.1.1', 2), ('1.2', 1), ('2', 0), ('2.1', 1), ('3', 0),
+        ]
+        assert [node.has_children for node in nodes] == [True, True, False, False, True, False, False]
+        assert nodes[2].indent == 2 * NOTE_INDENT
+
+    def test_closed_levels(self, notes_hierarchy):
+        nodes = flatten_note_tree(_roots(notes_hierarchy))
+
+        assert [len(node.closes) for node in nodes] == [0, 0, 1, 1, 0, 1, 0]
+
+    def test_queries_per_level(self, notes_hierarchy):
+        roots = _roots(notes_hierarchy)
+
+        with CaptureQueriesContext(connection) as queries:
+            flatten_note_tree(roots)
+
+        # уровни 1 и 2 и пустой уровень 3
+        assert len(queries) == 3
+
+    def test_empty(self, db):
+        assert flatten_note_tree([]) == []
+
+    def test_note_list_markup(self, client, notes_hierarchy):
+        content = client.get(reverse('note')).content.decode()
+        items = re.findall(r'<li class="note-item[^>]*>', content)
+
+        assert len(items) == len(notes_hierarchy)
+        assert content.count('<ul class="note-children list-unstyled">') == 3
+        assert content.count('</li>') == len(re.findall(r'<li[\s>]', content))
+        assert f'style="margin-left: {2 * NOTE_INDENT}px;"' in content
+
+    def test_book_edition_detail_markup(self, client, notes_hierarchy):
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Книга'))
+        NoteToBookEdition.objects.create(note=notes_hierarchy['note1'], book_edition=edition)
+
+        content = client.get(reverse('book_edition_detail', kwargs={'pk': edition.pk})).content.decode()
+
+        for key in ('note1', 'note1_1', 'note1_1_1', 'note1_2'):
+            assert notes_hierarchy[key].topic in content
+        assert notes_hierarchy['note2'].topic not in content
+        assert content.count('<ul class="note-children list-unstyled">') == 2
@@ -0,0 +1,78 @@
+"""
+Тесты частичных ответов списков (PartialResultsMixin).
+
+Проверяют, что:
+- запрос с заголовком X-Partial или параметром partial отдаёт только результаты с пагинацией
+- полная страница включает те же результаты и скрипт подмены
+- ссылки пагинации сохраняют фильтр, не содержат флага частичного ответа и пропускают далёкие страницы
+"""
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from core.models import Author, Book, BookEdition, ReadingLog
+
+LIST_URLS = ('author', 'book', 'book_edition', 'book_series', 'publisher', 'reading_log_list', 'note')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def authors(db):
+    for number in range(100):
+        Author.objects.create(last_name=f'Автор {number:03}', first_name='Имя')
+
+
+def _partial(client, name, **params):
+    return client.get(reverse(name), params, headers={'X-Partial': 'results'})
+
+
+@pytest.mark.django_db
+class TestPartialResults:
+
+    @pytest.mark.parametrize('name', LIST_URLS)
+    def test_partial_response_has_only_results(self, client, name):
+        response = _partial(client, name)
+        content = response.content.decode()
+
+        assert response.status_code == 200
+        assert '<html' not in content
+        assert 'Фильтровать' not in content
+        assert 'page_size' in content
+        assert 'X-Partial' in response['Vary']
+
+    @pytest.mark.parametrize('name', LIST_URLS)
+    def test_full_page_includes_results(self, client, name):
+        content = client.get(reverse(name)).content.decode()
+
+        assert 'data-partial-results' in content
+        assert 'front/js/partial_results.js' in content
+
+    def test_query_flag(self, client, authors):
+        response = client.get(reverse('author'), {'partial': 'results', 'full_name': 'автор'})
+        content = response.content.decode()
+
+        assert '<html' not in content
+        assert 'Автор 000 Имя' in content
+        assert 'partial=' not in content
+
+    def test_page_links_keep_filter_and_elide_pages(self, client, authors):
+        content = _partial(client, 'author', full_name='автор', page_size=10, page=5).content.decode()
+
+        assert 'href="?full_name=%D0%B0%D0%B2%D1%82%D0%BE%D1%80&amp;page_size=10&amp;page=6"' in content
+        assert 'page=10"' in content
+        assert 'page=8"' not in content
+        assert '…' in content
+
+    def test_bulk_finish_returns_to_full_page(self, client, db):
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Река'))
+        ReadingLog.objects.create(book_edition=edition, year_start=2020)
+
+        content = client.get(reverse('reading_log_list'), {'partial': 'results', 'page': 1}).content.decode()
+
+        assert f'name="next" value="{reverse("reading_log_list")}?page=1"' in content
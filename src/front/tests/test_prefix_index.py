@@ -0,0 +1,273 @@
+"""
+Тесты префиксных индексов автокомплитов (core.prefix_index).
+
+Проверяют, что:
+- поиск по префиксу находит объекты по любому полю без учёта регистра и в порядке ordering
+- повторный поиск не обращается к базе данных
+- запись в модель (в том числе через сигналы копий полей) перестраивает индекс
+- автокомплиты отвечают из индекса и учитывают forward
+- автокомплиты отдают ETag и отвечают 304 на If-None-Match без поиска
+- нечёткий поиск по триграммам находит значения с опечатками после совпадений по префиксу
+"""
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Author, Book, BookEdition, BookSeries, KeyWord, Note, Publisher
+from core.prefix_index import FUZZY_LIMIT, PrefixIndex, normalize, trigrams
+from front.views.author import AuthorAutocompleteView
+from front.views.book import BookAutocompleteView
+from front.views.book_edition import BookEditionAutocompleteView
+from front.views.book_series import BookSeriesAutocompleteView
+from front.views.notes import KeyWordAutocompleteView, NoteAutocompleteView
+from front.views.publisher import PublisherAutocompleteView
+
+AUTOCOMPLETE_VIEWS = (
+    AuthorAutocompleteView, BookAutocompleteView, BookEditionAutocompleteView,
+    BookSeriesAutocompleteView, KeyWordAutocompleteView, NoteAutocompleteView,
+    PublisherAutocompleteView,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def authors(db):
+    return [
+        Author.objects.create(last_name='Петров', first_name='Иван'),
+        Author.objects.create(last_name='Иванов', first_name='Пётр', middle_name='Сергеевич'),
+        Author.objects.create(last_name='Сидоров', first_name='Олег'),
+    ]
+
+
+def _pks(entries):
+    return [entry.pk for entry in entries]
+
+
+def _results(client, name, **params):
+    response = client.get(reverse(name), params)
+    assert response.status_code == 200
+    return [item['text'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db
+class TestPrefixIndex:
+
+    def test_normalize(self):
+        assert normalize('  Тёмная   БАШНЯ ') == 'тёмная башня'
+
+    def test_search_by_any_field(self, authors):
+        index = PrefixIndex(Author, ('first_name', 'last_name', 'middle_name'))
+
+        assert _pks(index.search('ив')) == [authors[0].pk, authors[1].pk]
+        assert _pks(index.search('СЕР')) == [authors[1].pk]
+        assert _pks(index.search('')) == _pks(index.search(None)) == [author.pk for author in authors]
+        assert index.search('я') == []
+
+    def test_entries_carry_labels(self, authors):
+        index = PrefixIndex(Author, ('last_name',))
+
+        assert [str(entry) for entry in index.search('п')] == ['Петров Иван']
+
+    def test_ordering(self, db):
+        for word in ('кот', 'кит', 'код'):
+            KeyWord.objects.create(word=word)
+        index = PrefixIndex(KeyWord, ('word',), ordering=('word',))
+
+        assert [str(entry) for entry in index.search('к')] == ['кит', 'код', 'кот']
+
+    def test_repeated_search_does_not_query_database(self, authors):
+        index = PrefixIndex(Author, ('last_name',))
+        index.search('п')
+
+        with CaptureQueriesContext(connection) as captured:
+            index.search('с')
+
+        assert captured.captured_queries == []
+
+    def test_rebuilt_after_write(self, authors):
+        index = PrefixIndex(Author, ('last_name',))
+        assert len(index.search('п')) == 1
+
+        Author.objects.create(last_name='Павлов', first_name='Андрей')
+        authors[0].delete()
+
+        assert [str(entry) for entry in index.search('п')] == ['Павлов Андрей']
+
+    def test_rebuilt_after_copied_field_update(self, db):
+        publisher = Publisher.objects.create(name='Мир')
+        edition = BookEdition.objects.create(book=Book.objects.create(title='Река'), publisher=publisher)
+        index = PrefixIndex(BookEdition, ('book_title', 'publisher_name'))
+        assert _pks(index.search('мир')) == [edition.pk]
+
+        publisher.name = 'Наука'
+        publisher.save()
+
+        assert index.search('мир') == []
+        assert [str(entry) for entry in index.search('нау')] == ['Река - Наука']
+
+
+@pytest.mark.django_db
+class TestAutocompleteViews:
+
+    def test_book_autocomplete_searches_all_titles(self, client, admin_user):
+        client.force_login(admin_user)
+        Book.objects.create(title='Река', title_original='River')
+        Book.objects.create(title='Море', extended_title='Море и река')
+
+        assert _results(client, 'book_autocomplete', q='river') == ['Река']
+        assert _results(client, 'book_autocomplete', q='мо') == ['Море']
+
+    def test_autocomplete_answers_without_search_queries(self, client, admin_user, authors):
+        client.force_login(admin_user)
+        _results(client, 'author_autocomplete', q='п')
+
+        with CaptureQueriesContext(connection) as captured:
+            texts = _results(client, 'author_autocomplete', q='сид')
+
+        assert texts == ['Сидоров Олег']
+        assert not [q for q in captured.captured_queries if '"core_author"' in q['sql']]
+
+    def test_note_autocomplete_excludes_forwarded_note(self, client, admin_user):
+        client.force_login(admin_user)
+        Note.objects.create(index='1', topic='Тема')
+        Note.objects.create(index='2', topic='Тезис')
+
+        texts = _results(
+            client, 'note_autocomplete', q='те', forward=json.dumps({'index': '1'}),
+        )
+
+        assert texts == ['2 Тезис']
+
+    def test_pagination(self, client, admin_user, db):
+        client.force_login(admin_user)
+        for number in range(15):
+            Publisher.objects.create(name=f'Мир {number:02}')
+
+        response = client.get(reverse('publisher_autocomplete'), {'q': 'мир'})
+
+        data = response.json()
+        assert len(data['results']) == 10
+        assert data['pagination']['more'] is True
+
+    @pytest.mark.parametrize('view_class', AUTOCOMPLETE_VIEWS, ids=lambda view: view.__name__)
+    def test_index_is_built_with_one_query(self, view_class, authors):
+        publisher = Publisher.objects.create(name='Мир')
+        book = Book.objects.create(title='Река')
+        BookEdition.objects.create(book=book, publisher=publisher, publication_year=2001)
+        BookSeries.objects.create(name='Классика', publisher=publisher)
+        KeyWord.objects.create(word='ключ')
+        Note.objects.create(index='1', topic='Тема')
+        index = view_class.prefix_index
+        model = index.model
+
+        with CaptureQueriesContext(connection) as captured:
+            labels = [str(entry) for entry in index.search('')]
+
+        assert len(captured.captured_queries) == 1
+        assert sorted(labels) == sorted(str(obj) for obj in model.objects.all())
+
+
+@pytest.mark.django_db
+class TestAutocompleteHttpCaching:
+
+    def _get(self, client, etag=None, **params):
+        headers = {'If-None-Match': etag} if etag else {}
+        return client.get(reverse('author_autocomplete'), params, headers=headers)
+
+    def test_etag_and_cache_control(self, client, admin_user, authors):
+        client.force_login(admin_user)
+        response = self._get(client, q='п')
+
+        assert response.status_code == 200
+        assert response['ETag'].startswith('"')
+        assert 'private' in response['Cache-Control']
+        assert 'max-age=60' in response['Cache-Control']
+
+    def test_not_modified_without_search(self, client, admin_user, authors):
+        client.force_login(admin_user)
+        etag = self._get(client, q='п')['ETag']
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self._get(client, etag=etag, q=' П ')
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert response.content == b''
+        assert not [q for q in captured.captured_queries if '"core_author"' in q['sql']]
+
+    def test_etag_depends_on_query_page_and_forward(self, client, admin_user, authors):
+        client.force_login(admin_user)
+        for number in range(10):
+            Author.objects.create(last_name=f'Павлов {number}', first_name='Андрей')
+        etag = self._get(client, q='п')['ETag']
+
+        assert self._get(client, etag=etag, q='с').status_code == 200
+        assert self._get(client, etag=etag, q='п', page=2).status_code == 200
+        assert self._get(client, etag=etag, q='п', forward='{"index": "1"}').status_code == 200
+
+    def test_etag_changes_after_write(self, client, admin_user, authors):
+        client.force_login(admin_user)
+        etag = self._get(client, q='п')['ETag']
+
+        Author.objects.create(last_name='Павлов', first_name='Андрей')
+        response = self._get(client, etag=etag, q='п')
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert [item['text'] for item in response.json()['results']] == ['Петров Иван', 'Иванов Пётр Сергеевич', 'Павлов Андрей']
+
+
+@pytest.mark.django_db
+class TestFuzzySearch:
+
+    def test_trigrams(self):
+        assert trigrams('кот') == {'  к', ' ко', 'кот', 'от '}
+        assert trigrams('а-б') == {'  а', ' а ', '  б', ' б '}
+
+    def test_typo_matches_after_prefix_matches(self, db):
+        tolstoy = Author.objects.create(last_name='Tolstoy', first_name='Leo')
+        tolkien = Author.objects.create(last_name='Tolkien', first_name='John')
+        Author.objects.create(last_name='Chekhov', first_name='Anton')
+        index = PrefixIndex(Author, ('first_name', 'last_name'), fuzzy=True)
+
+        assert _pks(index.search('Tolstoi')) == [tolstoy.pk]
+        assert _pks(index.search('Tol')) == [tolstoy.pk, tolkien.pk]
+
+    def test_ranked_by_similarity(self, db):
+        close = Book.objects.create(title='Тёмная башня')
+        far = Book.objects.create(title='Тёмный лес')
+        index = PrefixIndex(Book, ('title',), fuzzy=True)
+
+        assert _pks(index.search('тёмная башн')) == [close.pk]
+        assert _pks(index.search('темная башня')) == [close.pk]
+        assert far.pk not in _pks(index.search('тёмная башн'))
+
+    def test_short_query_and_disabled_index_are_not_fuzzy(self, db):
+        Publisher.objects.create(name='Азбука')
+
+        assert PrefixIndex(Publisher, ('name',), fuzzy=True).search('зб') == []
+        assert PrefixIndex(Publisher, ('name',)).search('Азбукка') == []
+        assert len(PrefixIndex(Publisher, ('name',), fuzzy=True).search('Азбукка')) == 1
+
+    def test_result_size_is_capped(self, db):
+        for number in range(FUZZY_LIMIT + 5):
+            Publisher.objects.create(name=f'Азбука {number}')
+        index = PrefixIndex(Publisher, ('name',), fuzzy=True)
+
+        assert len(index.search('Азбукка')) == FUZZY_LIMIT
+
+    def test_autocomplete_finds_misspelled_title(self, client, admin_user):
+        client.force_login(admin_user)
+        Book.objects.create(title='Река', title_original='The River Between')
+
+        assert _results(client, 'book_autocomplete', q='rivr between') == ['Река']
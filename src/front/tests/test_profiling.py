@@ -0,0 +1,115 @@
+"""
+Тесты профилирования запросов (private_library.profiling).
+
+Проверяют, что:
+- по умолчанию профилирование выключено и middleware не подключен
+- профиль запроса содержит время шаблонов и include, число и время SQL-запросов
+- запросы из шаблона привязаны к строке шаблона, запросы из кода - к строке кода проекта
+- профиль записывается в лог одной строкой JSON и показывается на странице отчёта
+- страница отчёта доступна только с DEBUG или сотрудникам
+"""
+import json
+import logging
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from private_library import profiling
+
+MIDDLEWARE = 'private_library.profiling.ProfilingMiddleware'
+PROFILING_SETTINGS = {'PROFILING': True, 'MIDDLEWARE': [MIDDLEWARE, *settings.MIDDLEWARE]}
+NOTE_TREE = 'notes/_note_tree.html'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def profiled_client(client):
+    profiling._history.clear()
+    with override_settings(**PROFILING_SETTINGS):
+        yield client
+    profiling._history.clear()
+
+
+def _profile(client, name):
+    response = client.get(reverse(name))
+    assert response.status_code == 200
+    return profiling.recent_profiles()[0].as_dict()
+
+
+@pytest.mark.django_db
+class TestProfiling:
+
+    def test_disabled_by_default(self, client):
+        assert settings.PROFILING is False
+        assert MIDDLEWARE not in settings.MIDDLEWARE
+        assert client.get(reverse('profiling_report')).status_code == 404
+
+    def test_template_and_include_times(self, profiled_client, notes_hierarchy):
+        profile = _profile(profiled_client, 'note')
+        templates = {template['name']: template for template in profile['templates']}
+        includes = [include for include in profile['includes'] if include['name'] == NOTE_TREE]
+
+        assert profile['path'] == reverse('note')
+        assert profile['status'] == 200
+        assert templates[NOTE_TREE]['calls'] == 1
+        assert templates['notes/_note_results.html']['self_time'] < templates['notes/_note_results.html']['total_time']
+        assert sum(template['self_time'] for template in profile['templates']) <= profile['total_time']
+        assert [(include['template'], include['calls']) for include in includes] == [('notes/_note_results.html', 1)]
+
+    def test_query_origins(self, profiled_client, notes_hierarchy):
+        profile = _profile(profiled_client, 'index')
+        queries = profiling.recent_profiles()[0].queries
+        origins = {origin for _, _, origin in queries}
+
+        assert profile['sql_count'] == len(queries) > 0
+        assert profile['sql_time'] == pytest.approx(sum(duration for duration, _, _ in queries), abs=1e-5)
+        assert any(origin.startswith('index.html:') for origin in origins)
+        assert len(profile['slowest_queries']) == min(len(queries), profiling.SLOWEST_QUERIES)
+
+    def test_code_query_origin(self, profiled_client):
+        _profile(profiled_client, 'reading_statistics')
+        origins = {origin for _, _, origin in profiling.recent_profiles()[0].queries}
+
+        assert any(origin.startswith('core/statistics.py:') for origin in origins)
+
+    def test_structured_log(self, profiled_client, notes_hierarchy, caplog):
+        with caplog.at_level(logging.INFO, logger='private_library.profiling'):
+            profiled_client.get(reverse('note'))
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == reverse('note')
+        assert record['sql_count'] > 0
+        assert record['templates']
+
+    def test_report_page(self, profiled_client, admin_user, notes_hierarchy):
+        profiled_client.get(reverse('note'))
+        profiled_client.force_login(admin_user)
+
+        response = profiled_client.get(reverse('profiling_report'))
+        content = response.content.decode()
+
+        assert response.status_code == 200
+        assert NOTE_TREE in content
+        assert 'Profiling: last 1 requests' in content
+
+    def test_report_hidden_from_anonymous(self, profiled_client, notes_hierarchy):
+        profiled_client.get(reverse('note'))
+
+        assert profiled_client.get(reverse('profiling_report')).status_code == 404
+
+    def test_report_in_debug(self, profiled_client, notes_hierarchy):
+        profiled_client.get(reverse('note'))
+
+        with override_settings(DEBUG=True):
+            response = profiled_client.get(reverse('profiling_report'))
+
+        assert response.status_code == 200
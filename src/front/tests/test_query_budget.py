@@ -0,0 +1,150 @@
+"""
+Тесты бюджета SQL-запросов для страниц списков и детальных страниц.
+
+Для каждого URL число запросов не должно зависеть от количества строк на
+странице: страница с небольшим набором данных и страница с большим набором
+должны выполнять одинаковое число запросов, не превышающее бюджет.
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import (
+    Author, Book, BookEdition, BookSeries, Publisher, ReadingLog,
+)
+
+SMALL_SIZE = 2
+LARGE_SIZE = 30
+
+# Максимальное число запросов для страницы (url name -> бюджет).
+# Для book_edition и reading_log_list в бюджет входит по одному
+# запросу на фасет фильтра (FacetCountsMixin) при холодном кэше.
+# Списки со строками из кэша фрагментов (RowFragmentCacheMixin) при холодном
+# кэше выполняют ещё один запрос - загрузку строк со связями.
+QUERY_BUDGETS = {
+    'index': 2,
+    'author': 3,
+    'author_detail': 2,
+    'book': 3,
+    'book_detail': 4,
+    'book_edition': 6,
+    'book_edition_detail': 4,
+    'book_series': 3,
+    'book_series_detail': 2,
+    'publisher': 3,
+    'publisher_detail': 3,
+    'reading_log_list': 9,
+    'readinglog_detail': 1,
+    'year': 2,
+    'year_detail': 3,
+}
+
+# Списки, которые при тёплом кэше выбирают только страницу объектов
+ROW_CACHED_LISTS = ('author', 'book', 'book_edition', 'book_series', 'publisher', 'reading_log_list')
+
+
+def _build_library(size):
+    """
+    Добавляет в библиотеку по size объектов во все связи страниц.
+
+    Повторный вызов дополняет уже созданные общие объекты.
+
+    Возвращает словарь объектов, на которые ссылаются детальные страницы.
+    """
+    publisher, _ = Publisher.objects.get_or_create(name='Publisher')
+    series, _ = BookSeries.objects.get_or_create(name='Series', publisher=publisher)
+    author, _ = Author.objects.get_or_create(first_name='Main', last_name='Author')
+    year_start = 2020
+    year_finish = 2021
+    main_book, _ = Book.objects.get_or_create(title='Main book')
+    main_book.authors.add(author)
+    main_edition = None
+
+    for i in range(size):
+        co_author = Author.objects.create(first_name=f'Co {i}', last_name=f'Author {i}')
+        book = Book.objects.create(title=f'Book {i}')
+        book.authors.add(author, co_author)
+        edition = BookEdition.objects.create(
+            book=book, publisher=publisher, series=series, publication_year=2000 + i,
+        )
+        main_edition = BookEdition.objects.create(
+            book=main_book, publisher=publisher, series=series, publication_year=2000 + i,
+        )
+        for book_edition in (edition, main_edition):
+            ReadingLog.objects.create(
+                book_edition=book_edition,
+                year_start=year_start,
+                month_start=1 + i % 12,
+                year_finish=year_finish,
+                month_finish=1 + i % 12,
+            )
+
+    for i in range(size):
+        ReadingLog.objects.create(
+            book_edition=main_edition,
+            year_start=year_start,
+            month_start=1 + i % 12,
+            year_finish=year_start,
+            month_finish=12,
+        )
+
+    return {
+        'author_detail': author,
+        'book_detail': main_book,
+        'book_edition_detail': main_edition,
+        'book_series_detail': series,
+        'publisher_detail': publisher,
+        'readinglog_detail': ReadingLog.objects.first(),
+        'year_detail': year_start,
+    }
+
+
+def _url(name, objects):
+    if name in objects:
+        # Страница года адресуется самим годом
+        pk = getattr(objects[name], 'pk', objects[name])
+        return reverse(name, kwargs={'pk': pk})
+    return reverse(name)
+
+
+def _count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, {'page_size': 100})
+    assert response.status_code == 200
+    return len(captured.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', sorted(QUERY_BUDGETS))
+def test_query_count_does_not_depend_on_page_size(client, url_name):
+    objects = _build_library(SMALL_SIZE)
+    small = _count_queries(client, _url(url_name, objects))
+
+    objects = _build_library(LARGE_SIZE - SMALL_SIZE)
+    large = _count_queries(client, _url(url_name, objects))
+
+    assert small == large, (
+        f'{url_name}: {small} запросов для {SMALL_SIZE} строк, '
+        f'{large} запросов для {LARGE_SIZE} строк'
+    )
+    assert large <= QUERY_BUDGETS[url_name], (
+        f'{url_name}: {large} запросов при бюджете {QUERY_BUDGETS[url_name]}'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ROW_CACHED_LISTS)
+def test_cached_rows_are_not_loaded(client, url_name):
+    _build_library(SMALL_SIZE)
+    url = reverse(url_name)
+    cache.clear()
+    client.get(url, {'page_size': 100})
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, {'page_size': 100})
+
+    assert response.status_code == 200
+    assert len(captured.captured_queries) == 1, [query['sql'] for query in captured.captured_queries]
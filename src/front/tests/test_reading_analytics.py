@@ -0,0 +1,143 @@
+"""
+Тесты аналитики длительности чтения (core.analytics, ReadingAnalyticsView).
+
+Проверяют, что:
+- длительность в месяцах, средние по типу издания и автору и незаконченные чтения
+  считаются в базе данных
+- число запросов не зависит от числа записей журнала
+- аналитика кэшируется и пересчитывается после записи в журнал
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.analytics import build_reading_analytics, completed_reading_logs, get_reading_analytics
+from core.models import Author, Book, BookEdition
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def editions(db):
+    author = Author.objects.create(first_name='Иван', last_name='Петров')
+    book = Book.objects.create(title='Река')
+    book.authors.add(author)
+    return {
+        'paper': BookEdition.objects.create(book=book, edition_type='PAPER_BOOK'),
+        'ebook': BookEdition.objects.create(book=Book.objects.create(title='Море'), edition_type='EBOOK'),
+    }
+
+
+@pytest.mark.django_db
+class TestBuildReadingAnalytics:
+
+    def test_duration_in_months(self, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 3), (2020, 3))
+        make_reading_log(editions['paper'], (2020, 11), (2021, 2))
+
+        durations = sorted(completed_reading_logs().values_list('duration_months', flat=True))
+
+        assert durations == [1, 4]
+
+    def test_summary_and_groups(self, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 1), (2020, 2))
+        make_reading_log(editions['paper'], (2020, 1), (2020, 4))
+        make_reading_log(editions['ebook'], (2021, 5), (2021, 5))
+        # Без месяца окончания длительность неизвестна
+        make_reading_log(editions['ebook'], (2021, 5), (2021, None))
+
+        analytics = build_reading_analytics()
+
+        assert analytics['summary'] == {
+            'reads': 3, 'average_months': 2.3, 'shortest_months': 1, 'longest_months': 4,
+        }
+        assert analytics['distribution'] == [
+            {'duration_months': 1, 'reads': 1},
+            {'duration_months': 2, 'reads': 1},
+            {'duration_months': 4, 'reads': 1},
+        ]
+        by_type = {row['edition_type']: row for row in analytics['by_edition_type']}
+        assert by_type['PAPER_BOOK']['average_months'] == 3.0
+        assert by_type['EBOOK']['reads'] == 1
+        assert analytics['by_author'] == [
+            {'author': Author.objects.get().pk, 'reads': 2, 'average_months': 3.0, 'name': 'Петров И.'},
+        ]
+
+    def test_co_authored_book(self, db, make_reading_log):
+        authors = [
+            Author.objects.create(first_name='Илья', last_name='Ильф'),
+            Author.objects.create(first_name='Евгений', last_name='Петров'),
+        ]
+        book = Book.objects.create(title='Двенадцать стульев')
+        book.authors.add(*authors)
+        edition = BookEdition.objects.create(book=book, edition_type='PAPER_BOOK')
+        make_reading_log(edition, (2020, 1), (2020, 2))
+
+        by_author = build_reading_analytics()['by_author']
+
+        assert sorted((row['author'], row['reads']) for row in by_author) == [
+            (authors[0].pk, 1), (authors[1].pk, 1),
+        ]
+
+    def test_open_backlog(self, editions, make_reading_log):
+        oldest = make_reading_log(editions['paper'], (2019, 4))
+        make_reading_log(editions['ebook'], (2021, None))
+        make_reading_log(editions['ebook'], (2021, 1), (2021, 2))
+
+        backlog = build_reading_analytics()['open_backlog']
+
+        assert backlog['reads'] == 2
+        assert backlog['by_start_year'] == [{'year_start': 2021, 'reads': 1}, {'year_start': 2019, 'reads': 1}]
+        assert backlog['oldest'][0] == {'pk': oldest.pk, 'title': 'Река', 'year_start': 2019, 'month_start': 4}
+
+    def test_query_count_does_not_depend_on_data(self, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 1), (2020, 2))
+        with CaptureQueriesContext(connection) as small:
+            build_reading_analytics()
+
+        for month in range(1, 13):
+            make_reading_log(editions['ebook'], (2020, month), (2021, month))
+            make_reading_log(editions['paper'], (2022, month))
+        with CaptureQueriesContext(connection) as large:
+            build_reading_analytics()
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+
+@pytest.mark.django_db
+class TestReadingAnalyticsViews:
+
+    def test_cached_until_reading_log_write(self, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 1), (2020, 2))
+        get_reading_analytics()
+
+        with CaptureQueriesContext(connection) as captured:
+            get_reading_analytics()
+        assert captured.captured_queries == []
+
+        make_reading_log(editions['paper'], (2020, 1), (2020, 6))
+        assert get_reading_analytics()['summary']['reads'] == 2
+
+    def test_page(self, client, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 1), (2020, 2))
+        make_reading_log(editions['ebook'], (2021, 3))
+
+        response = client.get(reverse('reading_analytics'))
+
+        assert response.status_code == 200
+        assert response.context['distribution'][0]['percent'] == 100
+        assert 'Море' in response.content.decode()
+
+    def test_json(self, client, editions, make_reading_log):
+        make_reading_log(editions['paper'], (2020, 1), (2020, 2))
+
+        response = client.get(reverse('reading_analytics_json'))
+
+        assert response.json()['summary']['average_months'] == 2.0
@@ -0,0 +1,166 @@
+"""
+Тесты массовых операций с журналом чтения (ReadingLogBulkNewView, ReadingLogBulkFinishView).
+
+Проверяют, что:
+- набор форм и CSV проверяются по правилам ReadingLogForm и сохраняются через bulk_create
+- окончание чтения выбранным записям ставится одним UPDATE
+- ключи периода, сводка статистики и версия ReadingLog в кэше обновляются
+"""
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import model_version
+from core.models import Book, BookEdition, ReadingLog, ReadingStatistic
+from core.statistics import reading_logs_cells
+
+
+@pytest.fixture
+def editions(db):
+    return [
+        BookEdition.objects.create(book=Book.objects.create(title=title))
+        for title in ('Река', 'Море')
+    ]
+
+
+def _csv(text):
+    return SimpleUploadedFile('reading_logs.csv', text.encode('utf-8'), content_type='text/csv')
+
+
+def _formset_data(rows, extra=3):
+    data = {
+        'form-TOTAL_FORMS': str(len(rows) + extra),
+        'form-INITIAL_FORMS': '0',
+        'formset': 'Save',
+    }
+    for index, row in enumerate(rows):
+        data.update({f'form-{index}-{field}': value for field, value in row.items()})
+    return data
+
+
+def _assert_statistics_consistent():
+    stored = {
+        (row.dimension, row.key, row.year, row.month, counter): getattr(row, counter)
+        for row in ReadingStatistic.objects.all()
+        for counter in ('started', 'finished')
+        if getattr(row, counter)
+    }
+    assert stored == dict(reading_logs_cells(ReadingLog.objects.all()))
+
+
+@pytest.mark.django_db
+class TestBulkNew:
+
+    def test_formset_creates_reading_logs(self, client, editions):
+        before = model_version(ReadingLog)
+        response = client.post(reverse('reading_log_bulk_new'), _formset_data([
+            {'book_edition': editions[0].pk, 'year_start': 2020, 'month_start': 3, 'year_finish': 2020},
+            {'book_edition': editions[1].pk, 'year_start': 2021},
+        ]))
+
+        assert response.status_code == 302
+        assert ReadingLog.objects.count() == 2
+        assert set(ReadingLog.objects.values_list('start_key', 'finish_key')) == {(202003, 202013), (202100, None)}
+        assert model_version(ReadingLog) != before
+        _assert_statistics_consistent()
+
+    def test_formset_uses_reading_log_form_rules(self, client, editions):
+        response = client.post(reverse('reading_log_bulk_new'), _formset_data([
+            {'book_edition': editions[0].pk, 'year_start': 2021, 'year_finish': 2020},
+        ]))
+
+        assert response.status_code == 200
+        assert 'Год окончания' in str(response.context['formset'].errors)
+        assert not ReadingLog.objects.exists()
+
+    def test_csv_upload(self, client, editions):
+        content = (
+            'book_edition,year_start,month_start,year_finish,month_finish\n'
+            f'{editions[0].pk},2019,11,2020,2\n'
+            f'{editions[1].pk},2020,,,\n'
+        )
+
+        response = client.post(reverse('reading_log_bulk_new'), {'csv': 'Upload', 'file': _csv(content)})
+
+        assert response.status_code == 302
+        assert list(ReadingLog.objects.order_by('start_key').values_list('year_start', 'month_start', 'month_finish')) == [
+            (2019, 11, 2), (2020, None, None),
+        ]
+        _assert_statistics_consistent()
+
+    def test_csv_errors_are_reported_by_line(self, client, editions):
+        content = (
+            'book_edition,year_start,month_start,year_finish,month_finish\n'
+            f'{editions[0].pk},2020,6,2020,3\n'
+            '999999,2020,,,\n'
+            f'{editions[0].pk},2020,13,,\n'
+        )
+
+        response = client.post(reverse('reading_log_bulk_new'), {'csv': 'Upload', 'file': _csv(content)})
+
+        errors = response.context['form'].errors['file']
+        assert any(error.startswith('Строка 2: Месяц окончания') for error in errors)
+        assert any(error.startswith('Строка 3: издание 999999') for error in errors)
+        assert any(error.startswith('Строка 4:') for error in errors)
+        assert not ReadingLog.objects.exists()
+
+    def test_csv_validation_does_not_query_per_row(self, client, editions):
+        rows = ''.join(f'{editions[i % 2].pk},2020,{1 + i % 12},,\n' for i in range(50))
+
+        with CaptureQueriesContext(connection) as captured:
+            client.post(reverse('reading_log_bulk_new'), {
+                'csv': 'Upload', 'file': _csv('book_edition,year_start,month_start,year_finish,month_finish\n' + rows),
+            })
+
+        assert ReadingLog.objects.count() == 50
+        assert len(captured.captured_queries) < 50
+
+
+@pytest.mark.django_db
+class TestBulkFinish:
+
+    def _open_logs(self, editions):
+        return [
+            ReadingLog.objects.create(book_edition=edition, year_start=2020, month_start=month)
+            for edition, month in zip(editions, (3, 5))
+        ]
+
+    def test_sets_finish_with_single_update(self, client, editions):
+        logs = self._open_logs(editions)
+        untouched = ReadingLog.objects.create(book_edition=editions[0], year_start=2021)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(reverse('reading_log_bulk_finish'), {
+                'reading_logs': [log.pk for log in logs], 'year_finish': 2020, 'month_finish': 12,
+                'next': reverse('reading_log_list') + '?page=1',
+            })
+
+        assert response.status_code == 302
+        assert response.url == reverse('reading_log_list') + '?page=1'
+        updates = [q for q in captured.captured_queries if q['sql'].startswith('UPDATE "core_readinglog"')]
+        assert len(updates) == 1
+        assert set(ReadingLog.objects.filter(pk__in=[log.pk for log in logs]).values_list(
+            'year_finish', 'month_finish', 'finish_key',
+        )) == {(2020, 12, 202012)}
+        untouched.refresh_from_db()
+        assert untouched.year_finish is None
+        _assert_statistics_consistent()
+
+    def test_finish_before_start_is_rejected(self, client, editions):
+        logs = self._open_logs(editions)
+
+        client.post(reverse('reading_log_bulk_finish'), {
+            'reading_logs': [log.pk for log in logs], 'year_finish': 2020, 'month_finish': 4,
+        })
+
+        assert not ReadingLog.objects.filter(year_finish__isnull=False).exists()
+
+    def test_list_renders_selection(self, client, editions):
+        self._open_logs(editions)
+
+        content = client.get(reverse('reading_log_list')).content.decode()
+
+        assert 'form="bulk-finish-form"' in content
+        assert reverse('reading_log_bulk_finish') in content
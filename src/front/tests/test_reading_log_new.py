@@ -0,0 +1,79 @@
+"""
+Тесты страницы добавления записи журнала чтения (ReadingLogNewView).
+
+Проверяют, что:
+- издание выбирается через autocomplete, страница не выводит весь каталог
+- число запросов и размер страницы не зависят от числа изданий
+- при сохранении загружается только отправленное издание
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Book, BookEdition, Publisher, ReadingLog
+
+
+def _add_editions(count):
+    publisher, _ = Publisher.objects.get_or_create(name='Мир')
+    start = BookEdition.objects.count()
+    return [
+        BookEdition.objects.create(book=Book.objects.create(title=f'Книга {start + i}'), publisher=publisher)
+        for i in range(count)
+    ]
+
+
+def _get(client, **params):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(reverse('reading_log_new'), params)
+    assert response.status_code == 200
+    return len(captured.captured_queries), len(response.content)
+
+
+@pytest.mark.django_db
+class TestReadingLogNewView:
+
+    def test_page_cost_does_not_depend_on_catalogue(self, client):
+        edition = _add_editions(2)[0]
+        small = _get(client, book_edition=edition.pk)
+
+        _add_editions(30)
+        large = _get(client, book_edition=edition.pk)
+
+        assert small == large
+
+    def test_autocomplete_widget_with_selected_edition_only(self, client):
+        editions = _add_editions(3)
+
+        content = client.get(reverse('reading_log_new'), {'book_edition': editions[1].pk}).content.decode()
+
+        assert reverse('book_edition_autocomplete') in content
+        assert str(editions[1]) in content
+        assert str(editions[0]) not in content
+
+    def test_save_fetches_only_submitted_edition(self, client):
+        editions = _add_editions(5)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(reverse('reading_log_new'), {
+                'book_edition': editions[2].pk, 'year_start': 2020, 'month_start': 3,
+            })
+
+        assert response.status_code == 302
+        assert ReadingLog.objects.get().book_edition == editions[2]
+        edition_selects = [
+            q['sql'] for q in captured.captured_queries
+            if q['sql'].startswith('SELECT') and 'FROM "core_bookedition"' in q['sql']
+        ]
+        assert edition_selects
+        assert all('WHERE' in sql for sql in edition_selects)
+
+    def test_period_rules_apply(self, client):
+        edition = _add_editions(1)[0]
+
+        response = client.post(reverse('reading_log_new'), {
+            'book_edition': edition.pk, 'year_start': 2021, 'year_finish': 2020,
+        })
+
+        assert response.status_code == 200
+        assert 'Год окончания' in str(response.context['form'].errors)
@@ -0,0 +1,113 @@
+"""
+Тесты ключей периода чтения ReadingLog (start_key, finish_key).
+
+Проверяют, что:
+- ключи вычисляются при сохранении, отсутствующий месяц не ломает сравнение
+- фильтры по году и месяцу и year_reading_logs() сравнивают ключи периода
+- форма журнала чтения проверяет порядок дат по ключам
+"""
+import pytest
+
+from core.filters import ReadingLogFilter
+from core.models import Book, BookEdition, ReadingLog
+from core.models import period_finish_key, period_start_key, year_reading_logs
+from front.forms.reading_log import ReadingLogForm
+
+
+@pytest.fixture
+def edition(db):
+    return BookEdition.objects.create(book=Book.objects.create(title='Река'))
+
+
+def _filtered(data):
+    return set(ReadingLogFilter(data=data, queryset=ReadingLog.objects.all()).qs)
+
+
+class TestPeriodKeyFunctions:
+
+    def test_keys_with_month(self):
+        assert period_start_key(2020, 3) == 202003
+        assert period_finish_key(2020, 3) == 202003
+
+    def test_missing_month_covers_whole_year(self):
+        assert period_start_key(2020, None) < period_start_key(2020, 1)
+        assert period_finish_key(2020, None) > period_finish_key(2020, 12)
+        assert period_finish_key(2020, None) < period_start_key(2021, None)
+
+    def test_missing_year(self):
+        assert period_start_key(None, 3) is None
+        assert period_finish_key(None, None) is None
+
+
+@pytest.mark.django_db
+class TestReadingLogPeriodKeys:
+
+    def test_keys_are_maintained_on_save(self, edition, make_reading_log):
+        log = make_reading_log(edition, (2020, 3), (None, None))
+        assert (log.start_key, log.finish_key) == (202003, None)
+
+        log.year_finish = 2021
+        log.month_finish = None
+        log.save()
+
+        log.refresh_from_db()
+        assert (log.start_key, log.finish_key) == (202003, 202113)
+
+    def test_year_filters(self, edition, make_reading_log):
+        log_2020 = make_reading_log(edition, (2020, 3), (2020, 6))
+        log_2021 = make_reading_log(edition, (2021, None), (2021, None))
+
+        assert _filtered({'year_from': 2021}) == {log_2021}
+        assert _filtered({'year_to': 2020}) == {log_2020}
+        assert _filtered({'year_from': 2020, 'year_to': 2021}) == {log_2020, log_2021}
+
+    def test_combined_year_and_month_filters(self, edition, make_reading_log):
+        early = make_reading_log(edition, (2020, 2), (2020, 4))
+        late = make_reading_log(edition, (2020, 9), (2021, 1))
+        next_year = make_reading_log(edition, (2021, 1), (2021, 3))
+
+        assert _filtered({'year_from': 2020, 'month_from': 5}) == {late, next_year}
+        assert _filtered({'year_to': 2021, 'month_to': 1}) == {early, late}
+
+    def test_month_filters_without_year(self, edition, make_reading_log):
+        march = make_reading_log(edition, (2019, 3), (2019, 5))
+        make_reading_log(edition, (2020, 1), (2020, 12))
+
+        assert _filtered({'month_from': 2, 'month_to': 6}) == {march}
+
+    def test_year_reading_logs_use_keys(self, edition, make_reading_log):
+        started = make_reading_log(edition, (2020, 11), (2021, 2))
+        finished = make_reading_log(edition, (2019, None), (2020, None))
+        make_reading_log(edition, (2021, 5), (2021, 6))
+
+        queryset = year_reading_logs(2020)
+
+        assert set(queryset) == {started, finished}
+        sql = str(queryset.query)
+        assert 'start_key' in sql and 'finish_key' in sql
+
+
+@pytest.mark.django_db
+class TestReadingLogFormPeriodValidation:
+
+    def _form(self, start, finish):
+        return ReadingLogForm(data={
+            'year_start': start[0],
+            'month_start': start[1] or '',
+            'year_finish': finish[0],
+            'month_finish': finish[1] or '',
+        })
+
+    def test_finish_before_start_month(self):
+        form = self._form((2020, 6), (2020, 3))
+        assert not form.is_valid()
+        assert 'Месяц окончания' in str(form.errors)
+
+    def test_finish_before_start_year(self):
+        form = self._form((2021, None), (2020, 12))
+        assert not form.is_valid()
+        assert 'Год окончания' in str(form.errors)
+
+    def test_missing_months_in_same_year_are_valid(self):
+        assert self._form((2020, 6), (2020, None)).is_valid()
+        assert self._form((2020, None), (2020, 1)).is_valid()
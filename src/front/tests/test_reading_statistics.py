@@ -0,0 +1,199 @@
+"""
+Тесты статистики чтения (core.statistics, ReadingStatisticsView).
+
+Проверяют, что:
+- сводка, обновляемая сигналами при создании, изменении и удалении записи журнала,
+  при изменении издательства, типа или книги издания и авторов книги,
+  совпадает с полным пересчётом
+- страница статистики читает сводку постоянным числом запросов
+- команда rebuild_reading_statistics пересчитывает сводку
+"""
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Author, Book, BookEdition, Publisher, ReadingLog, ReadingStatistic
+from core.statistics import get_reading_statistics, rebuild_reading_statistics
+
+
+def _summary():
+    return sorted(
+        ReadingStatistic.objects.filter(started__gt=0).values_list(
+            'dimension', 'key', 'year', 'month', 'started',
+        )
+    ) + sorted(
+        ReadingStatistic.objects.filter(finished__gt=0).values_list(
+            'dimension', 'key', 'year', 'month', 'finished',
+        )
+    )
+
+
+def _rebuilt_summary():
+    incremental = _summary()
+    rebuild_reading_statistics()
+    return incremental, _summary()
+
+
+@pytest.fixture
+def editions(db):
+    authors = [
+        Author.objects.create(first_name='Иван', last_name='Петров'),
+        Author.objects.create(first_name='Анна', last_name='Смирнова'),
+    ]
+    book = Book.objects.create(title='Река')
+    book.authors.add(*authors)
+    other_book = Book.objects.create(title='Море')
+    other_book.authors.add(authors[1])
+    publisher = Publisher.objects.create(name='Мир')
+    return [
+        BookEdition.objects.create(book=book, publisher=publisher, edition_type='PAPER_BOOK'),
+        BookEdition.objects.create(book=other_book, edition_type='EBOOK'),
+    ]
+
+
+@pytest.mark.django_db
+class TestIncrementalStatistics:
+
+    def test_create(self, editions):
+        ReadingLog.objects.create(
+            book_edition=editions[0], year_start=2020, month_start=3,
+            year_finish=2020, month_finish=5,
+        )
+        ReadingLog.objects.create(book_edition=editions[1], year_start=2021)
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+        assert ReadingStatistic.objects.get(
+            dimension=ReadingStatistic.DIMENSION_TOTAL, year=2020, month=5,
+        ).finished == 1
+
+    def test_update(self, editions):
+        log = ReadingLog.objects.create(
+            book_edition=editions[0], year_start=2020, month_start=3,
+        )
+        log.book_edition = editions[1]
+        log.year_finish = 2021
+        log.save()
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+
+    def test_delete(self, editions):
+        ReadingLog.objects.create(
+            book_edition=editions[0], year_start=2020, year_finish=2020,
+        )
+        ReadingLog.objects.create(
+            book_edition=editions[1], year_start=2020, year_finish=2021,
+        ).delete()
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+        assert not ReadingStatistic.objects.filter(year=2021, finished__gt=0).exists()
+
+    @pytest.fixture
+    def logs(self, editions):
+        for edition in editions:
+            ReadingLog.objects.create(
+                book_edition=edition, year_start=2020, month_start=3,
+                year_finish=2021, month_finish=1,
+            )
+
+    def test_edition_publisher_change(self, editions, logs):
+        editions[0].publisher = Publisher.objects.create(name='Наука')
+        editions[0].save()
+        editions[1].publisher = editions[0].publisher
+        editions[1].save()
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+
+    def test_edition_type_change(self, editions, logs):
+        editions[0].edition_type = 'EBOOK'
+        editions[0].save()
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+
+    def test_edition_book_change(self, editions, logs):
+        editions[1].book = editions[0].book
+        editions[1].save()
+
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+
+    def test_book_authors_change(self, editions, logs):
+        book = editions[0].book
+        author = Author.objects.create(first_name='Олег', last_name='Орлов')
+        book.authors.remove(book.authors.first())
+        book.authors.add(author)
+        assert _summary() == _rebuilt_summary()[1]
+
+        author.books.add(editions[1].book)
+        author.books.remove(book)
+        assert _summary() == _rebuilt_summary()[1]
+
+        author.books.clear()
+        book.authors.clear()
+        incremental, rebuilt = _rebuilt_summary()
+        assert incremental == rebuilt
+
+    def test_reading_statistics_sections(self, editions):
+        for edition in editions:
+            ReadingLog.objects.create(
+                book_edition=edition, year_start=2020, year_finish=2021, month_finish=1,
+            )
+
+        statistics = get_reading_statistics(year=2021)
+
+        assert [(row['year'], row['finished']) for row in statistics['by_year']] == [(2020, 0), (2021, 2)]
+        assert [(row['label'], row['finished']) for row in statistics['by_month']] == [('January', 2)]
+        assert {row['key'] for row in statistics['by_edition_type']} == {'PAPER_BOOK', 'EBOOK'}
+        assert [str(row['object']) for row in statistics['top_publishers']] == ['Мир']
+        assert statistics['top_authors'][0]['object'].last_name == 'Смирнова'
+        assert statistics['top_authors'][0]['finished'] == 2
+
+
+@pytest.mark.django_db
+class TestReadingStatisticsView:
+
+    def _query_count(self, client, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse('reading_statistics'), params)
+        assert response.status_code == 200
+        return len(captured.captured_queries)
+
+    def test_query_count_does_not_grow_with_data(self, client, editions):
+        ReadingLog.objects.create(book_edition=editions[0], year_start=2020, year_finish=2020)
+        small = self._query_count(client)
+
+        for month in range(1, 13):
+            for edition in editions:
+                ReadingLog.objects.create(
+                    book_edition=edition, year_start=2020, year_finish=2021, month_finish=month,
+                )
+
+        assert self._query_count(client) == small
+        assert self._query_count(client, year=2021) == small
+
+    def test_does_not_read_reading_log(self, client, editions):
+        ReadingLog.objects.create(book_edition=editions[0], year_start=2020, year_finish=2020)
+
+        with CaptureQueriesContext(connection) as captured:
+            client.get(reverse('reading_statistics'))
+
+        assert not [q for q in captured.captured_queries if 'core_readinglog' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestRebuildReadingStatisticsCommand:
+
+    def test_rebuilds_summary(self, editions):
+        ReadingLog.objects.create(book_edition=editions[0], year_start=2020, year_finish=2020)
+        expected = _summary()
+        ReadingStatistic.objects.all().delete()
+
+        call_command('rebuild_reading_statistics', verbosity=0)
+
+        assert _summary() == expected
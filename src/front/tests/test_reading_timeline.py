@@ -0,0 +1,125 @@
+"""
+Тесты шкалы чтения (core.timeline, ReadingTimelineView, ReadingTimelineJsonView).
+
+Проверяют, что:
+- начатые, законченные и продолжающиеся чтения считаются по месяцам, в том числе
+  для чтений без месяца и незаконченных
+- шкала строится одним запросом, кэшируется и пересчитывается после записи в журнал
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Book, BookEdition
+from core.timeline import build_reading_timeline, get_reading_timeline
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def edition(db):
+    return BookEdition.objects.create(book=Book.objects.create(title='Река'))
+
+
+def _column(timeline, year, counter):
+    row = next(item for item in timeline if item['year'] == year)
+    return [cell[counter] for cell in row['months']]
+
+
+@pytest.mark.django_db
+class TestBuildReadingTimeline:
+
+    def test_empty(self):
+        assert build_reading_timeline() == []
+
+    def test_started_finished_and_in_progress(self, edition, make_reading_log):
+        make_reading_log(edition, (2020, 3), (2020, 5))
+        make_reading_log(edition, (2020, 4), (2021, 2))
+
+        timeline = build_reading_timeline()
+
+        assert [row['year'] for row in timeline] == [2020, 2021]
+        assert _column(timeline, 2020, 'started') == [0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]
+        assert _column(timeline, 2020, 'finished') == [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+        assert _column(timeline, 2020, 'in_progress') == [0, 0, 1, 2, 2, 1, 1, 1, 1, 1, 1, 1]
+        assert _column(timeline, 2021, 'in_progress') == [1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+
+    def test_missing_months_and_open_reads(self, edition, make_reading_log):
+        make_reading_log(edition, (2019, None), (2019, None))
+        make_reading_log(edition, (2020, 11))
+
+        timeline = build_reading_timeline()
+
+        assert timeline[0]['unknown_month'] == {'started': 1, 'finished': 1}
+        assert _column(timeline, 2019, 'in_progress') == [1] * 12
+        assert _column(timeline, 2020, 'in_progress') == [0] * 10 + [1, 1]
+
+    def test_finish_only_read(self, edition, make_reading_log):
+        make_reading_log(edition, (2020, 3), (2020, 4))
+        make_reading_log(edition, (None, None), (2021, 6))
+        make_reading_log(edition, (None, None), (2021, None))
+
+        timeline = build_reading_timeline()
+
+        assert [row['year'] for row in timeline] == [2020, 2021]
+        assert _column(timeline, 2021, 'finished') == [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0]
+        assert timeline[1]['unknown_month'] == {'started': 0, 'finished': 1}
+        assert _column(timeline, 2021, 'in_progress') == [0] * 12
+        assert _column(timeline, 2020, 'in_progress') == [0, 0, 1, 1] + [0] * 8
+
+    def test_one_query(self, edition, make_reading_log):
+        for month in range(1, 13):
+            make_reading_log(edition, (2019, month), (2021, month))
+
+        with CaptureQueriesContext(connection) as captured:
+            build_reading_timeline()
+
+        assert len(captured.captured_queries) == 1
+
+
+@pytest.mark.django_db
+class TestReadingTimelineCache:
+
+    def test_cached_until_reading_log_write(self, edition, make_reading_log):
+        make_reading_log(edition, (2020, 1), (2020, 2))
+        get_reading_timeline()
+
+        with CaptureQueriesContext(connection) as captured:
+            get_reading_timeline()
+        assert captured.captured_queries == []
+
+        make_reading_log(edition, (2021, 1))
+        assert [row['year'] for row in get_reading_timeline()] == [2020, 2021]
+
+
+@pytest.mark.django_db
+class TestReadingTimelineViews:
+
+    def test_heatmap(self, client, edition, make_reading_log):
+        make_reading_log(edition, (2020, 3), (2020, 5))
+
+        response = client.get(reverse('reading_timeline'), {'metric': 'in_progress'})
+
+        assert response.status_code == 200
+        assert response.context['metric'] == 'in_progress'
+        row = response.context['timeline'][0]
+        assert [cell['value'] for cell in row['cells']][:6] == [0, 0, 1, 1, 1, 0]
+
+    def test_unknown_metric_falls_back(self, client, edition):
+        response = client.get(reverse('reading_timeline'), {'metric': 'pages'})
+
+        assert response.context['metric'] == 'finished'
+
+    def test_json(self, client, edition, make_reading_log):
+        make_reading_log(edition, (2020, 3), (2020, 5))
+
+        response = client.get(reverse('reading_timeline_json'))
+
+        assert response.json()['timeline'] == build_reading_timeline()
@@ -0,0 +1,143 @@
+"""
+Тесты кэша фрагментов строк списков (core.fragments).
+
+Проверяют, что:
+- страница списка собирается из закэшированных строк и рендерит только изменённые
+- запись объекта или связанного объекта, который показывает строка, обновляет строку
+- строки, не показывающие изменённый объект, остаются в кэше
+"""
+import pytest
+from django.core.cache import cache
+from django.test.signals import template_rendered
+from django.urls import reverse
+
+from core.bulk import bulk_set_finish
+from core.fragments import dependent_rows
+from core.models import Author, Book, BookEdition, BookSeries, Publisher, ReadingLog
+
+READING_LOG_ROW = 'reading_log/_reading_log_row.html'
+BOOK_EDITION_ROW = 'book_edition/_book_edition_row.html'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def library(db):
+    publisher = Publisher.objects.create(name='Мир')
+    series = BookSeries.objects.create(name='Классика', publisher=publisher)
+    tolstoy = Author.objects.create(last_name='Толстой', first_name='Лев')
+    chekhov = Author.objects.create(last_name='Чехов', first_name='Антон')
+    war = Book.objects.create(title='Война и мир')
+    war.authors.add(tolstoy)
+    steppe = Book.objects.create(title='Степь')
+    steppe.authors.add(chekhov)
+    war_edition = BookEdition.objects.create(book=war, publisher=publisher, series=series)
+    steppe_edition = BookEdition.objects.create(book=steppe)
+    return {
+        'publisher': publisher,
+        'tolstoy': tolstoy,
+        'chekhov': chekhov,
+        'war': war,
+        'war_edition': war_edition,
+        'steppe_edition': steppe_edition,
+        'war_log': ReadingLog.objects.create(book_edition=war_edition, year_start=2020),
+        'steppe_log': ReadingLog.objects.create(book_edition=steppe_edition, year_start=2021),
+    }
+
+
+@pytest.fixture
+def rendered_rows():
+    """Имена шаблонов, отрендеренных во время теста."""
+    names = []
+
+    def collect(sender, template, **kwargs):
+        names.append(template.name)
+
+    template_rendered.connect(collect)
+    yield names
+    template_rendered.disconnect(collect)
+
+
+def _get(client, name):
+    response = client.get(reverse(name))
+    assert response.status_code == 200
+    return response.content.decode()
+
+
+@pytest.mark.django_db
+class TestRowFragments:
+
+    def test_dependent_rows(self, library):
+        rows = set(dependent_rows(Author, [library['tolstoy'].pk]))
+
+        assert rows == {(Author, library['tolstoy'].pk), (ReadingLog, library['war_log'].pk)}
+
+    def test_cached_rows_are_not_rendered(self, client, library, rendered_rows):
+        _get(client, 'reading_log_list')
+        assert rendered_rows.count(READING_LOG_ROW) == 2
+
+        rendered_rows.clear()
+        _get(client, 'reading_log_list')
+
+        assert READING_LOG_ROW not in rendered_rows
+
+    def test_author_rename_updates_reading_log_rows(self, client, library, rendered_rows):
+        _get(client, 'reading_log_list')
+        rendered_rows.clear()
+
+        library['tolstoy'].last_name = 'Tolstoy'
+        library['tolstoy'].save()
+        content = _get(client, 'reading_log_list')
+
+        assert 'Tolstoy' in content
+        assert rendered_rows.count(READING_LOG_ROW) == 1
+
+    def test_publisher_rename_updates_rows(self, client, library):
+        _get(client, 'reading_log_list')
+        _get(client, 'book_edition')
+
+        library['publisher'].name = 'Наука'
+        library['publisher'].save()
+
+        link = f'href="{reverse("publisher_detail", kwargs={"pk": library["publisher"].pk})}">Наука</a>'
+        assert link in _get(client, 'reading_log_list')
+        assert link in _get(client, 'book_edition')
+
+    def test_related_writes_update_rows(self, client, library):
+        _get(client, 'reading_log_list')
+
+        library['war'].authors.add(library['chekhov'])
+        assert _get(client, 'reading_log_list').count('Чехов А.') == 2
+
+        library['war_edition'].publication_year = 1999
+        library['war_edition'].save()
+        assert '1999' in _get(client, 'reading_log_list')
+
+    def test_author_removal_updates_rows(self, client, library):
+        _get(client, 'reading_log_list')
+
+        library['chekhov'].books.clear()
+
+        assert 'Чехов' not in _get(client, 'reading_log_list')
+
+    def test_edition_rows_ignore_author_changes(self, client, library, rendered_rows):
+        _get(client, 'book_edition')
+        rendered_rows.clear()
+
+        library['tolstoy'].last_name = 'Tolstoy'
+        library['tolstoy'].save()
+        _get(client, 'book_edition')
+
+        assert BOOK_EDITION_ROW not in rendered_rows
+
+    def test_bulk_finish_updates_rows(self, client, library):
+        _get(client, 'reading_log_list')
+
+        bulk_set_finish(ReadingLog.objects.filter(pk=library['war_log'].pk), 2022, None)
+
+        assert '2022' in _get(client, 'reading_log_list')
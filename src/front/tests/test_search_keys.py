@@ -0,0 +1,165 @@
+"""
+Тесты транслитерированных ключей поиска (core.transliteration).
+
+Проверяют, что:
+- ключи кириллических и латинских написаний совпадают
+- ключи Author, Book и Publisher обновляются при сохранении и пересчитываются командой
+- фильтры списков и автокомплиты находят объекты по запросу в другом алфавите
+- на PostgreSQL фильтры по подстроке ключа используют триграммные GIN-индексы
+"""
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.filters import AuthorFilter, BookFilter, PublisherFilter
+from core.models import Author, Book, Publisher
+from core.transliteration import fold, search_key
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def library(db):
+    dostoevsky = Author.objects.create(last_name='Достоевский', first_name='Фёдор')
+    tolstoy = Author.objects.create(last_name='Tolstoy', first_name='Leo')
+    crime = Book.objects.create(title='Преступление и наказание', title_original='Crime and Punishment')
+    crime.authors.add(dostoevsky)
+    war = Book.objects.create(title='War and Peace')
+    war.authors.add(tolstoy)
+    return {
+        'dostoevsky': dostoevsky,
+        'tolstoy': tolstoy,
+        'crime': crime,
+        'war': war,
+        'azbuka': Publisher.objects.create(name='Азбука'),
+    }
+
+
+def _filtered(filter_class, model, **data):
+    return set(filter_class(data=data, queryset=model.objects.all()).qs)
+
+
+class TestSearchKey:
+
+    def test_scripts_share_keys(self):
+        assert fold('Толстой') == fold('Tolstoy') == 'tolstoy'
+        assert fold('Достоевский') == fold('Dostoevsky') == 'dostoevsky'
+        assert fold('Андрей Белый') == 'andrey bely'
+        assert fold('  Щедрин  Салтыков ') == 'shchedrin saltykov'
+
+    def test_values_are_joined(self):
+        assert search_key('Река', None, '', 'River') == 'reka\nriver'
+
+
+@pytest.mark.django_db
+class TestSearchKeyMaintenance:
+
+    def test_keys_are_set_on_save(self, library):
+        assert library['dostoevsky'].search_key == 'dostoevsky fedor'
+        assert library['crime'].search_key == 'prestuplenie i nakazanie\ncrime and punishment'
+        assert library['azbuka'].search_key == 'azbuka'
+
+        library['azbuka'].name = 'Мир'
+        library['azbuka'].save()
+        assert Publisher.objects.get().search_key == 'mir'
+
+    def test_command_backfills_keys(self, library):
+        Author.objects.update(search_key='')
+        Book.objects.filter(pk=library['war'].pk).update(search_key='')
+
+        call_command('rebuild_search_keys', verbosity=0)
+
+        assert Author.objects.get(pk=library['tolstoy'].pk).search_key == 'tolstoy leo'
+        assert Book.objects.get(pk=library['war'].pk).search_key == 'war and peace'
+
+    def test_command_saves_only_changed_keys(self, library):
+        with CaptureQueriesContext(connection) as captured:
+            call_command('rebuild_search_keys', verbosity=0)
+
+        assert not [q for q in captured.captured_queries if q['sql'].startswith('UPDATE')]
+
+    def test_generate_library_fills_keys(self, db):
+        call_command('generate_library', seed=0, verbosity=0, authors=5, publishers=2, series=2,
+                     books=5, editions=5, reading_logs=5, notes=5, keywords=2)
+
+        assert not Author.objects.filter(search_key='').exists()
+        assert not Book.objects.filter(search_key='').exists()
+
+
+@pytest.mark.django_db
+class TestFilters:
+
+    def test_author_filter(self, library):
+        assert _filtered(AuthorFilter, Author, full_name='Dostoevsky') == {library['dostoevsky']}
+        assert _filtered(AuthorFilter, Author, full_name='Толстой') == {library['tolstoy']}
+        assert _filtered(AuthorFilter, Author, full_name='leo') == {library['tolstoy']}
+
+    def test_book_filter(self, library):
+        assert _filtered(BookFilter, Book, title='punishment') == {library['crime']}
+        assert _filtered(BookFilter, Book, title='nakazanie') == {library['crime']}
+        assert _filtered(BookFilter, Book, author_name='Толстой') == {library['war']}
+
+    def test_publisher_filter(self, library):
+        assert _filtered(PublisherFilter, Publisher, name='azbu') == {library['azbuka']}
+
+    def test_filter_uses_key_column_only(self, library):
+        sql = str(AuthorFilter(data={'full_name': 'Лев'}, queryset=Author.objects.all()).qs.query)
+
+        assert 'search_key' in sql
+        assert 'first_name" LIKE' not in sql
+
+
+requires_postgresql = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='План запроса PostgreSQL',
+)
+
+# (FilterSet, модель, данные фильтра) -> индекс, который должен использовать запрос
+FILTER_INDEXES = [
+    (AuthorFilter, Author, {'full_name': 'Толстой'}, 'author_search_key_trgm_idx'),
+    (BookFilter, Book, {'title': 'punishment'}, 'book_search_key_trgm_idx'),
+    (BookFilter, Book, {'author_name': 'Толстой'}, 'author_search_key_trgm_idx'),
+    (PublisherFilter, Publisher, {'name': 'azbu'}, 'publisher_search_key_trgm_idx'),
+]
+
+
+@pytest.mark.django_db
+class TestFilterPlans:
+
+    @requires_postgresql
+    @pytest.mark.parametrize('filter_class, model, data, index', FILTER_INDEXES)
+    def test_substring_filter_uses_trigram_index(self, library, filter_class, model, data, index):
+        with connection.cursor() as cursor:
+            # На пустых тестовых таблицах планировщик иначе выберет полный просмотр
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = filter_class(data=data, queryset=model.objects.all()).qs.explain()
+
+        assert index in plan
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+
+    def _texts(self, client, name, q):
+        return [item['text'] for item in client.get(reverse(name), {'q': q}).json()['results']]
+
+    def test_autocomplete_matches_other_script(self, client, admin_user, library):
+        client.force_login(admin_user)
+
+        assert self._texts(client, 'author_autocomplete', 'Dostoevsky') == ['Достоевский Фёдор']
+        assert self._texts(client, 'author_autocomplete', 'Толст') == ['Tolstoy Leo']
+        assert self._texts(client, 'author_autocomplete', 'fedor') == ['Достоевский Фёдор']
+        assert self._texts(client, 'book_autocomplete', 'nakaz') == ['Преступление и наказание']
+        assert self._texts(client, 'publisher_autocomplete', 'azb') == ['Азбука']
+
+    def test_fuzzy_search_across_scripts(self, client, admin_user, library):
+        client.force_login(admin_user)
+
+        assert self._texts(client, 'author_autocomplete', 'Dostoyevsky') == ['Достоевский Фёдор']
@@ -0,0 +1,82 @@
+"""
+Тесты режима шаблонов production (private_library.template_warmup).
+
+Проверяют, что:
+- warmup_templates() компилирует все шаблоны каталога templates
+- после прогрева страницы рендерятся без чтения шаблонов с диска
+- в режиме debug прогрев не выполняется
+"""
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.template import engines
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+from django.test import override_settings
+from django.urls import reverse
+
+from private_library.template_warmup import (
+    production_templates, template_names, warmup_if_production, warmup_templates,
+)
+
+TEMPLATES_DIR = settings.BASE_DIR / 'templates'
+original_get_contents = FilesystemLoader.get_contents
+
+PRODUCTION_TEMPLATES = production_templates(settings.TEMPLATES)
+
+
+def _read_project_template(loader, origin):
+    # Шаблоны приложений (django_bootstrap5) не прогреваются и читаются при первом использовании
+    path = Path(origin.name)
+    assert not (path.is_file() and path.is_relative_to(TEMPLATES_DIR)), f'{origin.template_name} read from disk'
+    return original_get_contents(loader, origin)
+
+
+@pytest.fixture
+def production_templates():
+    with override_settings(TEMPLATES=PRODUCTION_TEMPLATES, TEMPLATE_MODE='production'):
+        yield engines['django'].engine
+
+
+class TestTemplateWarmup:
+
+    def test_production_templates(self):
+        options = PRODUCTION_TEMPLATES[0]['OPTIONS']
+
+        assert options['debug'] is False
+        assert options['loaders'] == [(
+            'django.template.loaders.cached.Loader', settings.TEMPLATES[0]['OPTIONS']['loaders'],
+        )]
+        assert options['context_processors'] == settings.TEMPLATES[0]['OPTIONS']['context_processors']
+
+    def test_template_names(self):
+        names = template_names(TEMPLATES_DIR)
+
+        assert 'base_layout.html' in names
+        assert 'notes/_note_tree.html' in names
+        assert names == sorted(names)
+
+    def test_all_templates_are_compiled(self, production_templates):
+        names = template_names(TEMPLATES_DIR)
+
+        assert warmup_templates() == len(names)
+        cached = production_templates.template_loaders[0].get_template_cache
+        assert set(names) <= set(cached)
+
+    @pytest.mark.django_db
+    def test_pages_render_without_reading_templates(self, client, production_templates, notes_hierarchy):
+        warmup_if_production()
+
+        with mock.patch.object(FilesystemLoader, 'get_contents', autospec=True, side_effect=_read_project_template):
+            response = client.get(reverse('note'))
+
+        assert response.status_code == 200
+        assert notes_hierarchy['note1_1_1'].topic in response.content.decode()
+
+    def test_debug_mode_is_not_warmed(self):
+        with mock.patch('private_library.template_warmup.warmup_templates') as warmup:
+            warmup_if_production()
+
+        assert settings.TEMPLATE_MODE == 'debug'
+        warmup.assert_not_called()
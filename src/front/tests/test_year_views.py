@@ -0,0 +1,64 @@
+"""
+Тесты страниц годов (YearListView, YearDetailView).
+
+Проверяют, что:
+- список годов строится по годам начала и окончания записей журнала без таблицы годов
+- страница года открывается для года с чтениями и возвращает 404 для остальных
+- ссылки на год в периоде записи журнала не требуют запросов
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Book, BookEdition, ReadingLog, reading_log_years
+
+
+@pytest.fixture
+def edition(db):
+    return BookEdition.objects.create(book=Book.objects.create(title='Река'))
+
+
+@pytest.mark.django_db
+class TestYearViews:
+
+    def test_years_are_distinct_start_and_finish_years(self, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2019, year_finish=2021)
+        ReadingLog.objects.create(book_edition=edition, year_start=2019, year_finish=2019)
+        ReadingLog.objects.create(book_edition=edition)
+
+        assert list(reading_log_years()) == [2021, 2019]
+
+    def test_year_list(self, client, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2019, year_finish=2021)
+
+        response = client.get(reverse('year'))
+
+        assert list(response.context['page_obj']) == [2021, 2019]
+        assert reverse('year_detail', kwargs={'pk': 2021}) in response.content.decode()
+
+    def test_year_detail(self, client, edition):
+        log = ReadingLog.objects.create(book_edition=edition, year_start=2019, year_finish=2021)
+
+        response = client.get(reverse('year_detail', kwargs={'pk': 2021}))
+
+        assert response.status_code == 200
+        assert list(response.context['reading_logs']) == [log]
+        assert response.context['object_list'] == [2021, 2019]
+
+    def test_year_without_reading_logs(self, client, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2019, year_finish=2021)
+
+        response = client.get(reverse('year_detail', kwargs={'pk': 2020}))
+
+        assert response.status_code == 404
+
+    def test_period_links_need_no_queries(self, edition):
+        ReadingLog.objects.create(book_edition=edition, year_start=2019, month_start=5, year_finish=2021)
+        log = ReadingLog.objects.get()
+
+        with CaptureQueriesContext(connection) as captured:
+            period = log.period_for_template
+
+        assert captured.captured_queries == []
+        assert reverse('year_detail', kwargs={'pk': 2019}) in period
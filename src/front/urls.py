@@ -8,6 +8,7 @@ from front.views import index
 from front.views import notes
 from front.views import publisher
 from front.views import reading_log
+from front.views import statistics
 from front.views import year
 
 urlpatterns = [
@@ -49,16 +50,21 @@ urlpatterns = [
     path('publisher/autocomplete/', publisher.PublisherAutocompleteView.as_view(), name='publisher_autocomplete'),
 
     path('year/', year.YearListView.as_view(), name='year'),
-    path('year/new/', year.YearNewView.as_view(), name='year_new'),
     path('year/<int:pk>/', year.YearDetailView.as_view(), name='year_detail'),
-    path('year/<int:pk>/delete/', year.YearDeleteView.as_view(), name='year_delete'),
-    path('year/<int:pk>/update/', year.YearUpdateView.as_view(), name='year_update'),
 
     path('reading-log/new/', reading_log.ReadingLogNewView.as_view(), name='reading_log_new'),
+    path('reading-log/bulk-new/', reading_log.ReadingLogBulkNewView.as_view(), name='reading_log_bulk_new'),
+    path('reading-log/bulk-finish/', reading_log.ReadingLogBulkFinishView.as_view(), name='reading_log_bulk_finish'),
     path('reading-log/', reading_log.ReadingLogListView.as_view(), name='reading_log_list'),
     path('reading-log/<int:pk>/', reading_log.ReadingLogDetailView.as_view(), name='readinglog_detail'),
     path('reading-log/<int:pk>/update/', reading_log.ReadingLogUpdateView.as_view(), name='readinglog_update'),
 
+    path('statistics/', statistics.ReadingStatisticsView.as_view(), name='reading_statistics'),
+    path('statistics/timeline/', statistics.ReadingTimelineView.as_view(), name='reading_timeline'),
+    path('statistics/timeline.json', statistics.ReadingTimelineJsonView.as_view(), name='reading_timeline_json'),
+    path('statistics/analytics/', statistics.ReadingAnalyticsView.as_view(), name='reading_analytics'),
+    path('statistics/analytics.json', statistics.ReadingAnalyticsJsonView.as_view(), name='reading_analytics_json'),
+
     # Note URLs
     path('note/', notes.NoteListView.as_view(), name='note'),
     path('note/new/', notes.NoteNewView.as_view(), name='note_new'),
@@ -1,4 +1,3 @@
-from django.db.models import Q
 from django.urls import reverse_lazy
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView
@@ -9,14 +8,23 @@ from django_filters.views import FilterView
 
 from core.models import Author
 from core.filters import AuthorFilter
+from core.prefix_index import PrefixIndex
+from .mixins import CachedCountMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 
-class AuthorListView(PaginationPageSizeMixin, FilterView):
+class AuthorListView(PartialResultsMixin, RowFragmentCacheMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'author/author_list.html'
+    results_template_name = 'author/_author_results.html'
     model = Author
     filterset_class = AuthorFilter
     ordering = 'last_name'
+    row_template = 'author/_author_row.html'
+    row_context_name = 'author'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -34,9 +42,10 @@ class AuthorNewView(CreateView):
     )
 
 
-class AuthorDetailView(DetailView):
+class AuthorDetailView(QueryPlanMixin, DetailView):
     template_name = 'author/author_detail.html'
     model = Author
+    prefetch_related = ('books',)
     fields = (
         'first_name',
         'last_name',
@@ -61,13 +70,7 @@ class AuthorDeleteView(DeleteView):
     fields = ()
 
 
-class AuthorAutocompleteView(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        qs = Author.objects.all()
-        if self.q:
-            qs = qs.filter(
-                Q(first_name__istartswith=self.q) |
-                Q(last_name__istartswith=self.q) |
-                Q(middle_name__istartswith=self.q)
-            )
-        return qs
+class AuthorAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
+    prefix_index = PrefixIndex(
+        Author, ('first_name', 'last_name', 'middle_name'), fuzzy=True, key_field='search_key',
+    )
@@ -1,5 +1,5 @@
 from dal import autocomplete
-from django.db.models import Q
+from django.db.models import Prefetch
 from django.urls import reverse_lazy
 from django.views.generic import DetailView
 from django.views.generic.edit import CreateView
@@ -8,16 +8,28 @@ from django.views.generic.edit import UpdateView
 from django_filters.views import FilterView
 
 from front.forms.book import BookForm
+from core.models import Author
 from core.models import Book
+from core.models import BookEdition
 from core.filters import BookFilter
+from core.prefix_index import PrefixIndex
+from .mixins import CachedCountMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 
-class BookListView(PaginationPageSizeMixin, FilterView):
+class BookListView(PartialResultsMixin, RowFragmentCacheMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'book/book_list.html'
+    results_template_name = 'book/_book_results.html'
     model = Book
     filterset_class = BookFilter
+    count_cache_models = (Author,)
     ordering = 'title'
+    row_template = 'book/_book_row.html'
+    row_context_name = 'book'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -31,9 +43,16 @@ class BookNewView(CreateView):
     form_class = BookForm
 
 
-class BookDetailView(DetailView):
+class BookDetailView(QueryPlanMixin, DetailView):
     template_name = 'book/book_detail.html'
     model = Book
+    prefetch_related = (
+        'authors',
+        Prefetch(
+            'editions',
+            queryset=BookEdition.objects.select_related('book', 'publisher', 'series'),
+        ),
+    )
     fields = (
         'title',
         'extended_title',
@@ -58,14 +77,8 @@ class BookDeleteView(DeleteView):
     fields = ()
 
 
-class BookAutocompleteView(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        qs = Book.objects.all()
-        if self.q:
-            qs = qs.filter(
-                Q(title__istartswith=self.q) |
-                Q(extended_title__istartswith=self.q) |
-                Q(title_original__istartswith=self.q) |
-                Q(extended_title_original__istartswith=self.q)
-            )
-        return qs
+class BookAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
+    prefix_index = PrefixIndex(
+        Book, ('title', 'extended_title', 'title_original', 'extended_title_original'),
+        fuzzy=True, key_field='search_key',
+    )
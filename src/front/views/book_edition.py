@@ -1,5 +1,4 @@
 from dal import autocomplete
-from django.db.models import Q
 from django.urls import reverse_lazy
 from django.views.generic import DetailView
 from django.views.generic.edit import CreateView
@@ -7,18 +6,31 @@ from django.views.generic.edit import DeleteView
 from django.views.generic.edit import UpdateView
 from django_filters.views import FilterView
 
-from core.models import BookEdition, Note
+from core.models import Author, Book, BookEdition, BookSeries, Note, Publisher
 from core.filters import BookEditionFilter
+from core.note_tree import flatten_note_tree
+from core.prefix_index import PrefixIndex
 from front.forms.book_edition import BookEditionNewForm
 from front.forms.book_edition import BookEditionUpdateForm
+from .mixins import CachedCountMixin
+from .mixins import FacetCountsMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 
-class BookEditionListView(PaginationPageSizeMixin, FilterView):
+class BookEditionListView(PartialResultsMixin, RowFragmentCacheMixin, FacetCountsMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'book_edition/book_edition_list.html'
+    results_template_name = 'book_edition/_book_edition_results.html'
     model = BookEdition
     filterset_class = BookEditionFilter
-    ordering = 'book__title'
+    count_cache_models = (Book, Author, Publisher, BookSeries)
+    ordering = ('book_title', 'id')
+    row_template = 'book_edition/_book_edition_row.html'
+    row_context_name = 'book_edition'
+    row_select_related = ('book', 'publisher', 'series')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -32,16 +44,21 @@ class BookEditionNewView(CreateView):
     form_class = BookEditionNewForm
 
 
-class BookEditionDetailView(DetailView):
+class BookEditionDetailView(QueryPlanMixin, DetailView):
     template_name = 'book_edition/book_edition_detail.html'
     model = BookEdition
+    select_related = ('book', 'publisher', 'series__publisher')
+    prefetch_related = (
+        'book__authors',
+        'reading_logs',
+    )
 
     def get_context_data(self, **kwargs):
         """
         Добавляет связанные заметки в контекст шаблона.
 
-        Возвращает queryset заметок, связанных с данным book_edition,
-        с оптимизированной загрузкой parent и children для иерархического отображения.
+        note_tree - плоский список узлов деревьев заметок, связанных с данным
+        book_edition (core.note_tree.flatten_note_tree), для рендеринга одним циклом.
         """
         context = super().get_context_data(**kwargs)
         root_ids = Note.objects.filter(
@@ -49,19 +66,16 @@ class BookEditionDetailView(DetailView):
             parent__isnull=True,
         ).values_list('id', 'root')
         root_ids = [item[0] if item[1] is None else item[1] for item in root_ids]
-        context['notes'] = Note.objects.filter(
-            id__in=root_ids,
-        ).select_related(
-            'parent', 'root',
-        ).prefetch_related(
-            'children',
-        ).order_by('index', 'id')
+        context['note_tree'] = flatten_note_tree(
+            Note.objects.filter(id__in=root_ids).order_by('index', 'id')
+        )
         return context
 
 
-class BookEditionUpdateView(UpdateView):
+class BookEditionUpdateView(QueryPlanMixin, UpdateView):
     template_name = 'book_edition/book_edition_update.html'
     model = BookEdition
+    select_related = ('book', 'publisher', 'series__publisher')
     form_class = BookEditionUpdateForm
 
 
@@ -72,25 +86,14 @@ class BookEditionDeleteView(DeleteView):
     fields = ()
 
 
-class BookEditionAutocompleteView(autocomplete.Select2QuerySetView):
+class BookEditionAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
     """
     Autocomplete view для модели BookEdition.
 
-    Поиск осуществляется по полям:
-    - book__title (название книги)
-    - publisher__name (название издательства)
+    Поиск осуществляется по копиям полей (без соединения с книгой и издательством):
+    - book_title (название книги)
+    - publisher_name (название издательства)
     """
-
-    def get_queryset(self):
-        """
-        Возвращает отфильтрованный queryset book_editions.
-
-        Если есть поисковый запрос (self.q), фильтрует по title книги или publisher.
-        """
-        qs = BookEdition.objects.select_related('book', 'publisher').all()
-        if self.q:
-            qs = qs.filter(
-                Q(book__title__istartswith=self.q) |
-                Q(publisher__name__istartswith=self.q)
-            )
-        return qs
+    prefix_index = PrefixIndex(
+        BookEdition, ('book_title', 'publisher_name'), label_fields=('publication_year',),
+    )
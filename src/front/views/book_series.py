@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Prefetch
 from django.urls import reverse_lazy
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView
@@ -7,16 +7,28 @@ from django.views.generic.edit import UpdateView
 from django_filters.views import FilterView
 from dal import autocomplete
 
+from core.models import BookEdition
 from core.models import BookSeries
+from core.models import Publisher
 from core.filters import BookSeriesFilter
+from core.prefix_index import PrefixIndex
+from .mixins import CachedCountMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 
-class BookSeriesListView(PaginationPageSizeMixin, FilterView):
+class BookSeriesListView(PartialResultsMixin, RowFragmentCacheMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'book_series/book_series_list.html'
+    results_template_name = 'book_series/_book_series_results.html'
     model = BookSeries
     filterset_class = BookSeriesFilter
-    ordering = ('publisher__name', 'name')
+    count_cache_models = (Publisher,)
+    ordering = ('publisher_name', 'name')
+    row_template = 'book_series/_book_series_row.html'
+    row_context_name = 'book_series'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -33,9 +45,16 @@ class BookSeriesNewView(CreateView):
     )
 
 
-class BookSeriesDetailView(DetailView):
+class BookSeriesDetailView(QueryPlanMixin, DetailView):
     template_name = 'book_series/book_series_detail.html'
     model = BookSeries
+    select_related = ('publisher',)
+    prefetch_related = (
+        Prefetch(
+            'book_editions',
+            queryset=BookEdition.objects.select_related('book', 'publisher'),
+        ),
+    )
     fields = (
         'name',
         'publisher',
@@ -58,12 +77,5 @@ class BookSeriesDeleteView(DeleteView):
     fields = ()
 
 
-class BookSeriesAutocompleteView(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        qs = BookSeries.objects.all()
-        if self.q:
-            qs = qs.filter(
-                Q(name__istartswith=self.q) |
-                Q(publisher__name__istartswith=self.q),
-            )
-        return qs
+class BookSeriesAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
+    prefix_index = PrefixIndex(BookSeries, ('name', 'publisher_name'), fuzzy=True)
@@ -1,16 +1,33 @@
 from django.views.generic import TemplateView
 
-from core.models import ReadingLog
+from core.cache import model_versions
+from core.models import READING_LOG_ORDERING
+from core.models import Author, Book, BookEdition, BookSeries, Publisher, ReadingLog
+from .reading_log import READING_LOG_ROW_PREFETCH_RELATED
+from .reading_log import READING_LOG_ROW_SELECT_RELATED
+
+
+# Модели, данные которых выводит блок последних чтений
+LAST_READING_LOGS_MODELS = (ReadingLog, BookEdition, Book, Author, Publisher, BookSeries)
 
 
 class IndexPageView(TemplateView):
     template_name = 'index.html'
+    # Блок кэшируется с версиями моделей в ключе (см. core.cache),
+    # поэтому перестраивается только после записи в одну из них
+    LAST_READING_LOGS_CACHE_TIMEOUT = 24 * 60 * 60
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        context['last_reading_logs'] = ReadingLog.objects.order_by(
-            '-year_finish', '-month_finish', '-year_start', '-month_start',
+        context['last_reading_logs'] = ReadingLog.objects.select_related(
+            *READING_LOG_ROW_SELECT_RELATED,
+        ).prefetch_related(
+            *READING_LOG_ROW_PREFETCH_RELATED,
+        ).order_by(
+            *READING_LOG_ORDERING,
         )[:10]
+        context['last_reading_logs_cache_timeout'] = self.LAST_READING_LOGS_CACHE_TIMEOUT
+        context['last_reading_logs_versions'] = model_versions(*LAST_READING_LOGS_MODELS)
 
         return context
@@ -1,5 +1,21 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Model
+from django.db.models import QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
 from django.views.generic.list import ListView
 
+from core.cache import make_cache_key
+from core.cache import model_versions
+from core.fragments import render_rows
+from core.prefix_index import normalize
+
+
 class PaginationPageSizeMixin:
     """
     Миксин для поддержки динамического размера страницы через параметр page_size.
@@ -26,4 +42,346 @@ class PaginationPageSizeMixin:
         except (TypeError, ValueError):
             page_size_selected = self.DEFAULT_PAGE_SIZE
         context['page_size_selected'] = page_size_selected
-        return context 
\ No newline at end of file
+        return context
+
+
+class PrefixIndexAutocompleteMixin:
+    """
+    Миксин автокомплита, отвечающего по префиксному индексу в памяти процесса.
+
+    prefix_index - core.prefix_index.PrefixIndex модели. Результаты - объекты
+    PrefixIndexEntry с первичным ключом и подписью, запросов к базе нет,
+    пока не изменилась версия модели.
+
+    Ответ помечается ETag из версии модели, нормализованного запроса, страницы
+    и переданных через forward значений. На совпавший If-None-Match view
+    отвечает 304 до поиска; Cache-Control разрешает браузеру недолго хранить ответ.
+    """
+    prefix_index = None
+    cache_max_age = 60
+
+    def get_queryset(self):
+        return self.prefix_index.search(self.q)
+
+    def get_etag(self):
+        return quote_etag(make_cache_key(
+            'autocomplete',
+            model_versions(self.prefix_index.model),
+            normalize(self.q),
+            self.request.GET.get(self.page_kwarg, ''),
+            sorted(self.forwarded.items()),
+        ))
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            patch_cache_control(response, private=True, max_age=self.cache_max_age)
+        return response
+
+
+class RowFragmentCacheMixin:
+    """
+    Миксин для списков: строки страницы собираются из закэшированных фрагментов.
+
+    row_template рендерит одну строку, объект передаётся в нём под именем
+    row_context_name. row_select_related и row_prefetch_related перечисляют
+    связи, которые нужны шаблону строки: они загружаются только для строк,
+    которых нет в кэше (см. core.fragments.render_rows), а запрос страницы
+    выбирает объекты без них. Строки передаются в шаблон списка как rows.
+    """
+    row_template = None
+    row_context_name = 'object'
+    row_select_related = ()
+    row_prefetch_related = ()
+
+    def get_row_queryset(self):
+        return self.model._default_manager.select_related(
+            *self.row_select_related,
+        ).prefetch_related(*self.row_prefetch_related)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['rows'] = render_rows(
+            self.row_template,
+            self.row_context_name,
+            self.get_row_queryset(),
+            [obj.pk for obj in context['object_list']],
+        )
+        return context
+
+
+class PartialResultsMixin:
+    """
+    Миксин для списков FilterView: частичный ответ с результатами и пагинацией.
+
+    Запрос с заголовком X-Partial: results (или параметром partial=results)
+    рендерит только results_template_name - результаты с пагинацией, без
+    base_layout.html и формы фильтра. Полная страница включает тот же шаблон
+    в контейнер data-partial-results, а front/js/partial_results.js подменяет
+    его содержимое при переходе по страницам и отправке формы фильтра.
+
+    В шаблон передаются параметры запроса без флага частичного ответа:
+    list_url - адрес текущей страницы списка, filter_params (для скрытых полей
+    формы размера страницы) и page_query (для ссылок пагинации) - без page;
+    page_range - номера страниц с пропусками (Paginator.get_elided_page_range).
+    """
+    PARTIAL_HEADER = 'X-Partial'
+    PARTIAL_PARAM = 'partial'
+    PARTIAL_RESULTS = 'results'
+    PAGE_RANGE_ON_EACH_SIDE = 2
+    PAGE_RANGE_ON_ENDS = 1
+    results_template_name = None
+
+    @cached_property
+    def is_partial(self):
+        return self.PARTIAL_RESULTS in (
+            self.request.headers.get(self.PARTIAL_HEADER),
+            self.request.GET.get(self.PARTIAL_PARAM),
+        )
+
+    def get_template_names(self):
+        if self.is_partial:
+            return [self.results_template_name]
+        return super().get_template_names()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop(self.PARTIAL_PARAM, None)
+        query = params.urlencode()
+        context['list_url'] = f'{self.request.path}?{query}' if query else self.request.path
+        params.pop(self.page_kwarg, None)
+        context['filter_params'] = [
+            (name, value) for name, value in params.items() if name != 'page_size'
+        ]
+        page_obj = context.get('page_obj')
+        if page_obj is not None:
+            params['page_size'] = page_obj.paginator.per_page
+            context['page_query'] = params.urlencode()
+            context['page_range'] = page_obj.paginator.get_elided_page_range(
+                page_obj.number,
+                on_each_side=self.PAGE_RANGE_ON_EACH_SIDE,
+                on_ends=self.PAGE_RANGE_ON_ENDS,
+            )
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        patch_vary_headers(response, (self.PARTIAL_HEADER,))
+        return response
+
+
+class QueryPlanMixin:
+    """
+    Миксин, применяющий к queryset view объявленные на классе связи.
+
+    select_related и prefetch_related перечисляют связи, которые нужны
+    шаблону view. Для FilterView они применяются до фильтрации, поэтому
+    действуют и на отфильтрованный queryset.
+    """
+    select_related = ()
+    prefetch_related = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def estimate_table_count(queryset):
+    """
+    Возвращает оценку числа строк таблицы по статистике планировщика PostgreSQL.
+
+    Для остальных СУБД, а также для queryset с условиями, возвращает None.
+    """
+    query = queryset.query
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or query.where or query.distinct:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    # reltuples = -1, если таблица ещё ни разу не анализировалась
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator, который берёт общее число объектов из кэша.
+
+    Если передан count_cache_key, результат COUNT(*) кэшируется под этим ключом.
+    Если разрешено use_estimate, для больших таблиц без фильтров вместо
+    COUNT(*) используется оценка планировщика (см. estimate_table_count).
+    """
+    ESTIMATE_THRESHOLD = 100_000
+    COUNT_CACHE_TIMEOUT = 60 * 60
+
+    def __init__(self, *args, count_cache_key=None, use_estimate=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.use_estimate = use_estimate
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return self._compute_count()
+
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = self._compute_count()
+            cache.set(self.count_cache_key, count, self.COUNT_CACHE_TIMEOUT)
+        return count
+
+    def _compute_count(self):
+        if self.use_estimate:
+            estimate = estimate_table_count(self.object_list)
+            if estimate is not None and estimate >= self.ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+def normalize_filter_value(value):
+    """
+    Приводит значение фильтра к виду для ключа кэша.
+
+    Объект модели (ModelChoiceFilter) заменяется первичным ключом, queryset
+    и списки (ModelMultipleChoiceFilter, MultipleChoiceFilter) - отсортированным
+    кортежем значений: два объекта с одинаковой подписью дают разные ключи.
+    Остальные значения - строкой без пробелов по краям.
+    """
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, (QuerySet, list, tuple, set, frozenset)):
+        return tuple(sorted((normalize_filter_value(item) for item in value), key=repr))
+    return str(value).strip()
+
+
+class CachedCountMixin:
+    """
+    Миксин для FilterView: кэширует число результатов фильтрации.
+
+    Ключ кэша строится из имени view, нормализованных параметров фильтра и
+    версий моделей из count_cache_models, поэтому любая запись в эти модели
+    делает закэшированное значение недействительным.
+    """
+    paginator_class = CachedCountPaginator
+    count_cache_models = ()
+
+    def get_normalized_filter_params(self):
+        """
+        Возвращает непустые значения фильтра в детерминированном порядке.
+
+        Для невалидного фильтра возвращает None: такой результат не кэшируется.
+        """
+        filterset = getattr(self, 'filterset', None)
+        if filterset is None or not filterset.is_bound:
+            return ()
+        if not filterset.is_valid():
+            return None
+        params = (
+            (name, normalize_filter_value(value))
+            for name, value in filterset.form.cleaned_data.items()
+            if value is not None
+        )
+        return tuple(sorted(
+            (name, value) for name, value in params if value not in ('', ())
+        ))
+
+    def get_filter_cache_key(self, prefix, filter_params):
+        models = (self.model, *self.count_cache_models)
+        return make_cache_key(
+            prefix,
+            self.__class__.__name__,
+            filter_params,
+            model_versions(*models),
+        )
+
+    def get_count_cache_key(self, filter_params):
+        return self.get_filter_cache_key('list_count', filter_params)
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        filter_params = self.get_normalized_filter_params()
+        if filter_params is None:
+            count_cache_key = None
+        else:
+            count_cache_key = self.get_count_cache_key(filter_params)
+        return super().get_paginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_cache_key=count_cache_key,
+            use_estimate=filter_params == (),
+            **kwargs,
+        )
+
+
+class FacetCountsMixin:
+    """
+    Миксин для FilterView: число результатов для значений категориальных фильтров.
+
+    Фасеты считает FilterSet (facet_fields, get_facet_counts), результат
+    кэшируется по тому же ключу состояния фильтра, что и в CachedCountMixin,
+    поэтому используется вместе с ним.
+
+    Для фильтров с выпадающим списком число добавляется к подписи варианта,
+    остальные фасеты передаются в шаблон как список ссылок facet_links.
+    """
+    FACET_CACHE_TIMEOUT = 60 * 60
+
+    def get_facet_counts(self):
+        filter_params = self.get_normalized_filter_params()
+        if filter_params is None:
+            return {}
+
+        cache_key = self.get_filter_cache_key('facet_counts', filter_params)
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = self.filterset.get_facet_counts()
+            cache.set(cache_key, facets, self.FACET_CACHE_TIMEOUT)
+        return facets
+
+    def get_facet_link(self, name, item):
+        params = self.request.GET.copy()
+        params[name] = item['value']
+        params.pop('page', None)
+        return {
+            **item,
+            'url': f'?{params.urlencode()}',
+            'selected': self.request.GET.get(name) == str(item['value']),
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = self.filterset.form
+        facet_links = []
+        for name, items in self.get_facet_counts().items():
+            field = form.fields[name]
+            if self.filterset.get_facet_choices(name) is None:
+                facet_links.append({
+                    'name': name,
+                    'label': field.label,
+                    'items': [self.get_facet_link(name, item) for item in items],
+                })
+            else:
+                counts = {str(item['value']): item['count'] for item in items}
+                field.widget.choices = [
+                    (value, f'{label} ({counts[str(value)]})' if str(value) in counts else label)
+                    for value, label in field.widget.choices
+                ]
+        context['facet_links'] = facet_links
+        return context
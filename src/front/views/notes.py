@@ -10,7 +10,7 @@ Views для работы с заметками (Note) и ключевыми с
 
 from dal import autocomplete
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Prefetch
 from django.views.generic import DetailView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.shortcuts import redirect
@@ -18,13 +18,19 @@ from django.contrib import messages
 from django.urls import reverse_lazy
 from django_filters.views import FilterView
 
-from core.models import Note, KeyWord
+from core.models import Note, NoteToBookEdition, KeyWord
 from core.filters import NoteFilter
+from core.note_tree import flatten_note_tree
+from core.prefix_index import PrefixIndex
 from front.forms.notes import NoteForm, NoteToBookEditionFormSet
+from .mixins import CachedCountMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
 
 
-class NoteListView(PaginationPageSizeMixin, FilterView):
+class NoteListView(PartialResultsMixin, QueryPlanMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     """
     View для отображения списка заметок с иерархической структурой.
     
@@ -34,11 +40,10 @@ class NoteListView(PaginationPageSizeMixin, FilterView):
     model = Note
     filterset_class = NoteFilter
     template_name = 'notes/note_list.html'
+    results_template_name = 'notes/_note_results.html'
     ordering = ['created_at']
     queryset = Note.objects.filter(
         parent__isnull=True
-    ).prefetch_related(
-        'children',
     ).order_by(
         'index',
     )
@@ -48,8 +53,11 @@ class NoteListView(PaginationPageSizeMixin, FilterView):
         Возвращает список имён шаблонов для поиска.
         
         Переопределяем метод, чтобы использовать только основной шаблон
-        и не добавлять fallback шаблон от FilterView.
+        (или шаблон результатов для частичного ответа) и не добавлять
+        fallback шаблон от FilterView.
         """
+        if self.is_partial:
+            return [self.results_template_name]
         return [self.template_name]
     
     def get_context_data(self, **kwargs):
@@ -58,13 +66,16 @@ class NoteListView(PaginationPageSizeMixin, FilterView):
         
         Передаёт:
         - filter: объект filterset для отображения формы фильтрации
+        - note_tree: плоский список узлов деревьев заметок страницы
+          (core.note_tree.flatten_note_tree)
         """
         context = super().get_context_data(**kwargs)
         context['filter'] = self.filterset
+        context['note_tree'] = flatten_note_tree(context['page_obj'] or context['object_list'])
         return context
 
 
-class NoteDetailView(DetailView):
+class NoteDetailView(QueryPlanMixin, DetailView):
     """
     View для отображения детальной страницы заметки.
 
@@ -78,21 +89,17 @@ class NoteDetailView(DetailView):
     """
     model = Note
     template_name = 'notes/note_detail.html'
-
-    def get_queryset(self):
-        """
-        Возвращает queryset с оптимизированной загрузкой связанных данных.
-
-        Использует select_related для parent и prefetch_related для:
-        - keywords (M2M ключевые слова)
-        - related_notes (M2M связанные заметки)
-        - book_editions__book_edition (связи с книжными изданиями)
-        """
-        return Note.objects.select_related('parent').prefetch_related(
-            'keywords',
-            'related_notes',
-            'book_editions__book_edition'
-        )
+    # Название книги и издательства берутся из копий полей BookEdition,
+    # поэтому связи с изданиями загружаются без соединения с книгой и издательством.
+    select_related = ('parent',)
+    prefetch_related = (
+        'keywords',
+        'related_notes',
+        Prefetch(
+            'book_editions',
+            queryset=NoteToBookEdition.objects.select_related('book_edition'),
+        ),
+    )
 
 
 class NoteNewView(CreateView):
@@ -331,7 +338,7 @@ class NoteDeleteView(DeleteView):
         return redirect(success_url)
 
 
-class NoteAutocompleteView(autocomplete.Select2QuerySetView):
+class NoteAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
     """
     Autocomplete view для модели Note.
 
@@ -339,42 +346,24 @@ class NoteAutocompleteView(autocomplete.Select2QuerySetView):
     - topic (тема заметки)
     - index (индекс заметки)
     """
+    prefix_index = PrefixIndex(Note, ('topic', 'index'), ordering=('-created_at',))
 
     def get_queryset(self):
         """
-        Возвращает отфильтрованный queryset заметок.
+        Возвращает заметки из префиксного индекса.
 
-        Если есть поисковый запрос (self.q), фильтрует по topic или index.
+        Заметка с индексом, переданным через forward (редактируемая), исключается.
         """
-        qs = Note.objects.order_by('-created_at').all()
-
+        results = super().get_queryset()
         if 'index' in self.forwarded:
-            qs = qs.exclude(index=self.forwarded['index'])
-
-        if self.q:
-            qs = qs.filter(
-                Q(topic__istartswith=self.q) |
-                Q(index__istartswith=self.q)
-            )
-        return qs
+            results = [entry for entry in results if entry.values['index'] != self.forwarded['index']]
+        return results
 
 
-class KeyWordAutocompleteView(autocomplete.Select2QuerySetView):
+class KeyWordAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
     """
     Autocomplete view для модели KeyWord.
 
     Поиск осуществляется по полю word (ключевое слово).
     """
-
-    def get_queryset(self):
-        """
-        Возвращает отфильтрованный queryset ключевых слов.
-
-        Если есть поисковый запрос (self.q), фильтрует по word.
-        """
-        qs = KeyWord.objects.order_by('word').all()
-        if self.q:
-            qs = qs.filter(
-                Q(word__istartswith=self.q)
-            )
-        return qs
+    prefix_index = PrefixIndex(KeyWord, ('word',), ordering=('word',))
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django.urls import reverse_lazy
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView
@@ -6,16 +7,26 @@ from django.views.generic.edit import UpdateView
 from django_filters.views import FilterView
 from dal import autocomplete
 
+from core.models import BookEdition
 from core.models import Publisher
 from core.filters import PublisherFilter
+from core.prefix_index import PrefixIndex
+from .mixins import CachedCountMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import PrefixIndexAutocompleteMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 
-class PublisherListView(PaginationPageSizeMixin, FilterView):
+class PublisherListView(PartialResultsMixin, RowFragmentCacheMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'publisher/publisher_list.html'
+    results_template_name = 'publisher/_publisher_results.html'
     model = Publisher
     filterset_class = PublisherFilter
     ordering = 'name'
+    row_template = 'publisher/_publisher_row.html'
+    row_context_name = 'publisher'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -31,9 +42,16 @@ class PublisherNewView(CreateView):
     )
 
 
-class PublisherDetailView(DetailView):
+class PublisherDetailView(QueryPlanMixin, DetailView):
     template_name = 'publisher/publisher_detail.html'
     model = Publisher
+    prefetch_related = (
+        'book_series',
+        Prefetch(
+            'book_editions',
+            queryset=BookEdition.objects.select_related('book', 'series'),
+        ),
+    )
     fields = (
         'name',
     )
@@ -54,9 +72,5 @@ class PublisherDeleteView(DeleteView):
     fields = ()
 
 
-class PublisherAutocompleteView(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        qs = Publisher.objects.all()
-        if self.q:
-            qs = qs.filter(name__istartswith=self.q)
-        return qs
+class PublisherAutocompleteView(PrefixIndexAutocompleteMixin, autocomplete.Select2QuerySetView):
+    prefix_index = PrefixIndex(Publisher, ('name',), fuzzy=True, key_field='search_key')
@@ -1,27 +1,46 @@
 import logging
 
+from django.contrib import messages
+from django.http import HttpResponseRedirect
 from django.urls import reverse
-from django.views.generic import CreateView, DetailView, UpdateView
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.generic import CreateView, DetailView, FormView, UpdateView
 from django_filters.views import FilterView
 
-from core.models import ReadingLog
+from core.bulk import bulk_create_reading_logs, bulk_set_finish
+from core.models import Author, Book, BookEdition, BookSeries, Publisher, ReadingLog
+from core.models import READING_LOG_ORDERING
 from core.filters import ReadingLogFilter
+from front.forms.reading_log import ReadingLogBulkFinishForm
+from front.forms.reading_log import ReadingLogBulkFormSet
+from front.forms.reading_log import ReadingLogCsvUploadForm
 from front.forms.reading_log import ReadingLogForm
+from front.forms.reading_log import ReadingLogNewForm
+from .mixins import CachedCountMixin
+from .mixins import FacetCountsMixin
 from .mixins import PaginationPageSizeMixin
+from .mixins import PartialResultsMixin
+from .mixins import QueryPlanMixin
+from .mixins import RowFragmentCacheMixin
 
 logger = logging.getLogger(__name__)
 
+# Связи, которые использует строка журнала чтения в списках
+# (_reading_log_row.html, index.html, year_detail.html).
+READING_LOG_ROW_SELECT_RELATED = (
+    'book_edition__book',
+    'book_edition__publisher',
+    'book_edition__series',
+)
+READING_LOG_ROW_PREFETCH_RELATED = (
+    'book_edition__book__authors',
+)
+
 
 class ReadingLogNewView(CreateView):
     template_name = 'reading_log/reading_log_new.html'
     model = ReadingLog
-    fields = (
-        'book_edition',
-        'year_start',
-        'month_start',
-        'year_finish',
-        'month_finish',
-    )
+    form_class = ReadingLogNewForm
 
     def get_initial(self):
         initial = super().get_initial()
@@ -29,22 +48,33 @@ class ReadingLogNewView(CreateView):
         return initial
 
 
-class ReadingLogListView(PaginationPageSizeMixin, FilterView):
+class ReadingLogListView(PartialResultsMixin, RowFragmentCacheMixin, FacetCountsMixin, CachedCountMixin, PaginationPageSizeMixin, FilterView):
     template_name = 'reading_log/reading_log_list.html'
+    results_template_name = 'reading_log/_reading_log_results.html'
     model = ReadingLog
     filterset_class = ReadingLogFilter
-    ordering = ['-year_finish', '-month_finish', '-year_start', '-month_start']
+    count_cache_models = (BookEdition, Book, Author, Publisher, BookSeries)
+    ordering = READING_LOG_ORDERING
+    row_template = 'reading_log/_reading_log_row.html'
+    row_context_name = 'reading_log'
+    row_select_related = READING_LOG_ROW_SELECT_RELATED
+    row_prefetch_related = READING_LOG_ROW_PREFETCH_RELATED
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['filter'] = self.filterset
+        context['bulk_finish_form'] = ReadingLogBulkFinishForm()
         return context
 
 
-class ReadingLogDetailView(DetailView):
+class ReadingLogDetailView(QueryPlanMixin, DetailView):
     """Детальная страница ReadingLog (read-only)."""
 
     model = ReadingLog
+    select_related = (
+        'book_edition__book',
+        'book_edition__publisher',
+    )
     template_name = 'reading_log/readinglog_detail.html'
     context_object_name = 'readinglog'
 
@@ -54,7 +84,7 @@ class ReadingLogDetailView(DetailView):
         return context
 
 
-class ReadingLogUpdateView(UpdateView):
+class ReadingLogUpdateView(QueryPlanMixin, UpdateView):
     """Страница редактирования ReadingLog."""
 
     model = ReadingLog
@@ -78,3 +108,70 @@ class ReadingLogUpdateView(UpdateView):
     def form_invalid(self, form):
         logger.warning(f'Invalid form submitted for ReadingLog: pk={self.object.pk}')
         return super().form_invalid(form)
+
+
+class ReadingLogBulkNewView(FormView):
+    """Массовое добавление ReadingLog: набор форм или загрузка CSV."""
+
+    template_name = 'reading_log/reading_log_bulk_new.html'
+    form_class = ReadingLogCsvUploadForm
+
+    def get_formset(self):
+        data = self.request.POST if 'formset' in self.request.POST else None
+        return ReadingLogBulkFormSet(data, queryset=ReadingLog.objects.none())
+
+    def get_form(self, form_class=None):
+        if 'csv' not in self.request.POST:
+            return self.get_form_class()()
+        return super().get_form(form_class)
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault('formset', self.get_formset())
+        return super().get_context_data(**kwargs)
+
+    def post(self, request, *args, **kwargs):
+        if 'csv' in request.POST:
+            return super().post(request, *args, **kwargs)
+
+        formset = self.get_formset()
+        if not formset.is_valid():
+            return self.render_to_response(self.get_context_data(formset=formset))
+        return self.created(formset.save(commit=False))
+
+    def form_valid(self, form):
+        return self.created(form.reading_logs)
+
+    def created(self, reading_logs):
+        created = bulk_create_reading_logs(reading_logs)
+        logger.info(f'Bulk created {len(created)} ReadingLog')
+        messages.success(self.request, f'Добавлено записей: {len(created)}')
+        return HttpResponseRedirect(reverse('reading_log_list'))
+
+
+class ReadingLogBulkFinishView(FormView):
+    """Установка окончания чтения выбранным в списке записям одним UPDATE."""
+
+    form_class = ReadingLogBulkFinishForm
+    http_method_names = ['post']
+
+    def get_success_url(self):
+        next_url = self.request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()}):
+            return next_url
+        return reverse('reading_log_list')
+
+    def form_valid(self, form):
+        updated = bulk_set_finish(
+            form.cleaned_data['reading_logs'],
+            form.cleaned_data['year_finish'],
+            form.cleaned_data['month_finish'],
+        )
+        logger.info(f'Bulk finished {updated} ReadingLog')
+        messages.success(self.request, f'Обновлено записей: {updated}')
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return HttpResponseRedirect(self.get_success_url())
@@ -0,0 +1,111 @@
+from django.http import JsonResponse
+from django.views import View
+from django.views.generic import TemplateView
+
+from core.analytics import get_reading_analytics
+from core.statistics import get_reading_statistics
+from core.timeline import get_reading_timeline
+
+# Разделы страницы и счётчик, по которому строится ширина полосы
+STATISTICS_BARS = {
+    'by_year': 'finished',
+    'by_month': 'finished',
+    'by_edition_type': 'finished',
+    'top_publishers': 'finished',
+    'top_authors': 'finished',
+}
+
+
+class ReadingStatisticsView(TemplateView):
+    template_name = 'statistics/reading_statistics.html'
+
+    def get_year(self):
+        try:
+            return int(self.request.GET.get('year', ''))
+        except ValueError:
+            return None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        year = self.get_year()
+        statistics = get_reading_statistics(year=year)
+
+        for section, counter in STATISTICS_BARS.items():
+            rows = statistics[section]
+            maximum = max((row[counter] or 0 for row in rows), default=0)
+            for row in rows:
+                row['percent'] = round(100 * (row[counter] or 0) / maximum) if maximum else 0
+
+        context.update(statistics)
+        context['year'] = year
+        return context
+
+
+# Показатель тепловой карты -> подпись
+TIMELINE_METRICS = {
+    'finished': 'Finished',
+    'started': 'Started',
+    'in_progress': 'In progress',
+}
+
+
+class ReadingTimelineView(TemplateView):
+    template_name = 'statistics/reading_timeline.html'
+
+    def get_metric(self):
+        metric = self.request.GET.get('metric')
+        return metric if metric in TIMELINE_METRICS else 'finished'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        metric = self.get_metric()
+        timeline = get_reading_timeline()
+
+        maximum = max(
+            (cell[metric] for year in timeline for cell in year['months']), default=0,
+        )
+        rows = []
+        for year in timeline:
+            cells = [
+                {
+                    **cell,
+                    'value': cell[metric],
+                    'opacity': round(cell[metric] / maximum, 2) if maximum else 0,
+                }
+                for cell in year['months']
+            ]
+            rows.append({**year, 'cells': cells, 'unknown_month_value': year['unknown_month'].get(metric)})
+
+        context['timeline'] = rows
+        context['metric'] = metric
+        context['metrics'] = TIMELINE_METRICS
+        return context
+
+
+class ReadingTimelineJsonView(View):
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'timeline': get_reading_timeline()})
+
+
+class ReadingAnalyticsView(TemplateView):
+    template_name = 'statistics/reading_analytics.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        analytics = get_reading_analytics()
+
+        distribution = analytics['distribution']
+        maximum = max((row['reads'] for row in distribution), default=0)
+        context['distribution'] = [
+            {**row, 'percent': round(100 * row['reads'] / maximum) if maximum else 0}
+            for row in distribution
+        ]
+        context.update({key: value for key, value in analytics.items() if key != 'distribution'})
+        return context
+
+
+class ReadingAnalyticsJsonView(View):
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(get_reading_analytics())
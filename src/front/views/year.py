@@ -1,51 +1,41 @@
-from django.urls import reverse_lazy
-from django.views.generic import DetailView
-from django.views.generic.edit import CreateView
-from django.views.generic.edit import DeleteView
-from django.views.generic.edit import UpdateView
+from django.http import Http404
+from django.views.generic import TemplateView
 from django.views.generic.list import ListView
 
-from core.models import Year
+from core.models import READING_LOG_ORDERING
+from core.models import reading_log_years
+from core.models import year_reading_logs
 from .mixins import PaginationPageSizeMixin
+from .reading_log import READING_LOG_ROW_PREFETCH_RELATED
+from .reading_log import READING_LOG_ROW_SELECT_RELATED
 
 
 class YearListView(PaginationPageSizeMixin, ListView):
-    template_name = 'year/year_list.html'
-    model = Year
-    ordering = '-year'
+    """Годы, в которые начато или закончено хотя бы одно чтение."""
 
+    template_name = 'year/year_list.html'
 
-class YearNewView(CreateView):
-    template_name = 'year/year_new.html'
-    model = Year
-    fields = (
-        'year',
-    )
+    def get_queryset(self):
+        return reading_log_years()
 
 
-class YearDetailView(DetailView):
+class YearDetailView(TemplateView):
     template_name = 'year/year_detail.html'
-    model = Year
-    fields = (
-        'year',
-    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['object_list'] = self.get_queryset().order_by('-year')
+        year = self.kwargs['pk']
+        years = list(reading_log_years())
+        if year not in years:
+            raise Http404(f'Нет чтений за {year} год')
+
+        context['year'] = year
+        context['object_list'] = years
+        context['reading_logs'] = year_reading_logs(year).select_related(
+            *READING_LOG_ROW_SELECT_RELATED,
+        ).prefetch_related(
+            *READING_LOG_ROW_PREFETCH_RELATED,
+        ).order_by(
+            *READING_LOG_ORDERING,
+        )
         return context
-
-
-class YearUpdateView(UpdateView):
-    template_name = 'year/year_update.html'
-    model = Year
-    fields = (
-        'year',
-    )
-
-
-class YearDeleteView(DeleteView):
-    model = Year
-    template_name = 'year/year_delete.html'
-    success_url = reverse_lazy('year')
-    fields = ()
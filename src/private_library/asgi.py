@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from private_library.template_warmup import warmup_if_production
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'private_library.settings')
 
 application = get_asgi_application()
+
+warmup_if_production()
@@ -0,0 +1,252 @@
+"""
+Профилирование запросов: время рендеринга шаблонов и SQL.
+
+Включается настройкой PROFILING (config.yml или окружение). Тогда первым
+в MIDDLEWARE добавляется ProfilingMiddleware, который для каждого запроса
+собирает RequestProfile:
+- время рендеринга каждого шаблона (собственное, без вложенных шаблонов,
+  и полное) и каждого {% include %} - по шаблону и строке, где он стоит;
+- число и суммарное время SQL-запросов и самые медленные из них со строкой
+  шаблона, при рендеринге которой запрос выполнен (или строкой кода проекта,
+  если запрос выполнен вне шаблона).
+
+Профиль записывается в лог private_library.profiling одной строкой JSON и
+сохраняется в памяти процесса (последние PROFILE_HISTORY запросов) для
+страницы отчёта /profiling/ (только с DEBUG или для сотрудников).
+
+Перехват рендеринга (Template._render, IncludeNode.render) устанавливается
+при создании middleware, поэтому с выключенной настройкой код профилирования
+не выполняется вовсе.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404
+from django.shortcuts import render
+from django.template.base import Template
+from django.template.loader_tags import IncludeNode
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILING_PATH = '/profiling/'
+PROFILE_HISTORY = 50
+SLOWEST_QUERIES = 10
+SQL_PREVIEW_LENGTH = 500
+
+_current = ContextVar('request_profile', default=None)
+_history = deque(maxlen=PROFILE_HISTORY)
+_install_lock = threading.Lock()
+_installed = False
+
+_PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class RequestProfile:
+    """Замеры одного запроса: шаблоны, include и SQL."""
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started_at = timezone.now()
+        self.status = None
+        self.total_time = 0.0
+        # имя шаблона -> [число рендерингов, собственное время, полное время]
+        self.templates = {}
+        # (шаблон с include, строка, подключаемый шаблон) -> [число, время]
+        self.includes = {}
+        # (время, SQL, источник)
+        self.queries = []
+        # время вложенных шаблонов для каждого рендерящегося сейчас шаблона
+        self._children = []
+
+    @property
+    def sql_time(self) -> float:
+        return sum(duration for duration, _, _ in self.queries)
+
+    @property
+    def sql_count(self) -> int:
+        return len(self.queries)
+
+    def slowest_queries(self, limit=SLOWEST_QUERIES) -> list:
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:limit]
+
+    def enter_template(self):
+        self._children.append(0.0)
+
+    def leave_template(self, name, elapsed):
+        children = self._children.pop()
+        if self._children:
+            self._children[-1] += elapsed
+        stats = self.templates.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed - children
+        stats[2] += elapsed
+
+    def add_include(self, parent, line, name, elapsed):
+        stats = self.includes.setdefault((parent, line, name), [0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+
+    def as_dict(self) -> dict:
+        """Профиль для лога и отчёта; шаблоны и include отсортированы по убыванию времени."""
+        templates = sorted(self.templates.items(), key=lambda item: item[1][1], reverse=True)
+        includes = sorted(self.includes.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(),
+            'total_time': round(self.total_time, 6),
+            'sql_time': round(self.sql_time, 6),
+            'sql_count': self.sql_count,
+            'templates': [
+                {'name': name, 'calls': calls, 'self_time': round(own, 6), 'total_time': round(total, 6)}
+                for name, (calls, own, total) in templates
+            ],
+            'includes': [
+                {'template': parent, 'line': line, 'name': name, 'calls': calls, 'time': round(elapsed, 6)}
+                for (parent, line, name), (calls, elapsed) in includes
+            ],
+            'slowest_queries': [
+                {'time': round(duration, 6), 'sql': sql[:SQL_PREVIEW_LENGTH], 'origin': origin}
+                for duration, sql, origin in self.slowest_queries()
+            ],
+        }
+
+
+def _template_name(template) -> str:
+    return template.origin.template_name or template.name or '<string>'
+
+
+def _query_origin() -> str:
+    """
+    Откуда выполнен запрос: 'шаблон:строка' ближайшего рендерящегося узла
+    шаблона или 'файл:строка' ближайшего кода проекта вне site-packages.
+    """
+    code_origin = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f'{origin.template_name}:{token.lineno}'
+        filename = frame.f_code.co_filename
+        if (
+            code_origin is None
+            and filename.startswith(_PROJECT_DIR)
+            and filename != _THIS_FILE
+            and 'site-packages' not in filename
+        ):
+            code_origin = f'{Path(filename).relative_to(_PROJECT_DIR).as_posix()}:{frame.f_lineno}'
+        frame = frame.f_back
+    return code_origin or '<unknown>'
+
+
+def _patch_rendering():
+    template_render = Template._render
+    include_render = IncludeNode.render
+
+    def _render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return template_render(self, context)
+        profile.enter_template()
+        start = time.perf_counter()
+        try:
+            return template_render(self, context)
+        finally:
+            profile.leave_template(_template_name(self), time.perf_counter() - start)
+
+    def render_include(self, context):
+        profile = _current.get()
+        if profile is None:
+            return include_render(self, context)
+        start = time.perf_counter()
+        try:
+            return include_render(self, context)
+        finally:
+            name = self.template.resolve(context)
+            name = getattr(name, 'name', name)
+            profile.add_include(self.origin.template_name, self.token.lineno, str(name), time.perf_counter() - start)
+
+    Template._render = _render
+    IncludeNode.render = render_include
+
+
+def install():
+    """Устанавливает перехват рендеринга шаблонов (один раз на процесс)."""
+    global _installed
+    with _install_lock:
+        if not _installed:
+            _patch_rendering()
+            _installed = True
+
+
+def _time_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile = _current.get()
+        if profile is not None:
+            profile.queries.append((time.perf_counter() - start, sql, _query_origin()))
+
+
+def recent_profiles() -> list:
+    """Сохранённые профили, начиная с последнего запроса."""
+    return list(reversed(_history))
+
+
+class ProfilingMiddleware:
+    """Собирает RequestProfile для каждого запроса, кроме страницы отчёта."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install()
+
+    def __call__(self, request):
+        if request.path == PROFILING_PATH:
+            return self.get_response(request)
+
+        profile = RequestProfile(request.method, request.get_full_path())
+        token = _current.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            profile.total_time = time.perf_counter() - start
+            _current.reset(token)
+
+        profile.status = response.status_code
+        _history.append(profile)
+        logger.info(json.dumps(profile.as_dict(), ensure_ascii=False))
+        return response
+
+
+def report(request):
+    """
+    Страница отчёта: последние профили запросов процесса.
+
+    Отчёт содержит тексты SQL и адреса запросов, поэтому доступен только
+    с включённым DEBUG или сотрудникам (is_staff); остальным - 404.
+    """
+    if not settings.PROFILING or not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    profiles = [profile.as_dict() for profile in recent_profiles()]
+    return render(request, 'profiling/report.html', {'profiles': profiles})
@@ -14,6 +14,7 @@ from os import path
 from pathlib import Path
 
 from .config_loader import Config
+from .template_warmup import production_templates
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -68,8 +69,21 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Профилирование рендеринга шаблонов и SQL для каждого запроса
+# (private_library.profiling): структурированный лог и отчёт /profiling/.
+# Выключенное профилирование не добавляет ни middleware, ни перехвата шаблонов
+PROFILING = str(config.get('PROFILING', False)).lower() in ('1', 'true', 'yes')
+if PROFILING:
+    MIDDLEWARE.insert(0, 'private_library.profiling.ProfilingMiddleware')
+
 ROOT_URLCONF = 'private_library.urls'
 
+# 'debug' - шаблоны читаются с диска при каждой загрузке, ошибки выводятся
+# с подробностями; 'production' - скомпилированные шаблоны хранятся в памяти
+# процесса (cached.Loader) и загружаются заранее при запуске воркера
+# (private_library.template_warmup)
+TEMPLATE_MODE = config.get('TEMPLATE_MODE', 'debug')
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -91,6 +105,9 @@ TEMPLATES = [
     },
 ]
 
+if TEMPLATE_MODE == 'production':
+    TEMPLATES = production_templates(TEMPLATES)
+
 WSGI_APPLICATION = 'private_library.wsgi.application'
 
 
@@ -108,6 +125,26 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Версии моделей (core.cache) хранятся здесь, поэтому при нескольких
+# воркерах нужен общий для всех процессов backend (например, Redis или БД).
+
+CACHES = {
+    'default': {
+        'BACKEND': config.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': config.get('CACHE_LOCATION', ''),
+    },
+}
+# Кэш строк списков (core.fragments) хранит по два ключа на строку: без
+# увеличения лимита (300 по умолчанию) LocMemCache вытеснял бы версии моделей
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 50_000}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -171,4 +208,11 @@ LOGGING = {
         "handlers": ["console"],
         "level": "ERROR",
     },
+    "loggers": {
+        "private_library.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
 }
@@ -0,0 +1,69 @@
+"""
+Предварительная компиляция шаблонов при запуске воркера.
+
+В режиме TEMPLATE_MODE = 'production' загрузчики шаблонов обёрнуты в
+django.template.loaders.cached.Loader: шаблон читается с диска и разбирается
+один раз, дальше процесс использует скомпилированный объект, в том числе для
+каждого рекурсивного {% include %} дерева заметок. warmup_templates() заранее
+загружает все шаблоны каталогов DIRS, чтобы первые запросы воркера не тратили
+время на их разбор.
+"""
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+DJANGO_BACKEND = 'django.template.backends.django.DjangoTemplates'
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+
+
+def production_templates(templates) -> list:
+    """Копия настройки TEMPLATES с загрузчиками, обёрнутыми в cached.Loader, и выключенным debug."""
+    result = []
+    for backend in templates:
+        options = backend.get('OPTIONS', {})
+        loaders = options.get('loaders')
+        if backend['BACKEND'] == DJANGO_BACKEND and loaders:
+            options = {**options, 'debug': False, 'loaders': [(CACHED_LOADER, list(loaders))]}
+        result.append({**backend, 'OPTIONS': options})
+    return result
+
+
+def template_names(directory) -> list:
+    """Имена шаблонов каталога (пути относительно него) в алфавитном порядке."""
+    directory = Path(directory)
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob('*')
+        if path.is_file() and path.suffix in TEMPLATE_SUFFIXES
+    )
+
+
+def warmup_templates() -> int:
+    """
+    Загружает все шаблоны каталогов DIRS движка django и возвращает их число.
+
+    Шаблоны с ошибками пропускаются с записью в лог: они упадут при рендеринге
+    так же, как без предварительной загрузки.
+    """
+    engine = engines['django'].engine
+    loaded = 0
+    for directory in engine.dirs:
+        for name in template_names(directory):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError:
+                logger.exception('Template %s failed to compile', name)
+                continue
+            loaded += 1
+    return loaded
+
+
+def warmup_if_production():
+    """Вызывается при запуске воркера (wsgi/asgi): прогревает кэш шаблонов в режиме production."""
+    if settings.TEMPLATE_MODE == 'production':
+        warmup_templates()
@@ -15,8 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf.urls.static import static
+from django.urls import path
 
+from private_library import profiling
 from private_library import settings
 
-urlpatterns = []
+urlpatterns = [
+    path('profiling/', profiling.report, name='profiling_report'),
+]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
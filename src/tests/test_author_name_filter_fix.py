@@ -15,7 +15,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'private_library.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from core.models import Author, Book, BookEdition, Publisher, Year, ReadingLog
+from core.models import Author, Book, BookEdition, Publisher, ReadingLog
 from core.filters import AuthorFilter, BookFilter, BookEditionFilter, ReadingLogFilter
 
 
@@ -58,7 +58,7 @@ class TestAuthorNameFilteringFix(TestCase):
             publication_year=2022
         )
         
-        self.year = Year.objects.create(year=2022)
+        self.year = 2022
         
         self.reading_log1 = ReadingLog.objects.create(
             book_edition=self.book_edition1,
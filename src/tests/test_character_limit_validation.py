@@ -15,7 +15,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'private_library.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from core.models import Author, Book, Publisher, BookSeries, BookEdition, Year, ReadingLog
+from core.models import Author, Book, Publisher, BookSeries, BookEdition, ReadingLog
 from core.filters import ReadingLogFilter, AuthorFilter, BookFilter, BookEditionFilter, PublisherFilter, BookSeriesFilter
 
 
@@ -44,7 +44,7 @@ class TestCharacterLimitValidation(TestCase):
             publisher=self.publisher1
         )
         
-        self.year_2020 = Year.objects.create(year=2020)
+        self.year_2020 = 2020
         
         self.book_edition1 = BookEdition.objects.create(
             book=self.book1,